@@ -1,35 +1,134 @@
-from flask import Flask, request, jsonify, render_template, url_for, send_from_directory, abort
+from flask import Flask, request, jsonify, render_template, url_for, send_from_directory, send_file, abort, Response, stream_with_context
 from flask_cors import CORS  # Add this import
 from werkzeug.utils import secure_filename
 import os
-from pdf_parser import parse_pdf  # Change import to use our parse_pdf function
+from parse_cache import ParseCache, content_hash
+from parse_engine import ParseEngine, EngineBusy, ParseTimeout, PARSE, HYBRID, TEXT
+from job_store import create_job_store, COMPLETED, FAILED
+from batch_ingest import result_record
 from config import Config
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.units import inch
-import uuid
+from pdf_templates import get_template, register_fonts, use_fonts
+from render_input import extract_from_html, extract_from_resume
+from upload_stream import UploadRequest
+from storage import UploadStore
+from expiry import ExpiryIndex, Reaper
+from hybrid_parser import refine_with_llm
+from resume_processor import ResumeProcessor
+from llm_client import run_async, iter_async
+from matching import ResumeIndex, match_score
+from vector_index import VectorIndex
+from skill_gap import SkillMatcher, analyze_gap
+from resume_model import validate_resume
+from resume_store import ResumeStore, PARSER as PARSER_SOURCE, HYBRID as HYBRID_SOURCE, LLM as LLM_SOURCE
 import html
 import re
 import shutil
-from datetime import datetime, timedelta
 import threading
 import time
+import json
+import zipfile
+import hashlib
+import hmac
+import tempfile
+from collections import deque
+from functools import wraps
 
 app = Flask(__name__)
+# Uploaded files are hashed and validated while they stream in
+app.request_class = UploadRequest
 CORS(app)  # Enable CORS
 app.config.from_object(Config)
 
 # Configure upload settings
-UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
+APP_ROOT = os.path.dirname(os.path.abspath(__file__))
+UPLOAD_FOLDER = os.path.join(APP_ROOT, 'uploads')
 ALLOWED_EXTENSIONS = {'pdf'}
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['STATIC_FOLDER'] = 'static'
 
-# Create uploads directory if it doesn't exist
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+# Stores, indexes and background threads are set up by init_services, in the
+# server process only: spawned parse workers import this module again as
+# __mp_main__ and must not open the databases or start a reaper
+upload_store = None
+expiry_index = None
+reaper = None
+parse_cache = None
+parse_engine = None
+job_store = None
+resume_store = None
+resume_index = None
+vector_index = None
+skill_matcher = None
+_services_lock = threading.Lock()
+
+def init_services(root=APP_ROOT):
+    """Open the stores and indexes under root and start the background threads, once per process"""
+    global upload_store, expiry_index, reaper, parse_cache, parse_engine, job_store
+    global resume_store, resume_index, vector_index, skill_matcher
+    with _services_lock:
+        if upload_store is not None:
+            return
+        
+        # Create uploads directory if it doesn't exist
+        app.config['UPLOAD_FOLDER'] = os.path.join(root, 'uploads')
+        os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+        
+        # Register custom fonts once and build the templates in them, before any request threads start rendering
+        register_fonts(Config.PDF_FONT_DIR)
+        use_fonts(Config.PDF_FONT, Config.PDF_BOLD_FONT)
+        
+        # Stored files are indexed by expiry time when saved; a single reaper per host
+        # removes expired ones in batches without scanning the upload folder
+        expiry_index = ExpiryIndex(os.path.join(root, Config.EXPIRY_DB_PATH), ttl=Config.UPLOAD_TTL)
+        reaper = Reaper(expiry_index,
+                        os.path.join(root, Config.CLEANUP_LOCK_PATH),
+                        interval=Config.CLEANUP_INTERVAL,
+                        batch_size=Config.CLEANUP_BATCH_SIZE,
+                        tasks=[purge_resumes, sweep_parse_cache])
+        
+        # Parsed resumes are cached by content hash so re-uploads skip pdfplumber
+        # Results of another parser version or page limit are never served
+        parse_cache = ParseCache(os.path.join(root, Config.PARSE_CACHE_FOLDER),
+                                 ttl=Config.RESUME_CACHE_TIME,
+                                 max_entries=Config.PARSE_CACHE_SIZE,
+                                 version=f"{Config.PARSER_VERSION}-{Config.MAX_PDF_PAGES}")
+        
+        # PDFs are parsed in worker processes so slow files don't block request threads
+        parse_engine = ParseEngine(processes=Config.PARSE_WORKERS,
+                                   max_pending=Config.PARSE_MAX_PENDING,
+                                   timeout=Config.PARSE_TIMEOUT,
+                                   max_tasks_per_child=Config.PARSE_MAX_TASKS_PER_WORKER,
+                                   start_method=Config.PARSE_START_METHOD)
+        
+        # Status and results of parses submitted with /upload-resume?async=1
+        job_store = create_job_store(Config.JOB_STORE, os.path.join(root, Config.JOB_DB_PATH), ttl=Config.JOB_TTL)
+        
+        # Every parse result is kept in SQLite so scoring and re-rendering never re-parse the PDF
+        resume_store = ResumeStore(os.path.join(root, Config.RESUME_DB_PATH))
+        
+        # Parsed resumes are indexed by content hash for matching against job descriptions
+        resume_index = ResumeIndex()
+        # and as hashed-feature vectors in a memory-mapped matrix shared by all workers
+        vector_index = VectorIndex(os.path.join(root, Config.VECTOR_INDEX_FOLDER), dim=Config.VECTOR_DIM)
+        
+        # The skill dictionary is compiled into a matcher once, every request reuses it
+        skill_matcher = SkillMatcher.from_file(os.path.join(APP_ROOT, Config.SKILLS_DICTIONARY))
+        
+        # Uploaded and generated PDFs are stored by content hash in sharded subdirectories.
+        # Set last, as it marks the services ready
+        upload_store = UploadStore(app.config['UPLOAD_FOLDER'])
+        
+        # Every worker runs a reaper thread, only the one holding the lock deletes files, resumes and cache entries
+        reaper.start()
+        # The inverted index lives in memory, refill it from stored resumes without delaying startup
+        threading.Thread(target=load_resume_index, name='resume-index-loader', daemon=True).start()
+
+@app.before_request
+def ensure_services():
+    # gunicorn imports the app without running __main__, so its workers set up on their first request
+    if upload_store is None:
+        init_services()
 
 # We no longer need to initialize a parser since we're using a function
 # resume_parser = ResumeParser()  # Remove this line
@@ -37,6 +136,30 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def admin_required(view):
+    """Only serve the route to requests carrying Config.ADMIN_TOKEN as a bearer token"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        # Without a configured token the admin routes don't exist
+        if not Config.ADMIN_TOKEN:
+            abort(404)
+        scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+        if scheme.lower() != 'bearer' or not hmac.compare_digest(token.encode(), Config.ADMIN_TOKEN.encode()):
+            return jsonify({'error': 'Unauthorized'}), 401
+        return view(*args, **kwargs)
+    return wrapper
+
+def int_arg(name, default, minimum, maximum=None):
+    """Read an integer query argument, raising ValueError when it is malformed or out of range"""
+    value = request.args.get(name)
+    if value is None:
+        return default
+    value = int(value)
+    if value < minimum or (maximum is not None and value > maximum):
+        raise ValueError(f"{name} must be between {minimum} and {maximum}" if maximum is not None
+                         else f"{name} must be at least {minimum}")
+    return value
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -51,14 +174,32 @@ def upload_resume():
         return jsonify({'error': 'No selected file'}), 400
 
     if file and allowed_file(file.filename):
-        # Secure the filename
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
+        # The upload was hashed and checked for PDF magic bytes while it was received
+        upload = file.stream
+        error = upload.validation_error()
+        if error:
+            return jsonify({'error': error}), 400
+        
+        file_hash, filename, source = save_upload(upload)
+        
+        # Clients can ask for a job id to poll instead of waiting for the parse
+        async_mode = request.args.get('async', '').lower() in ('1', 'true')
+        # Hybrid mode has Claude restructure only the sections the parser is unsure about
+        mode = HYBRID if request.args.get('mode') == HYBRID else PARSE
+        cache_key = file_hash if mode == PARSE else f"{file_hash}-{mode}"
         
         try:
-            # Parse the PDF using our function
-            parsed_data = parse_pdf(filepath)
+            # Only parse the PDF if we haven't seen these exact bytes recently
+            parsed_data = parse_cache.get(cache_key)
+            if async_mode:
+                return submit_parse_job(source, cache_key, filename, parsed_data, mode, file_hash,
+                                        secure_filename(file.filename))
+            if parsed_data is None:
+                parsed_data, cacheable = complete_parse(parse_engine.parse(source, mode=mode), mode)
+                if cacheable:
+                    parse_cache.set(cache_key, parsed_data)
+            record_resume(file_hash, parsed_data, HYBRID_SOURCE if mode == HYBRID else PARSER_SOURCE,
+                          secure_filename(file.filename))
             
             # Return both the parsed data and the PDF filename
             return jsonify({
@@ -66,136 +207,464 @@ def upload_resume():
                 'parsed_data': parsed_data,
                 'pdf_filename': filename
             })
+        except EngineBusy:
+            return jsonify({'error': 'Server is busy parsing other resumes, please retry shortly'}), 503, {'Retry-After': '5'}
+        except ParseTimeout as e:
+            return jsonify({'error': f'Error parsing PDF: {str(e)}'}), 504
         except Exception as e:
             return jsonify({'error': f'Error parsing PDF: {str(e)}'}), 500
     
     return jsonify({'error': 'Invalid file type'}), 400
 
+@app.route('/upload-resume/stream', methods=['POST'])
+def upload_resume_stream():
+    """Structure an uploaded resume with Claude, sending each part as Server-Sent Events"""
+    file = request.files.get('resume')
+    if file is None or file.filename == '':
+        return jsonify({'error': 'No file part'}), 400
+    if not allowed_file(file.filename):
+        return jsonify({'error': 'Invalid file type'}), 400
+    
+    error = file.stream.validation_error()
+    if error:
+        return jsonify({'error': error}), 400
+    file_hash, filename, source = save_upload(file.stream)
+    original_name = secure_filename(file.filename)
+    
+    try:
+        text = parse_engine.parse(source, mode=TEXT)
+        processor = get_resume_processor()
+    except EngineBusy:
+        return jsonify({'error': 'Server is busy parsing other resumes, please retry shortly'}), 503, {'Retry-After': '5'}
+    except ParseTimeout as e:
+        return jsonify({'error': f'Error parsing PDF: {str(e)}'}), 504
+    except Exception as e:
+        return jsonify({'error': f'Error processing resume: {str(e)}'}), 500
+    
+    def generate():
+        yield sse_event('upload', {'pdf_filename': filename})
+        try:
+            # personal_info and every section are sent as soon as Claude finishes them
+            for event, data in iter_async(processor.stream_resume(text)):
+                if event == 'done':
+                    record_resume(file_hash, data, LLM_SOURCE, original_name)
+                yield sse_event(event, data)
+        except Exception as e:
+            yield sse_event('error', {'error': f'Error processing resume: {str(e)}'})
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def sse_event(event, data):
+    """Format one Server-Sent Event with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def save_upload(upload):
+    """Store a validated upload and return (file_hash, pdf_filename, parse source)"""
+    # Stored under the content hash, so identical uploads are kept once and
+    # users uploading the same file name can't overwrite each other
+    file_hash = upload.hexdigest()
+    filename = store_file(file_hash, upload)
+    # Small uploads are parsed straight from memory instead of re-reading the saved copy
+    source = upload.getvalue() if upload.in_memory else upload_store.path_for(file_hash)
+    return file_hash, filename, source
+
+def store_file(digest, source):
+    """Save a file in the upload store and schedule its expiry"""
+    # Indexed before saving, so a reaper that has already listed the old entry sees the re-save and keeps the file
+    expiry_index.add(upload_store.path_for(digest))
+    filename, _ = upload_store.save(digest, source)
+    return filename
+
+def complete_parse(result, mode=PARSE):
+    """Return (parsed resume data, whether to cache it) from an engine result, refining hybrid results with Claude"""
+    if mode != HYBRID:
+        return result, True
+    try:
+        return run_async(refine_with_llm(result, get_resume_processor()))
+    except Exception as e:
+        # Without Claude the parser's own result is still usable, but the next upload should try Claude again
+        print(f"Error refining resume with Claude: {str(e)}")
+        return result['resume'], False
+
+_resume_processor = None
+_resume_processor_lock = threading.Lock()
+
+def get_resume_processor():
+    """Create the shared ResumeProcessor on first use"""
+    global _resume_processor
+    with _resume_processor_lock:
+        if _resume_processor is None:
+            _resume_processor = ResumeProcessor()
+        return _resume_processor
+
+def record_resume(file_hash, parsed_data, source=PARSER_SOURCE, original_name=None):
+    """Persist a parse result and add it to the matching indexes"""
+    try:
+        resume_store.save(file_hash, parsed_data, source=source, filename=original_name)
+    except Exception as e:
+        print(f"Error storing resume: {str(e)}")
+    index_resume(file_hash, parsed_data)
+
+def index_resume(file_hash, parsed_data):
+    """Add a parsed resume to the matching indexes, unless it is already there"""
+    try:
+        if file_hash not in resume_index:
+            resume_index.add(file_hash, parsed_data)
+        # The vector matrix persists across restarts, the inverted index does not
+        if file_hash not in vector_index:
+            vector_index.add_resume(file_hash, parsed_data)
+    except Exception as e:
+        # Matching is secondary to returning the parse
+        print(f"Error indexing resume: {str(e)}")
+
+def submit_parse_job(source, cache_key, filename, parsed_data=None, mode=PARSE, file_hash=None, original_name=None):
+    """Queue a parse in the background and return a job id for polling"""
+    job = parse_engine.submit(source, mode=mode) if parsed_data is None else None
+    job_id = job_store.create(meta={'pdf_filename': filename})
+    
+    if job is None:
+        # Cache hit, the result is available immediately
+        job_store.update(job_id, COMPLETED, result=parsed_data)
+        record_resume(file_hash or cache_key, parsed_data, HYBRID_SOURCE if mode == HYBRID else PARSER_SOURCE,
+                      original_name)
+    else:
+        threading.Thread(target=finish_parse_job, args=(job_id, job, cache_key, mode, file_hash, original_name),
+                         daemon=True).start()
+    
+    return jsonify({
+        'status': 'accepted',
+        'job_id': job_id,
+        'status_url': url_for('job_status', job_id=job_id)
+    }), 202
+
+def finish_parse_job(job_id, job, cache_key, mode=PARSE, file_hash=None, original_name=None):
+    """Wait for a background parse and record its outcome in the job store"""
+    try:
+        parsed_data, cacheable = complete_parse(job.result(), mode)
+        if cacheable:
+            parse_cache.set(cache_key, parsed_data)
+        job_store.update(job_id, COMPLETED, result=parsed_data)
+        record_resume(file_hash or cache_key, parsed_data, HYBRID_SOURCE if mode == HYBRID else PARSER_SOURCE,
+                      original_name)
+    except Exception as e:
+        job_store.update(job_id, FAILED, error=f'Error parsing PDF: {str(e)}')
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Report the status of a background parse, with its result once done"""
+    job = job_store.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    response = {'job_id': job_id, 'status': job['status']}
+    if job['status'] == COMPLETED:
+        response['parsed_data'] = job['result']
+        response['pdf_filename'] = job['meta'].get('pdf_filename')
+    elif job['status'] == FAILED:
+        response['error'] = job['error']
+    return jsonify(response)
+
+@app.route('/upload-resumes/batch', methods=['POST'])
+def upload_resumes_batch():
+    """Parse many PDFs and/or zip archives of PDFs, streaming JSON Lines results"""
+    files = [f for f in request.files.getlist('resumes') if f.filename]
+    if not files:
+        return jsonify({'error': 'No files provided'}), 400
+    
+    def to_line(record):
+        return json.dumps(record) + '\n'
+    
+    # Parsed resumes are written to the store in bulk, not one transaction each
+    pending = []
+    
+    def store(name, file_hash, parsed_data):
+        pending.append({'content_hash': file_hash, 'data': parsed_data, 'filename': name})
+        if len(pending) >= Config.RESUME_STORE_BATCH_SIZE:
+            flush()
+    
+    def flush():
+        try:
+            resume_store.save_many(pending)
+        except Exception as e:
+            print(f"Error storing resumes: {str(e)}")
+        # Indexed once stored, as /match drops results without a stored resume
+        for record in pending:
+            index_resume(record['content_hash'], record['data'])
+        pending.clear()
+    
+    def finish(name, started, file_hash, job):
+        try:
+            parsed_data = job.result()
+            parse_cache.set(file_hash, parsed_data)
+            store(name, file_hash, parsed_data)
+            return to_line(result_record(name, started, parsed_data))
+        except Exception as e:
+            return to_line(result_record(name, started, error=f'Error parsing PDF: {str(e)}'))
+    
+    def generate():
+        # Jobs are finished in submission order, holding at most BATCH_MAX_IN_FLIGHT
+        in_flight = deque()
+        try:
+            for name, data, error in iter_uploaded_pdfs(files):
+                started = time.perf_counter()
+                if error:
+                    yield to_line(result_record(name, started, error=error))
+                    continue
+                
+                file_hash = content_hash(data)
+                parsed_data = parse_cache.get(file_hash)
+                if parsed_data is not None:
+                    store(name, file_hash, parsed_data)
+                    yield to_line(result_record(name, started, parsed_data))
+                    continue
+                
+                job = None
+                while job is None:
+                    if len(in_flight) >= Config.BATCH_MAX_IN_FLIGHT:
+                        yield finish(*in_flight.popleft())
+                    try:
+                        job = parse_engine.submit(data, raise_errors=True)
+                    except EngineBusy:
+                        if not in_flight:
+                            break
+                        yield finish(*in_flight.popleft())
+                
+                if job is None:
+                    yield to_line(result_record(name, started, error='Server is busy parsing other resumes, please retry'))
+                else:
+                    in_flight.append((name, started, file_hash, job))
+            
+            while in_flight:
+                yield finish(*in_flight.popleft())
+        finally:
+            # Also runs when the client disconnects part way through the batch;
+            # jobs nobody will wait for must still give back their engine slots
+            while in_flight:
+                in_flight.popleft()[-1].cancel()
+            if pending:
+                flush()
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+# ATS exports are uploaded as one large zip or many PDFs, well past the single upload limit
+upload_resumes_batch.max_content_length = Config.BATCH_MAX_CONTENT_LENGTH
+
+def iter_uploaded_pdfs(files):
+    """Yield (name, pdf bytes, error) for uploaded PDFs and the PDFs inside uploaded zips"""
+    for file in files:
+        filename = secure_filename(file.filename)
+        if allowed_file(filename):
+            error = file.stream.validation_error()
+            yield filename, None if error else file.read(), error
+        elif filename.lower().endswith('.zip'):
+            try:
+                with zipfile.ZipFile(file.stream) as archive:
+                    for member in archive.infolist():
+                        if member.is_dir() or not allowed_file(member.filename):
+                            continue
+                        name = f"{filename}!{member.filename}"
+                        # Guard against zip bombs: no single resume may exceed the upload limit
+                        if member.file_size > Config.MAX_CONTENT_LENGTH:
+                            yield name, None, 'File too large'
+                        else:
+                            yield name, archive.read(member), None
+            except zipfile.BadZipFile:
+                yield filename, None, 'Invalid zip archive'
+        else:
+            yield filename, None, 'Invalid file type'
+
+@app.route('/admin/resumes', methods=['GET'])
+@admin_required
+def list_resumes():
+    """Search stored resumes by name prefix, email, phone, source and upload time"""
+    try:
+        since = request.args.get('since')
+        until = request.args.get('until')
+        since = float(since) if since is not None else None
+        until = float(until) if until is not None else None
+        limit = int_arg('limit', 100, 1, Config.RESUME_QUERY_MAX_LIMIT)
+        offset = int_arg('offset', 0, 0)
+    except ValueError as e:
+        return jsonify({'error': f"Invalid query: {str(e)}"}), 400
+    try:
+        resumes = resume_store.find(name=request.args.get('name'),
+                                    email=request.args.get('email'),
+                                    phone=request.args.get('phone'),
+                                    source=request.args.get('source'),
+                                    uploaded_after=since,
+                                    uploaded_before=until,
+                                    limit=limit,
+                                    offset=offset)
+        return jsonify({'status': 'success', 'resumes': resumes})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/admin/resumes/<content_hash>', methods=['GET'])
+@admin_required
+def get_resume(content_hash):
+    """Return a stored parse result without touching the PDF"""
+    record = resume_store.get(content_hash, source=request.args.get('source'))
+    if record is None:
+        return jsonify({'error': 'Resume not found'}), 404
+    return jsonify({'status': 'success', **record})
+
+@app.route('/match', methods=['POST'])
+def match_resumes():
+    """Rank indexed resumes against a job description, by BM25 or vector cosine similarity"""
+    data = request.get_json(silent=True) or {}
+    job_description, error = job_description_arg(data)
+    if error:
+        return jsonify({'error': error}), 400
+    try:
+        top_k = int(data.get('top_k', Config.MATCH_TOP_K))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'top_k must be a number'}), 400
+    if top_k < 1:
+        return jsonify({'error': 'top_k must be at least 1'}), 400
+    top_k = min(top_k, Config.MATCH_MAX_TOP_K)
+    
+    method = data.get('method', 'bm25')
+    if method == 'bm25':
+        index = resume_index
+        search = resume_index.search
+    elif method == 'vector':
+        index = vector_index
+        search = vector_index.search_text
+    else:
+        return jsonify({'error': 'method must be bm25 or vector'}), 400
+    results = live_matches(search, job_description, top_k)
+    for result in results:
+        # Resumes from batch uploads have no stored PDF, and stored PDFs expire on their own
+        path = upload_store.path_for(result['resume_id'])
+        result['pdf_filename'] = upload_store.name_for(result['resume_id']) if os.path.exists(path) else None
+    return jsonify({'status': 'success', 'method': method, 'results': results, 'indexed': len(index)})
+
+def live_matches(search, job_description, top_k):
+    """Return the top_k search results that still have a stored resume.
+
+    Another worker's reaper may have purged a resume since it was indexed
+    here; such results are dropped from the indexes and the search rerun.
+    """
+    while True:
+        results = search(job_description, top_k)
+        stored = resume_store.existing([result['resume_id'] for result in results])
+        purged = [result['resume_id'] for result in results if result['resume_id'] not in stored]
+        if not purged:
+            return results
+        for resume_id in purged:
+            resume_index.remove(resume_id)
+            vector_index.remove(resume_id)
+
+@app.route('/match/score', methods=['POST'])
+def match_resume_score():
+    """Score one parsed resume against a job description from 0 to 100"""
+    data = request.get_json(silent=True) or {}
+    job_description, error = job_description_arg(data)
+    if error is None:
+        error = resume_arg(data)
+    if error:
+        return jsonify({'error': error}), 400
+    return jsonify({'status': 'success', **match_score(data['resume'], job_description, resume_index)})
+
+def job_description_arg(data):
+    """Return (job description, error message) from a JSON request body"""
+    job_description = data.get('job_description', '') if isinstance(data, dict) else ''
+    if not isinstance(job_description, str):
+        return None, 'job_description must be a string'
+    if not job_description.strip():
+        return None, 'No job description provided'
+    return job_description, None
+
+def resume_arg(data):
+    """Return an error message unless the request body carries a well-formed parsed resume"""
+    if data.get('resume') is None:
+        return 'No resume provided'
+    try:
+        validate_resume(data['resume'])
+    except ValueError as e:
+        return f'Invalid resume data: {str(e)}'
+    return None
+
+@app.route('/analyze-gap', methods=['POST'])
+def analyze_skill_gap():
+    """List the job description's skills that a parsed resume is missing or mentions too rarely"""
+    data = request.get_json(silent=True) or {}
+    job_description, error = job_description_arg(data)
+    if error is None:
+        error = resume_arg(data)
+    if error:
+        return jsonify({'error': error}), 400
+    return jsonify({'status': 'success', **analyze_gap(data['resume'], job_description, skill_matcher)})
+
 @app.route('/pdf/<filename>')
 def serve_pdf(filename):
     # For security, make sure to validate the filename
     if '..' in filename or filename.startswith('/'):
         abort(404)
-    return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+    path = upload_store.lookup(filename)
+    if path is not None:
+        # The name is the content hash, so it doubles as a strong ETag.
+        # conditional=True answers If-None-Match with 304 and Range requests
+        # from the PDF viewer with 206. Resumes are personal data and expire,
+        # so only the user's browser may keep them, and not past the upload TTL.
+        response = send_file(path, mimetype='application/pdf', conditional=True,
+                             etag=filename.rsplit('.', 1)[0], max_age=min(Config.PDF_CACHE_MAX_AGE, Config.UPLOAD_TTL))
+        response.cache_control.public = False
+        response.cache_control.private = True
+        return response
+    # Files saved before content-addressed storage live directly in the upload folder.
+    # Their names can be reused, so clients must revalidate them every time.
+    response = send_from_directory(app.config['UPLOAD_FOLDER'], filename, conditional=True)
+    response.cache_control.no_cache = True
+    return response
 
 @app.route('/generate-pdf', methods=['POST'])
 def generate_pdf():
     try:
-        # Get HTML content from request
+        # Get HTML content or parsed resume data from request
         data = request.json
-        if not data or 'html' not in data:
-            return jsonify({'error': 'No HTML content provided'}), 400
-        
-        # Extract text data from HTML
-        html_content = data['html']
-        
-        # Create a more robust HTML parser
-        import re
-        
-        # Helper function to clean HTML tags
-        def clean_html(text):
-            return re.sub(r'<[^>]*>', '', text).strip()
-        
-        # Extract name (looking for h1 tag)
-        name_match = re.search(r'<h1>(.*?)</h1>', html_content, re.DOTALL)
-        name = clean_html(name_match.group(1)) if name_match else "Resume"
-        
-        # Extract contact info
-        contact_match = re.search(r'<div class="contact-info">(.*?)</div>', html_content, re.DOTALL)
-        contact_info = clean_html(contact_match.group(1)) if contact_match else ""
-        contact_info = contact_info.replace('<br>', '\n')
+        if not isinstance(data, dict) or ('html' not in data and 'resume' not in data):
+            return jsonify({'error': 'No HTML content or resume data provided'}), 400
         
-        # Extract sections
-        sections = []
-        section_matches = re.finditer(r'<h2>(.*?)</h2>(.*?)(?=<h2>|$)', html_content, re.DOTALL)
-        
-        for match in section_matches:
-            section_title = clean_html(match.group(1))
-            section_content = match.group(2)
-            
-            # Extract bullet points
-            bullet_points = []
-            bullet_matches = re.finditer(r'<li>(.*?)</li>', section_content, re.DOTALL)
-            for bullet_match in bullet_matches:
-                bullet_text = clean_html(bullet_match.group(1))
-                if bullet_text:
-                    bullet_points.append(bullet_text)
-            
-            sections.append({
-                'title': section_title,
-                'bullet_points': bullet_points
-            })
-        
-        # Generate a unique filename
-        filename = f"resume_{uuid.uuid4().hex}.pdf"
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        
-        # Create PDF using ReportLab
-        doc = SimpleDocTemplate(filepath, pagesize=letter,
-                                rightMargin=72, leftMargin=72,
-                                topMargin=72, bottomMargin=72)
-        
-        styles = getSampleStyleSheet()
-        
-        # Create custom styles
-        styles.add(ParagraphStyle(
-            name='Name',
-            parent=styles['Heading1'],
-            fontSize=16,
-            alignment=1,  # Center alignment
-            spaceAfter=10
-        ))
-        
-        styles.add(ParagraphStyle(
-            name='ContactInfo',
-            parent=styles['Normal'],
-            fontSize=10,
-            alignment=1,  # Center alignment
-            spaceAfter=20
-        ))
-        
-        styles.add(ParagraphStyle(
-            name='SectionTitle',
-            parent=styles['Heading2'],
-            fontSize=12,
-            textTransform='uppercase',
-            spaceBefore=15,
-            spaceAfter=6
-        ))
-        
-        styles.add(ParagraphStyle(
-            name='BulletPoint',
-            parent=styles['Normal'],
-            fontSize=10,
-            leftIndent=20,
-            spaceAfter=2
-        ))
-        
-        # Build the PDF content
-        elements = []
-        
-        # Add name
-        elements.append(Paragraph(name, styles['Name']))
+        try:
+            template = get_template(data.get('template', Config.DEFAULT_PDF_TEMPLATE))
+        except KeyError:
+            return jsonify({'error': f"Unknown template: {data.get('template')}"}), 400
         
-        # Add contact info
-        elements.append(Paragraph(contact_info, styles['ContactInfo']))
+        # Structured data (as returned by /upload-resume) renders directly,
+        # HTML from the editor preview is tokenized in a single pass
+        if 'resume' in data:
+            try:
+                name, contact_info, sections = extract_from_resume(data['resume'])
+            except ValueError as e:
+                return jsonify({'error': f'Invalid resume data: {str(e)}'}), 400
+        elif isinstance(data['html'], str):
+            name, contact_info, sections = extract_from_html(data['html'])
+        else:
+            return jsonify({'error': 'html must be a string'}), 400
         
-        # Add sections
-        for section in sections:
-            # Add section title
-            elements.append(Paragraph(section['title'], styles['SectionTitle']))
-            elements.append(Spacer(1, 0.1*inch))
-            
-            # Add bullet points
-            for point in section['bullet_points']:
-                # Use standard bullet character
-                elements.append(Paragraph(f"• {point}", styles['BulletPoint']))
-            
-            # Add space after each section
-            elements.append(Spacer(1, 0.2*inch))
+        # Stream mode renders into memory and returns the PDF bytes directly,
+        # saving the client a second request to /pdf/<filename>
+        if data.get('stream'):
+            # Only PDFs larger than PDF_SPOOL_MAX_SIZE spill to a temporary file
+            buffer = tempfile.SpooledTemporaryFile(max_size=Config.PDF_SPOOL_MAX_SIZE)
+            try:
+                template.render(buffer, name, contact_info, sections)
+            except Exception:
+                buffer.close()
+                raise
+            return pdf_stream_response(buffer)
         
-        # Build the PDF
-        doc.build(elements)
+        # Render with the precomputed template styles, then store the PDF under its content hash
+        with tempfile.SpooledTemporaryFile(max_size=Config.PDF_SPOOL_MAX_SIZE) as buffer:
+            template.render(buffer, name, contact_info, sections)
+            buffer.seek(0)
+            digest = hashlib.sha256()
+            for chunk in iter(lambda: buffer.read(64 * 1024), b''):
+                digest.update(chunk)
+            buffer.seek(0)
+            filename = store_file(digest.hexdigest(), buffer)
         
         return jsonify({
             'status': 'success',
@@ -208,62 +677,85 @@ def generate_pdf():
         print(f"Error generating PDF: {str(e)}\n{error_details}")
         return jsonify({'error': f'Error generating PDF: {str(e)}'}), 500
 
-def cleanup_old_files(folder, max_age_hours=24):
-    """Remove files older than the specified hours from a folder"""
+def pdf_stream_response(buffer, chunk_size=64 * 1024):
+    """Stream a rendered PDF from a buffer with Content-Length and a content ETag"""
+    size = buffer.tell()
+    buffer.seek(0)
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: buffer.read(chunk_size), b''):
+        digest.update(chunk)
+    buffer.seek(0)
+    
+    def generate():
+        try:
+            for chunk in iter(lambda: buffer.read(chunk_size), b''):
+                yield chunk
+        finally:
+            buffer.close()
+    
+    response = Response(generate(), mimetype='application/pdf')
+    response.content_length = size
+    response.set_etag(digest.hexdigest())
+    response.headers['Content-Disposition'] = 'inline; filename="resume.pdf"'
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+@app.route('/admin/cleanup', methods=['GET', 'POST'])
+@admin_required
+def manual_cleanup():
+    """Report reaper metrics, or on POST remove expired files right away"""
     try:
-        now = datetime.now()
-        count = 0
-        
-        if not os.path.exists(folder):
-            print(f"Folder {folder} does not exist, skipping cleanup")
-            return 0
-        
-        for filename in os.listdir(folder):
-            filepath = os.path.join(folder, filename)
-            if os.path.isfile(filepath):
-                file_modified = datetime.fromtimestamp(os.path.getmtime(filepath))
-                
-                if now - file_modified > timedelta(hours=max_age_hours):
-                    try:
-                        os.remove(filepath)
-                        count += 1
-                    except Exception as e:
-                        print(f"Error removing file {filepath}: {str(e)}")
-        
-        print(f"Cleanup completed: removed {count} files older than {max_age_hours} hours")
-        return count
+        if request.method == 'POST':
+            body = request.get_json(silent=True) or {}
+            max_age_hours = body.get('max_age_hours')
+            count = reaper.run_until_done(max_age_hours * 3600 if max_age_hours is not None else None)
+            return jsonify({'status': 'success', 'files_removed': count, 'cleanup': reaper.stats()})
+        return jsonify({'status': 'success', 'cleanup': reaper.stats()})
     except Exception as e:
-        print(f"Error during cleanup: {str(e)}")
-        return 0
+        return jsonify({'error': str(e)}), 500
 
-def periodic_cleanup(folder, interval_hours=6, max_age_hours=24):
-    """Run cleanup at regular intervals"""
-    while True:
-        time.sleep(interval_hours * 3600)  # Convert hours to seconds
-        print(f"Running scheduled cleanup...")
-        cleanup_old_files(folder, max_age_hours)
+@app.route('/admin/cache', methods=['GET'])
+@admin_required
+def cache_stats():
+    """Report parse cache hit/miss counters, index and store sizes, and LLM token usage"""
+    stats = {
+        'status': 'success',
+        'parse_cache': parse_cache.stats(),
+        'parse_engine': parse_engine.stats(),
+        'resume_index': resume_index.stats(),
+        'vector_index': vector_index.stats(),
+        'resume_store': resume_store.stats()
+    }
+    # Claude is only set up once a request has needed it
+    if _resume_processor is not None:
+        if _resume_processor.cache is not None:
+            stats['llm_cache'] = _resume_processor.cache.stats()
+        stats['llm_usage'] = _resume_processor.usage.stats()
+    return jsonify(stats)
 
-@app.route('/admin/cleanup', methods=['POST'])
-def manual_cleanup():
-    """Manually trigger cleanup via API endpoint"""
+def load_resume_index():
+    """Rebuild the in-memory matching index from the resume store"""
     try:
-        max_age_hours = request.json.get('max_age_hours', 24) if request.json else 24
-        count = cleanup_old_files(app.config['UPLOAD_FOLDER'], max_age_hours)
-        return jsonify({'status': 'success', 'files_removed': count})
+        for file_hash, parsed_data in resume_store.iter_resumes():
+            index_resume(file_hash, parsed_data)
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        print(f"Error loading resume index: {str(e)}")
 
-# Run cleanup at startup
-print("Cleaning up old files on startup...")
-cleanup_old_files(UPLOAD_FOLDER)
+def sweep_parse_cache():
+    """Delete parse cache files that expired without being read again"""
+    parse_cache.sweep()
 
-# Start periodic cleanup in a background thread
-cleanup_thread = threading.Thread(
-    target=periodic_cleanup, 
-    args=(UPLOAD_FOLDER, 6, 24),  # Clean every 6 hours, remove files older than 24 hours
-    daemon=True
-)
-cleanup_thread.start()
+def purge_resumes():
+    """Delete stored parse results past their retention period and drop them from the matching indexes"""
+    cutoff = time.time() - Config.RESUME_RETENTION
+    while True:
+        purged = resume_store.purge(cutoff, Config.CLEANUP_BATCH_SIZE)
+        for file_hash in purged:
+            resume_index.remove(file_hash)
+            vector_index.remove(file_hash)
+        if len(purged) < Config.CLEANUP_BATCH_SIZE:
+            return
 
 if __name__ == '__main__':
+    init_services()
     app.run(debug=True) 
\ No newline at end of file
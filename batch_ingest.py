@@ -0,0 +1,168 @@
+"""Bulk resume parsing for ATS exports.
+
+Parses every PDF in the given folders and zip archives across all cores,
+writes one JSON object per resume (JSON Lines) and saves the parse results
+to the resume store the app reads, e.g.
+
+    python batch_ingest.py exports/ more_resumes.zip --workers 8 -o parsed.jsonl
+
+PDFs are parsed by a ParseEngine, so one that hangs pdfplumber is given up
+on after --timeout seconds and its worker replaced, like an upload. A
+running app picks up the stored resumes for matching on its next start.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import zipfile
+from collections import deque
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+from config import Config
+from parse_engine import ParseEngine
+from resume_store import ResumeStore
+
+def iter_pdf_sources(paths: Iterable[str]) -> Iterator[Tuple[str, Optional[str]]]:
+    """Yield (path, zip member) pairs for every PDF under the given folders and zips.
+
+    The member is None for plain files. Only names are yielded so that
+    huge exports are never loaded into memory up front.
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for filename in sorted(files):
+                    if filename.lower().endswith('.pdf'):
+                        yield os.path.join(root, filename), None
+        elif zipfile.is_zipfile(path):
+            with zipfile.ZipFile(path) as archive:
+                for member in archive.namelist():
+                    if member.lower().endswith('.pdf') and not member.endswith('/'):
+                        yield path, member
+        elif path.lower().endswith('.pdf'):
+            yield path, None
+        else:
+            print(f"Skipping {path}: not a folder, zip archive or PDF", file=sys.stderr)
+
+
+def result_record(name: str, started: float, parsed_data: Optional[Dict[str, Any]] = None,
+                  error: Optional[str] = None) -> Dict[str, Any]:
+    """Build the JSON Lines record reported for one resume"""
+    record = {
+        'file': name,
+        'status': 'error' if error else 'success',
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 2)
+    }
+    if error:
+        record['error'] = error
+    else:
+        record['parsed_data'] = parsed_data
+    return record
+
+
+def read_source(source: Tuple[str, Optional[str]], archives: Dict[str, zipfile.ZipFile]) -> Tuple[str, bytes]:
+    """Return the display name and bytes of one (path, zip member) pair"""
+    path, member = source
+    if not member:
+        with open(path, 'rb') as f:
+            return path, f.read()
+    archive = archives.get(path)
+    if archive is None:
+        archive = archives[path] = zipfile.ZipFile(path)
+    return f"{path}!{member}", archive.read(member)
+
+
+def parse_many(sources: Iterable[Tuple[str, Optional[str]]], workers: Optional[int] = None,
+               timeout: float = Config.PARSE_TIMEOUT) -> Iterator[Tuple[Dict[str, Any], Optional[str]]]:
+    """Parse sources in worker processes, yielding (record, content hash) in source order.
+
+    At most two jobs per worker are in flight, so huge exports are read a
+    few files ahead of the parsers. The hash is None when the file could
+    not be read.
+    """
+    workers = workers or os.cpu_count() or 1
+    engine = ParseEngine(processes=workers, max_pending=2 * workers, timeout=timeout,
+                         max_tasks_per_child=Config.PARSE_MAX_TASKS_PER_WORKER,
+                         start_method=Config.PARSE_START_METHOD)
+    archives: Dict[str, zipfile.ZipFile] = {}
+    in_flight = deque()
+
+    def finish(name, started, file_hash, job):
+        try:
+            return result_record(name, started, job.result()), file_hash
+        except Exception as e:
+            return result_record(name, started, error=f"{type(e).__name__}: {str(e)}"), file_hash
+
+    try:
+        for source in sources:
+            if len(in_flight) >= engine.max_pending:
+                yield finish(*in_flight.popleft())
+            started = time.perf_counter()
+            try:
+                name, data = read_source(source, archives)
+            except Exception as e:
+                name = f"{source[0]}!{source[1]}" if source[1] else source[0]
+                yield result_record(name, started, error=f"{type(e).__name__}: {str(e)}"), None
+                continue
+            job = engine.submit(data, raise_errors=True)
+            in_flight.append((name, started, hashlib.sha256(data).hexdigest(), job))
+        while in_flight:
+            yield finish(*in_flight.popleft())
+    finally:
+        while in_flight:
+            in_flight.popleft()[-1].cancel()
+        engine.shutdown()
+        for archive in archives.values():
+            archive.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description='Parse folders or zip archives of resume PDFs to JSON Lines')
+    arg_parser.add_argument('paths', nargs='+', help='Folders, zip archives or PDF files to parse')
+    arg_parser.add_argument('-o', '--output', help='JSON Lines output file (defaults to stdout)')
+    arg_parser.add_argument('-w', '--workers', type=int, default=os.cpu_count(),
+                            help='Number of parser processes (defaults to the number of cores)')
+    arg_parser.add_argument('--timeout', type=float, default=Config.PARSE_TIMEOUT,
+                            help='Seconds before a single PDF is given up on')
+    arg_parser.add_argument('--db', default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                         Config.RESUME_DB_PATH),
+                            help="Resume store to save parse results to (defaults to the app's)")
+    arg_parser.add_argument('--no-store', action='store_true', help='Only write JSON Lines')
+    args = arg_parser.parse_args(argv)
+
+    store = None if args.no_store else ResumeStore(args.db)
+    pending = []
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    started = time.perf_counter()
+    total = failed = 0
+    try:
+        for record, file_hash in parse_many(iter_pdf_sources(args.paths), args.workers, args.timeout):
+            output.write(json.dumps(record) + '\n')
+            total += 1
+            if record['status'] == 'error':
+                failed += 1
+            elif store is not None:
+                pending.append({'content_hash': file_hash, 'data': record['parsed_data'],
+                                'filename': os.path.basename(record['file'])})
+                # Written in transactions of many resumes, as the batch endpoint does
+                if len(pending) >= Config.RESUME_STORE_BATCH_SIZE:
+                    store.save_many(pending)
+                    pending.clear()
+    finally:
+        if pending:
+            store.save_many(pending)
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - started
+    rate = total / elapsed if elapsed else 0
+    print(f"Parsed {total} resumes ({failed} failed) in {elapsed:.1f}s, {rate:.1f} resumes/s",
+          file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
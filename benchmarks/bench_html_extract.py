@@ -0,0 +1,102 @@
+"""Compare the /generate-pdf HTML extraction against the regex chain it replaced.
+
+Builds editor-style preview HTML of increasing size and times the old
+re.search/re.finditer extraction and render_input.extract_from_html. The
+regex chain is linear on well-formed HTML but rescans to the end of the
+section for every unclosed tag, so a second run puts every entry in one
+section and leaves out the optional </li>:
+
+    python benchmarks/bench_html_extract.py --sizes 40 200 800
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from render_input import extract_from_html  # noqa: E402
+
+
+def legacy_extract(html_content):
+    """The regex extraction /generate-pdf used before render_input"""
+    def clean_html(text):
+        return re.sub(r'<[^>]*>', '', text).strip()
+
+    name_match = re.search(r'<h1>(.*?)</h1>', html_content, re.DOTALL)
+    name = clean_html(name_match.group(1)) if name_match else "Resume"
+
+    contact_match = re.search(r'<div class="contact-info">(.*?)</div>', html_content, re.DOTALL)
+    contact_info = clean_html(contact_match.group(1)) if contact_match else ""
+    contact_info = contact_info.replace('<br>', '\n')
+
+    sections = []
+    for match in re.finditer(r'<h2>(.*?)</h2>(.*?)(?=<h2>|$)', html_content, re.DOTALL):
+        bullet_points = []
+        for bullet_match in re.finditer(r'<li>(.*?)</li>', match.group(2), re.DOTALL):
+            bullet_text = clean_html(bullet_match.group(1))
+            if bullet_text:
+                bullet_points.append(bullet_text)
+        sections.append({'title': clean_html(match.group(1)), 'bullet_points': bullet_points})
+
+    return name, contact_info, sections
+
+
+def editor_html(section_count: int, entries_per_section: int = 4, points_per_entry: int = 5,
+                close_items: bool = True) -> str:
+    """Build HTML shaped like the editor's live preview"""
+    parts = [
+        '<h1>Jordan Smith</h1>',
+        '<div class="contact-info">jordan@example.com | (555) 123-4567 | Austin, TX<br>'
+        '<a href="https://linkedin.com/in/jordan">linkedin.com/in/jordan</a></div>'
+    ]
+    for s in range(section_count):
+        parts.append(f'<h2>Section {s}</h2>')
+        for e in range(entries_per_section):
+            parts.append('<div class="preview-entry"><div class="entry-header">'
+                         f'<span class="company">Company {e}</span>'
+                         '<span style="text-align: right;"><span class="location">Austin, TX</span> | '
+                         '<span class="duration">Jan 2020 - Present</span></span></div><ul>')
+            for p in range(points_per_entry):
+                parts.append(f'<li>Built <b>feature {p}</b> for team {e} &amp; improved latency by {p}0%'
+                             + ('</li>' if close_items else ''))
+            parts.append('</ul></div>')
+    return '\n'.join(parts)
+
+
+def best_time(func, arg, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[40, 200, 800],
+                            help='Entry counts to benchmark')
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    for close_items in (True, False):
+        print('well-formed HTML' if close_items else 'list items without </li>')
+        print(f"{'entries':>9}{'html KB':>10}{'regex ms':>12}{'tokenizer ms':>14}{'same output':>13}")
+        for size in args.sizes:
+            if close_items:
+                html_content = editor_html(max(1, size // 4))
+            else:
+                html_content = editor_html(1, entries_per_section=size, close_items=False)
+            legacy = best_time(legacy_extract, html_content, args.repeat)
+            current = best_time(extract_from_html, html_content, args.repeat)
+            same = legacy_extract(html_content) == extract_from_html(html_content)
+            print(f"{size:>9}{len(html_content) / 1024:>10.0f}{legacy * 1000:>12.1f}"
+                  f"{current * 1000:>14.1f}{str(same):>13}")
+        print()
+
+
+if __name__ == '__main__':
+    main()
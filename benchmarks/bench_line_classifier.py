@@ -0,0 +1,73 @@
+"""Per-resume CPU time of ResumeParser's line classification and section parsing.
+
+Runs the current pdf_parser over a synthetic corpus and, with --compare-ref,
+the pdf_parser from another git revision for a before/after comparison:
+
+    python benchmarks/bench_line_classifier.py --compare-ref HEAD~1
+"""
+import argparse
+import importlib.util
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pdf_parser  # noqa: E402
+from benchmarks.corpus import generate_corpus, resume_lines  # noqa: E402
+
+
+def load_parser_from_ref(ref: str):
+    """Import pdf_parser.py as it was at a git revision"""
+    source = subprocess.run(['git', 'show', f'{ref}:pdf_parser.py'], cwd=ROOT,
+                            check=True, capture_output=True, text=True).stdout
+    path = os.path.join(tempfile.mkdtemp(), f'pdf_parser_{ref.replace("~", "_").replace("/", "_")}.py')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(source)
+    spec = importlib.util.spec_from_file_location(os.path.basename(path)[:-3], path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def cpu_time_per_resume(module, documents, repeat: int) -> float:
+    """Best-of-repeat CPU seconds per resume for contact + section extraction"""
+    parser = module.ResumeParser()
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.process_time()
+        for lines in documents:
+            parser._extract_contact_info(lines[:5])
+            parser._extract_sections(lines)
+        best = min(best, time.process_time() - started)
+    return best / len(documents)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--resumes', type=int, default=500, help='Synthetic resumes to parse')
+    arg_parser.add_argument('--repeat', type=int, default=5, help='Runs per parser, best is reported')
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--compare-ref', help='Git revision whose pdf_parser.py is the "before"')
+    args = arg_parser.parse_args()
+
+    rng = random.Random(args.seed)
+    documents = [resume_lines(resume, rng) for resume in generate_corpus(args.resumes, args.seed)]
+    line_count = sum(len(lines) for lines in documents)
+    print(f"{len(documents)} resumes, {line_count / len(documents):.0f} lines per resume on average")
+
+    current = cpu_time_per_resume(pdf_parser, documents, args.repeat)
+    if args.compare_ref:
+        before = cpu_time_per_resume(load_parser_from_ref(args.compare_ref), documents, args.repeat)
+        print(f"{args.compare_ref:>12}: {before * 1e6:9.1f} us CPU per resume")
+        print(f"{'current':>12}: {current * 1e6:9.1f} us CPU per resume ({before / current:.2f}x)")
+    else:
+        print(f"{'current':>12}: {current * 1e6:9.1f} us CPU per resume")
+
+
+if __name__ == '__main__':
+    main()
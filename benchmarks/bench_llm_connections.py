@@ -0,0 +1,104 @@
+"""Count the HTTP connections Claude calls open, against a local mock API.
+
+Starts a keep-alive HTTP server that answers the Messages API with a canned
+resume, points CLAUDE_API_URL at it and runs the same requests two ways:
+a new ChatAnthropic per request, as ResumeProcessor used to build, and the
+shared client from llm_client.get_chat_model. No API key or network needed:
+
+    python benchmarks/bench_llm_connections.py --requests 50
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config import Config  # noqa: E402
+
+
+class MockMessagesHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep connections open between requests
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        body = json.dumps({
+            'id': 'msg_mock', 'type': 'message', 'role': 'assistant', 'model': 'mock',
+            'content': [{'type': 'text', 'text': json.dumps({'personal_info': {'name': 'Mock'}, 'sections': []})}],
+            'stop_reason': 'end_turn', 'stop_sequence': None,
+            'usage': {'input_tokens': 10, 'output_tokens': 10}
+        }).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MockMessagesHandler)
+    server.lock = threading.Lock()
+    server.connections = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def measure(server, make_processor, count: int):
+    from llm_client import run_async
+    server.connections = 0
+    started = time.perf_counter()
+    for i in range(count):
+        run_async(make_processor().process_resume(f"Resume {i}"))
+    return server.connections, time.perf_counter() - started
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--requests', type=int, default=50)
+    args = arg_parser.parse_args()
+
+    server = start_server()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    # The per-instance clients ChatAnthropic builds only pick the endpoint up from the environment
+    os.environ['ANTHROPIC_BASE_URL'] = url
+    Config.CLAUDE_API_URL = url
+    Config.CLAUDE_API_KEY = Config.CLAUDE_API_KEY or 'mock-key'
+
+    from langchain_anthropic import ChatAnthropic
+    from llm_client import close_clients
+    from rate_limit import TokenBucket
+    from resume_processor import ResumeProcessor
+
+    # The mock server has no rate limit, so neither do the processors
+    unthrottled = TokenBucket(1e6)
+
+    def per_instance():
+        return ResumeProcessor(llm=ChatAnthropic(model='mock', anthropic_api_key=Config.CLAUDE_API_KEY,
+                                                 max_tokens=100), cache=False, rate_limiter=unthrottled)
+
+    def shared():
+        return ResumeProcessor(cache=False, rate_limiter=unthrottled)
+
+    print(f"{'client':<16}{'requests':>10}{'connections':>13}{'ms/request':>12}")
+    for label, factory in (('per instance', per_instance), ('shared', shared)):
+        connections, elapsed = measure(server, factory, args.requests)
+        print(f"{label:<16}{args.requests:>10}{connections:>13}{elapsed / args.requests * 1000:>12.2f}")
+
+    close_clients()
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
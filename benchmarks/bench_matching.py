@@ -0,0 +1,76 @@
+"""Query latency of matching.ResumeIndex over a large synthetic resume pool.
+
+Indexes generated resumes, then times top-k searches for random job
+descriptions on a single thread and reports build time and latency
+percentiles:
+
+    python benchmarks/bench_matching.py --resumes 100000 --queries 200
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from matching import ResumeIndex, match_score  # noqa: E402
+from benchmarks.corpus import POSITIONS, SKILLS, generate_corpus  # noqa: E402
+
+
+def job_description(rng: random.Random) -> str:
+    """A short posting asking for a position and a handful of skills"""
+    skills = rng.sample(SKILLS, rng.randint(3, 8))
+    return (f"We are hiring a {rng.choice(POSITIONS)} to build data pipelines and services. "
+            f"Required: {', '.join(skills[:-2])}. Nice to have: {', '.join(skills[-2:])}. "
+            f"Experience with CI/CD, dashboards and reducing latency is a plus.")
+
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--resumes', type=int, default=100000, help='Synthetic resumes to index')
+    arg_parser.add_argument('--queries', type=int, default=200, help='Job descriptions to search for')
+    arg_parser.add_argument('--top-k', type=int, default=20)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    args = arg_parser.parse_args()
+
+    resumes = generate_corpus(args.resumes, args.seed)
+    index = ResumeIndex()
+    started = time.perf_counter()
+    for i, resume in enumerate(resumes):
+        index.add(f"resume-{i}", resume)
+    build = time.perf_counter() - started
+    stats = index.stats()
+    print(f"indexed {stats['resumes']} resumes ({stats['terms']} terms, {stats['postings']} postings) "
+          f"in {build:.1f}s ({build / len(resumes) * 1e6:.0f} us per resume)")
+
+    rng = random.Random(args.seed)
+    queries = [job_description(rng) for _ in range(args.queries)]
+    # The first search converts postings to numpy arrays, time it separately
+    started = time.perf_counter()
+    index.search(queries[0], args.top_k)
+    print(f"first search: {(time.perf_counter() - started) * 1e3:.1f} ms")
+
+    latencies = []
+    for query in queries:
+        started = time.perf_counter()
+        results = index.search(query, args.top_k)
+        latencies.append(time.perf_counter() - started)
+    print(f"search top-{args.top_k}: p50 {percentile(latencies, 0.5) * 1e3:.1f} ms, "
+          f"p95 {percentile(latencies, 0.95) * 1e3:.1f} ms, max {max(latencies) * 1e3:.1f} ms")
+
+    best = int(results[0]['resume_id'].split('-')[1])
+    started = time.perf_counter()
+    score = match_score(resumes[best], queries[-1], index)
+    print(f"match_score for the top result: {score['score']} "
+          f"({(time.perf_counter() - started) * 1e3:.2f} ms)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Memory held by parsed resumes as dicts and as resume_model dataclasses.
+
+Loads a synthetic pool from JSON both ways (as the parse cache and job
+store hand resumes back) and reports traced allocation per resume, plus
+serialization time for each form:
+
+    python benchmarks/bench_resume_memory.py --resumes 100000
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from resume_model import Resume  # noqa: E402
+from benchmarks.corpus import generate_corpus  # noqa: E402
+
+
+def traced(load, documents):
+    """Bytes still allocated after load has built every document, and the result"""
+    gc.collect()
+    tracemalloc.start()
+    result = [load(document) for document in documents]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, result
+
+
+def timed(function, items) -> float:
+    started = time.perf_counter()
+    for item in items:
+        function(item)
+    return (time.perf_counter() - started) / len(items)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--resumes', type=int, default=100000, help='Synthetic resumes to hold')
+    arg_parser.add_argument('--seed', type=int, default=0)
+    args = arg_parser.parse_args()
+
+    documents = [json.dumps(resume) for resume in generate_corpus(args.resumes, args.seed)]
+    print(f"{len(documents)} resumes, {sum(map(len, documents)) / len(documents):.0f} bytes of JSON each")
+
+    dict_size, dicts = traced(json.loads, documents)
+    del dicts
+    model_size, models = traced(Resume.from_json, documents)
+    print(f"dicts:  {dict_size / len(documents):8.0f} bytes per resume, {dict_size / 2 ** 20:7.1f} MB total")
+    print(f"models: {model_size / len(documents):8.0f} bytes per resume, {model_size / 2 ** 20:7.1f} MB total "
+          f"({1 - model_size / dict_size:.0%} less)")
+
+    sample = documents[:5000]
+    loaded = [json.loads(document) for document in sample]
+    print(f"json.loads:        {timed(json.loads, sample) * 1e6:6.1f} us")
+    print(f"Resume.from_json:  {timed(Resume.from_json, sample) * 1e6:6.1f} us")
+    print(f"json.dumps:        {timed(json.dumps, loaded) * 1e6:6.1f} us")
+    print(f"Resume.to_json:    {timed(Resume.to_json, models[:len(sample)]) * 1e6:6.1f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Write and lookup throughput of resume_store.ResumeStore.
+
+Saves a synthetic pool to a temporary database one transaction per resume
+and with save_many, then times indexed lookups against the full table:
+
+    python benchmarks/bench_resume_store.py --resumes 100000
+"""
+import argparse
+import hashlib
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from resume_store import ResumeStore  # noqa: E402
+from benchmarks.corpus import generate_corpus  # noqa: E402
+
+
+def timed_lookups(lookup, keys) -> float:
+    started = time.perf_counter()
+    for key in keys:
+        lookup(key)
+    return (time.perf_counter() - started) / len(keys)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--resumes', type=int, default=100000, help='Synthetic resumes to store')
+    arg_parser.add_argument('--single', type=int, default=2000, help='Resumes saved one transaction each')
+    arg_parser.add_argument('--lookups', type=int, default=1000)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    args = arg_parser.parse_args()
+
+    resumes = generate_corpus(args.resumes, args.seed)
+    records = [{'content_hash': hashlib.sha256(f"{args.seed}-{i}".encode()).hexdigest(), 'data': resume}
+               for i, resume in enumerate(resumes)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = ResumeStore(os.path.join(directory, 'single.db'))
+        sample = records[:args.single]
+        started = time.perf_counter()
+        for record in sample:
+            store.save(record['content_hash'], record['data'])
+        single = (time.perf_counter() - started) / len(sample)
+        print(f"save:      {single * 1e6:7.0f} us per resume ({len(sample)} resumes)")
+
+        store = ResumeStore(os.path.join(directory, 'bulk.db'))
+        started = time.perf_counter()
+        store.save_many(records)
+        bulk = (time.perf_counter() - started) / len(records)
+        print(f"save_many: {bulk * 1e6:7.0f} us per resume ({len(records)} resumes, {single / bulk:.1f}x)")
+
+        rng = random.Random(args.seed)
+        picks = [rng.choice(records) for _ in range(args.lookups)]
+        emails = [record['data']['personal_info']['contact']['email'] for record in picks]
+        hashes = [record['content_hash'] for record in picks]
+        print(f"get by content hash: {timed_lookups(store.get, hashes) * 1e6:7.0f} us")
+        print(f"load as Resume:      {timed_lookups(store.load, hashes) * 1e6:7.0f} us")
+        print(f"find by email:       {timed_lookups(lambda email: store.find(email=email), emails) * 1e6:7.0f} us")
+        print(f"newest 100 uploads:  "
+              f"{timed_lookups(lambda _: store.find(limit=100), range(100)) * 1e6:7.0f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Skill scanning with skill_gap.SkillMatcher against a per-term search.
+
+Scans the text of synthetic resumes for every term of data/skills.txt,
+padded with made-up terms to --terms entries, once with the Aho-Corasick
+automaton and once with a `term in text` check per term (the candidates a
+per-term scan would still have to verify for word boundaries):
+
+    python benchmarks/bench_skill_scan.py --terms 5000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config import Config  # noqa: E402
+from skill_gap import SkillMatcher, load_skill_dictionary  # noqa: E402
+from benchmarks.corpus import generate_corpus, resume_lines  # noqa: E402
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--resumes', type=int, default=200, help='Synthetic resumes to scan')
+    arg_parser.add_argument('--terms', type=int, default=5000, help='Dictionary size, padded with made-up terms')
+    arg_parser.add_argument('--seed', type=int, default=0)
+    args = arg_parser.parse_args()
+
+    aliases = load_skill_dictionary(os.path.join(ROOT, Config.SKILLS_DICTIONARY))
+    rng = random.Random(args.seed)
+    while len(aliases) < args.terms:
+        term = f"{rng.choice(['Open', 'Hyper', 'Data', 'Cloud', 'Net'])}{rng.choice(['Flow', 'Grid', 'Forge', 'Stack'])} {len(aliases)}"
+        aliases[term] = term
+
+    texts = ['\n'.join(resume_lines(resume, rng)) for resume in generate_corpus(args.resumes, args.seed)]
+    print(f"{len(aliases)} terms, {len(texts)} resumes, {sum(map(len, texts)) / len(texts):.0f} characters each")
+
+    started = time.perf_counter()
+    matcher = SkillMatcher(aliases)
+    print(f"build automaton: {(time.perf_counter() - started) * 1e3:.1f} ms")
+
+    started = time.perf_counter()
+    found = sum(len(matcher.find(text)) for text in texts)
+    automaton = (time.perf_counter() - started) / len(texts)
+
+    lowered = [(alias.lower(), alias) for alias in aliases]
+    started = time.perf_counter()
+    candidates = 0
+    for text in texts:
+        text = text.lower()
+        candidates += sum(1 for term, _ in lowered if term in text)
+    naive = (time.perf_counter() - started) / len(texts)
+
+    print(f"per-term 'in': {naive * 1e3:8.2f} ms per resume ({candidates / len(texts):.1f} candidates, unverified)")
+    print(f"automaton:     {automaton * 1e3:8.2f} ms per resume ({found / len(texts):.1f} mentions, "
+          f"{naive / automaton:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Whole-pool similarity with vector_index.VectorIndex against a per-pair Python loop.
+
+Stores vectors for a synthetic resume pool in a temporary memory-mapped
+matrix, then times ranking the pool against job descriptions one resume at
+a time with matching.match_score and with a single matrix product:
+
+    python benchmarks/bench_vector_scoring.py --resumes 100000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from matching import match_score  # noqa: E402
+from vector_index import VectorIndex, text_vector  # noqa: E402
+from benchmarks.bench_matching import job_description  # noqa: E402
+from benchmarks.corpus import generate_corpus  # noqa: E402
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--resumes', type=int, default=100000, help='Synthetic resumes in the pool')
+    arg_parser.add_argument('--postings', type=int, default=10, help='Job descriptions ranked in one batch')
+    arg_parser.add_argument('--loop-sample', type=int, default=2000,
+                            help='Resumes scored by the per-pair loop, extrapolated to the pool')
+    arg_parser.add_argument('--dim', type=int, default=512)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    args = arg_parser.parse_args()
+
+    resumes = generate_corpus(args.resumes, args.seed)
+    rng = random.Random(args.seed)
+    postings = [job_description(rng) for _ in range(args.postings)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        index = VectorIndex(directory, dim=args.dim)
+        started = time.perf_counter()
+        for i, resume in enumerate(resumes):
+            index.add_resume(f"resume-{i}", resume)
+        build = time.perf_counter() - started
+        print(f"stored {len(index)} vectors ({index.stats()['bytes'] / 2 ** 20:.0f} MB) "
+              f"in {build:.1f}s ({build / len(resumes) * 1e6:.0f} us per resume)")
+
+        started = time.perf_counter()
+        index = VectorIndex(directory, dim=args.dim)
+        print(f"reopen and map: {(time.perf_counter() - started) * 1e3:.1f} ms")
+        index.similarities(text_vector(postings[0], args.dim))  # Fault the pages in
+
+        sample = resumes[:args.loop_sample]
+        started = time.perf_counter()
+        for resume in sample:
+            match_score(resume, postings[0])
+        loop = (time.perf_counter() - started) / len(sample) * len(resumes)
+        print(f"per-pair loop: {loop * 1e3:9.1f} ms per posting (extrapolated from {len(sample)} resumes)")
+
+        started = time.perf_counter()
+        for posting in postings:
+            index.similarities(text_vector(posting, args.dim))
+        single = (time.perf_counter() - started) / len(postings)
+        print(f"matrix-vector: {single * 1e3:9.1f} ms per posting ({loop / single:.0f}x)")
+
+        started = time.perf_counter()
+        queries = np.stack([text_vector(posting, args.dim) for posting in postings])
+        _, scores = index.similarities(queries)
+        batch = (time.perf_counter() - started) / len(postings)
+        print(f"matrix-matrix: {batch * 1e3:9.1f} ms per posting, {len(postings)} postings "
+              f"in one product {scores.shape}")
+
+
+if __name__ == '__main__':
+    main()
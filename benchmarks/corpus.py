@@ -0,0 +1,191 @@
+"""Synthetic resume corpus used by the benchmarks.
+
+Resumes are generated from a seeded random.Random so every run sees the
+same corpus.
+"""
+import random
+from typing import Dict, List, Any
+
+FIRST_NAMES = ['Alex', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie', 'Avery', 'Quinn', 'Devon']
+LAST_NAMES = ['Smith', 'Garcia', 'Chen', 'Patel', 'Johnson', 'Nguyen', 'Kim', 'Okafor', 'Silva', 'Novak']
+CITIES = ['Austin, TX', 'Charlotte, NC', 'Seattle, WA', 'Boston, MA', 'Denver, CO', 'Chicago, IL']
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Hooli', 'Stark Industries', 'Wayne Enterprises']
+POSITIONS = ['Software Engineer', 'Data Scientist', 'Data Analyst', 'Backend Developer',
+             'Machine Learning Engineer', 'Product Analyst', 'DevOps Engineer']
+SCHOOLS = ['State University', 'Tech Institute College', 'City University', 'Northern School of Engineering']
+DEGREES = ['Bachelor of Science in Computer Science', 'Master of Science in Data Science',
+           'Bachelor of Arts in Economics']
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+SKILLS = ['Python', 'SQL', 'Java', 'Go', 'Rust', 'JavaScript', 'React', 'Docker', 'Kubernetes', 'AWS',
+          'GCP', 'Pandas', 'NumPy', 'PyTorch', 'TensorFlow', 'Spark', 'Airflow', 'Tableau', 'Git', 'Linux']
+VERBS = ['Built', 'Designed', 'Led', 'Optimized', 'Automated', 'Migrated', 'Launched', 'Analyzed']
+OBJECTS = ['a data pipeline', 'the billing service', 'an internal dashboard', 'the search API',
+           'a recommendation model', 'CI/CD workflows', 'the reporting stack']
+OUTCOMES = ['reducing latency by {n}%', 'saving {n} hours per week', 'serving {n}k daily users',
+            'cutting costs by {n}%', 'improving accuracy by {n}%']
+BULLETS = ['•', '-', '*', '1.']
+
+
+def _date(rng: random.Random) -> str:
+    start_year = rng.randint(2010, 2022)
+    end = 'Present' if rng.random() < 0.3 else f"{rng.choice(MONTHS)} {start_year + rng.randint(1, 3)}"
+    return f"{rng.choice(MONTHS)} {start_year} - {end}"
+
+
+def _bullet(rng: random.Random) -> str:
+    outcome = rng.choice(OUTCOMES).format(n=rng.randint(5, 90))
+    return f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(SKILLS)}, {outcome}"
+
+
+def generate_resume(rng: random.Random, jobs: int = 3, bullets_per_job: int = 4,
+                    projects: int = 2) -> Dict[str, Any]:
+    """Generate a resume in the structure ResumeParser.parse returns"""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    handle = name.lower().replace(' ', '')
+    location = rng.choice(CITIES)
+
+    experience = [{
+        "company": rng.choice(COMPANIES),
+        "position": rng.choice(POSITIONS),
+        "location": rng.choice(CITIES),
+        "duration": _date(rng),
+        "points": [_bullet(rng) for _ in range(bullets_per_job)]
+    } for _ in range(jobs)]
+
+    education = [{
+        "company": rng.choice(SCHOOLS),
+        "position": rng.choice(DEGREES),
+        "location": rng.choice(CITIES),
+        "duration": _date(rng),
+        "points": [f"GPA: {rng.randint(30, 40) / 10}"]
+    }]
+
+    project_entries = [{
+        "company": f"Project {i + 1}",
+        "position": "",
+        "location": "",
+        "duration": "",
+        "points": [_bullet(rng) for _ in range(2)]
+    } for i in range(projects)]
+
+    skills = [{
+        "company": "Technical Skills",
+        "position": "",
+        "location": "",
+        "duration": "",
+        "points": rng.sample(SKILLS, 10)
+    }]
+
+    return {
+        "personal_info": {
+            "name": name,
+            "contact": {
+                "email": f"{handle}@example.com",
+                "phone": f"({rng.randint(200, 999)}) {rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+                "location": location,
+                "linkedin": f"linkedin.com/in/{handle}",
+                "github": f"github.com/{handle}"
+            }
+        },
+        "sections": [
+            {"title": "EXPERIENCE", "entries": experience},
+            {"title": "EDUCATION", "entries": education},
+            {"title": "PROJECTS", "entries": project_entries},
+            {"title": "SKILLS", "entries": skills}
+        ]
+    }
+
+
+def resume_lines(resume: Dict[str, Any], rng: random.Random) -> List[str]:
+    """Render a generated resume as the text lines pdfplumber would extract"""
+    personal = resume["personal_info"]
+    contact = personal["contact"]
+    lines = [
+        personal["name"],
+        f"{contact['location']} | {contact['phone']} | {contact['email']}",
+        f"{contact['linkedin']} | {contact['github']}"
+    ]
+    for section in resume["sections"]:
+        lines.append(section["title"])
+        for entry in section["entries"]:
+            if section["title"] == "SKILLS":
+                lines.append(", ".join(entry["points"]))
+                continue
+            header = entry["company"]
+            if entry["location"]:
+                header = f"{header} {entry['location']}"
+            lines.append(header)
+            if entry["position"]:
+                lines.append(entry["position"])
+            if entry["duration"]:
+                lines.append(entry["duration"])
+            marker = rng.choice(BULLETS)
+            lines.extend(f"{marker} {point}" for point in entry["points"])
+    return lines
+
+
+def generate_corpus(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Generate resumes of varying length, from one-page to multi-page"""
+    rng = random.Random(seed)
+    return [generate_resume(rng,
+                            jobs=rng.randint(1, 8),
+                            bullets_per_job=rng.randint(2, 8),
+                            projects=rng.randint(0, 4))
+            for _ in range(count)]
+
+
+def render_pdf(resume: Dict[str, Any], output, layout: str = 'classic') -> None:
+    """Render a generated resume to a PDF path or file object with ReportLab.
+
+    Layouts: 'classic' (centred header, bullet lists), 'compact' (small
+    type, dash bullets) and 'table' (contact details in a two-column
+    header table).
+    """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table
+    from reportlab.lib.units import inch
+
+    styles = getSampleStyleSheet()
+    font_size = 8 if layout == 'compact' else 10
+    body = ParagraphStyle('Body', parent=styles['Normal'], fontSize=font_size, leading=font_size + 2)
+    title = ParagraphStyle('Title', parent=styles['Heading2'], fontSize=font_size + 2)
+    name_style = ParagraphStyle('Name', parent=styles['Heading1'], alignment=0 if layout == 'table' else 1)
+    marker = '-' if layout == 'compact' else '•'
+
+    personal = resume["personal_info"]
+    contact = personal["contact"]
+    contact_line = f"{contact['location']} | {contact['phone']} | {contact['email']}"
+    links_line = f"{contact['linkedin']} | {contact['github']}"
+
+    elements = []
+    if layout == 'table':
+        elements.append(Table([[Paragraph(personal["name"], name_style), Paragraph(contact_line, body)],
+                               ['', Paragraph(links_line, body)]],
+                              colWidths=[3 * inch, 3.5 * inch]))
+    else:
+        elements.append(Paragraph(personal["name"], name_style))
+        elements.append(Paragraph(contact_line, body))
+        elements.append(Paragraph(links_line, body))
+
+    for section in resume["sections"]:
+        elements.append(Paragraph(section["title"], title))
+        for entry in section["entries"]:
+            if section["title"] == "SKILLS":
+                elements.append(Paragraph(", ".join(entry["points"]), body))
+                continue
+            header = entry["company"]
+            if entry["location"]:
+                header = f"{header} {entry['location']}"
+            elements.append(Paragraph(header, body))
+            if entry["position"]:
+                elements.append(Paragraph(entry["position"], body))
+            if entry["duration"]:
+                elements.append(Paragraph(entry["duration"], body))
+            for point in entry["points"]:
+                elements.append(Paragraph(f"{marker} {point}", body))
+            if layout != 'compact':
+                elements.append(Spacer(1, 0.1 * inch))
+
+    SimpleDocTemplate(output, pagesize=letter,
+                      rightMargin=54, leftMargin=54, topMargin=54, bottomMargin=54).build(elements)
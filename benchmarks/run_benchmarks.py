@@ -0,0 +1,157 @@
+"""End-to-end latency benchmark for the resume pipeline.
+
+Generates synthetic resume PDFs of varying lengths and layouts, then times
+parse_pdf, ResumeProcessor.format_for_display and POST /generate-pdf for
+each one. Reports p50/p95/p99 latency, throughput and peak RSS, and
+compares the result with a saved baseline:
+
+    python benchmarks/run_benchmarks.py --save-baseline   # on the main branch
+    python benchmarks/run_benchmarks.py --check           # before deploying
+
+Exits with status 1 when any stage's p95 latency regresses by more than
+--threshold against the baseline. Timings depend on the machine, so no
+baseline is committed; CI saves one from the main branch on the same
+runner. With --check a missing baseline is an error (status 2) rather
+than a warning, so the gate can't silently pass.
+"""
+import argparse
+import json
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict, List, Any
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.corpus import generate_corpus, render_pdf  # noqa: E402
+
+LAYOUTS = ['classic', 'compact', 'table']
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    total = sum(samples)
+    return {
+        'count': len(samples),
+        'p50_ms': round(percentile(samples, 50) * 1000, 3),
+        'p95_ms': round(percentile(samples, 95) * 1000, 3),
+        'p99_ms': round(percentile(samples, 99) * 1000, 3),
+        'throughput_per_s': round(len(samples) / total, 2) if total else 0.0
+    }
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def run(resume_count: int, seed: int, workdir: str) -> Dict[str, Any]:
+    from pdf_parser import parse_pdf
+    from resume_processor import ResumeProcessor
+    import app as web_app
+
+    # Keep generated PDFs and the app's stores out of the real uploads and cache folders
+    web_app.init_services(workdir)
+    client = web_app.app.test_client()
+
+    paths = []
+    for i, resume in enumerate(generate_corpus(resume_count, seed)):
+        path = os.path.join(workdir, f'synthetic_{i}.pdf')
+        render_pdf(resume, path, LAYOUTS[i % len(LAYOUTS)])
+        paths.append(path)
+
+    timings = {'parse_pdf': [], 'format_for_display': [], 'generate_pdf': []}
+    for path in paths:
+        parsed, elapsed = timed(parse_pdf, path)
+        timings['parse_pdf'].append(elapsed)
+
+        html_content, elapsed = timed(ResumeProcessor.format_for_display, parsed)
+        timings['format_for_display'].append(elapsed)
+
+        started = time.perf_counter()
+        response = client.post('/generate-pdf', json={'html': html_content})
+        timings['generate_pdf'].append(time.perf_counter() - started)
+        if response.status_code != 200:
+            raise RuntimeError(f"/generate-pdf failed for {path}: {response.get_data(as_text=True)}")
+
+    results = {stage: summarize(samples) for stage, samples in timings.items()}
+    results['peak_rss_mb'] = peak_rss_mb()
+    return results
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Return a description of every stage whose p95 regressed past the threshold"""
+    regressions = []
+    for stage, summary in results.items():
+        if not isinstance(summary, dict) or stage not in baseline:
+            continue
+        before = baseline[stage]['p95_ms']
+        if before and summary['p95_ms'] > before * (1 + threshold):
+            regressions.append(f"{stage}: p95 {before}ms -> {summary['p95_ms']}ms "
+                               f"(+{(summary['p95_ms'] / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description='Benchmark parse, display and PDF generation latency')
+    arg_parser.add_argument('--resumes', type=int, default=30, help='Synthetic resumes to generate')
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline results file')
+    arg_parser.add_argument('--save-baseline', action='store_true', help='Store these results as the baseline')
+    arg_parser.add_argument('--threshold', type=float, default=0.2,
+                            help='Allowed p95 slowdown against the baseline (0.2 = 20%%)')
+    arg_parser.add_argument('--check', action='store_true',
+                            help='Fail instead of warning when there is no baseline to compare with')
+    args = arg_parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='resume_bench_')
+    try:
+        results = run(args.resumes, args.seed, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"{'stage':<20}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'per s':>10}")
+    for stage, summary in results.items():
+        if isinstance(summary, dict):
+            print(f"{stage:<20}{summary['p50_ms']:>10}{summary['p95_ms']:>10}"
+                  f"{summary['p99_ms']:>10}{summary['throughput_per_s']:>10}")
+    print(f"peak RSS: {results['peak_rss_mb']} MB")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"WARNING no baseline at {args.baseline}, nothing was compared; "
+              f"run with --save-baseline on the main branch first", file=sys.stderr)
+        return 2 if args.check else 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        regressions = compare(results, json.load(f), args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,12 +6,87 @@ load_dotenv()
 class Config:
     # Claude API Configuration
     CLAUDE_API_KEY = os.getenv('CLAUDE_API_KEY')
+    CLAUDE_MODEL = os.getenv('CLAUDE_MODEL', 'claude-3-opus-20240229')
+    CLAUDE_API_URL = os.getenv('CLAUDE_API_URL', 'https://api.anthropic.com')
+    CLAUDE_MAX_TOKENS = 4000
+    CLAUDE_TEMPERATURE = 0.1
+    CLAUDE_TIMEOUT = 60.0  # Seconds to wait for a response
+    CLAUDE_CONNECT_TIMEOUT = 5.0  # Seconds to wait for a new connection
+    CLAUDE_MAX_CONNECTIONS = 20  # Pooled keep-alive connections per client
+    CLAUDE_KEEPALIVE_EXPIRY = 30.0  # Seconds an idle connection is kept open
+    CLAUDE_SDK_MAX_RETRIES = 2  # Retries inside the Anthropic SDK, on top of process_batch's own
+    
+    # Admin Configuration
+    ADMIN_TOKEN = os.getenv('ADMIN_TOKEN')  # Bearer token for /admin routes; they are disabled when unset
     
     # Flask Configuration
     UPLOAD_FOLDER = 'uploads'
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
+    BATCH_MAX_CONTENT_LENGTH = 512 * 1024 * 1024  # Request limit of /upload-resumes/batch; each PDF still gets 16MB
+    UPLOAD_TTL = 24 * 3600  # Seconds stored uploads and generated PDFs are kept
+    UPLOAD_SPOOL_SIZE = 2 * 1024 * 1024  # Uploads up to 2MB are kept in memory while parsing
     ALLOWED_EXTENSIONS = {'pdf'}
     
+    # PDF Generation Configuration
+    DEFAULT_PDF_TEMPLATE = 'classic'  # See pdf_templates.TEMPLATES for the variants
+    PDF_FONT_DIR = os.getenv('PDF_FONT_DIR')  # Optional folder of .ttf fonts to register at startup
+    PDF_FONT = os.getenv('PDF_FONT')  # Body font from PDF_FONT_DIR by file name, e.g. 'Inter' for Inter.ttf
+    PDF_BOLD_FONT = os.getenv('PDF_BOLD_FONT')  # Font for the name, section titles and entry headings
+    PDF_CACHE_MAX_AGE = 3600  # Seconds browsers may reuse a PDF without revalidating; keep below UPLOAD_TTL
+    PDF_SPOOL_MAX_SIZE = 2 * 1024 * 1024  # Streamed PDFs above 2MB are buffered on disk instead of memory
+    
     # Resume Processing Configuration
     RESUME_CACHE_TIME = 3600  # Cache parsed resumes for 1 hour
-
+    PARSER_VERSION = 3  # Bump when parse output changes; cached results of other versions are never served
+    MAX_PDF_PAGES = 20  # Pages read per resume, None for no limit
+    PARSE_CACHE_FOLDER = 'cache'  # On-disk tier of the parse cache
+    PARSE_CACHE_SIZE = 256  # Parsed resumes kept in the in-memory LRU
+    
+    # PDF Parsing Engine Configuration
+    PARSE_WORKERS = int(os.getenv('PARSE_WORKERS', os.cpu_count() or 2))
+    PARSE_MAX_PENDING = 16  # Jobs in flight before uploads get a 503
+    PARSE_TIMEOUT = 30  # Seconds before a parse job is abandoned
+    PARSE_MAX_TASKS_PER_WORKER = 50  # Recycle workers to cap pdfplumber memory growth
+    PARSE_START_METHOD = 'spawn'  # 'fork' is unsafe once request threads are running
+    HYBRID_CONFIDENCE_THRESHOLD = 0.6  # Hybrid mode sends sections scoring below this to Claude
+    BATCH_MAX_IN_FLIGHT = 4  # Parse jobs one batch upload may hold, leaving room for single uploads
+    MATCH_TOP_K = 10  # Resumes /match returns by default
+    MATCH_MAX_TOP_K = 100  # Upper limit on top_k a client may ask /match for
+    VECTOR_INDEX_FOLDER = 'cache/vectors'  # Memory-mapped resume vectors for /match?method=vector
+    VECTOR_DIM = 512  # Hashed features per resume; 100k resumes take 200MB
+    SKILLS_DICTIONARY = 'data/skills.txt'  # Skill names and aliases /analyze-gap looks for
+    RESUME_DB_PATH = 'cache/resumes.db'  # Every parse result, so scoring never re-parses the PDF
+    RESUME_STORE_BATCH_SIZE = 100  # Batch uploads write parsed resumes in transactions of this many
+    RESUME_QUERY_MAX_LIMIT = 500  # Most resumes GET /admin/resumes returns per page
+    RESUME_RETENTION = UPLOAD_TTL  # Seconds a stored parse result is kept after its last save
+    
+    # Background Job Configuration
+    JOB_STORE = os.getenv('JOB_STORE', 'memory')  # 'sqlite' when running several gunicorn workers
+    JOB_DB_PATH = 'cache/jobs.db'
+    JOB_TTL = 3600  # Seconds job results stay available for polling
+    
+    # File Cleanup Configuration
+    EXPIRY_DB_PATH = 'cache/expiry.db'  # Index of stored files by expiry time
+    CLEANUP_LOCK_PATH = 'cache/cleanup.lock'  # flock held by the worker that runs the reaper
+    CLEANUP_INTERVAL = 300  # Seconds between reaper runs
+    CLEANUP_BATCH_SIZE = 500  # Files deleted per batch
+    
+    # LLM Response Cache Configuration
+    LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'true').lower() == 'true'
+    LLM_CACHE_DB_PATH = 'cache/llm.db'
+    LLM_CACHE_TTL = 7 * 24 * 3600  # Seconds a Claude response is reused
+    LLM_CACHE_SIZE = 10000  # Responses kept before the least recently used are evicted
+    
+    # LLM Batch Configuration
+    LLM_BATCH_CONCURRENCY = 4  # Claude calls one process_batch runs at once
+    LLM_RUN_TIMEOUT = 300.0  # Seconds a request thread waits on LLM work (a batch with its retries) before cancelling it
+    LLM_REQUESTS_PER_MINUTE = 50  # Token bucket rate shared by all batches in a process
+    LLM_MAX_RETRIES = 3  # Retries for rate limited, overloaded or failed connections
+    LLM_RETRY_BASE_DELAY = 1.0  # Seconds, doubled per attempt with full jitter
+    LLM_RETRY_MAX_DELAY = 30.0
+    
+    # LLM Token Budget Configuration
+    LLM_INPUT_TOKEN_BUDGET = 6000  # Estimated resume tokens sent per call
+    LLM_BUDGET_STRATEGY = 'trim'  # 'trim' drops the tail of the longest sections, 'chunk' splits by section
+    LLM_OUTPUT_RATIO = 2.0  # Starting max_tokens per input token; a cut-off response is retried with double
+    LLM_OUTPUT_OVERHEAD = 400  # Extra output tokens for the JSON skeleton; capped at CLAUDE_MAX_TOKENS
@@ -0,0 +1,237 @@
+"""Index-driven expiry of stored uploads.
+
+Every file is recorded in a SQLite index with its expiry time when it is
+saved, so finding expired files is an indexed range query instead of a
+walk over the upload folder. One reaper per host deletes them in bounded
+batches; the others stand by in case the leader exits.
+
+Files saved before the index existed can be added once with:
+
+    python expiry.py uploads
+"""
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+from sqlite_db import LocalConnections
+
+try:
+    import fcntl
+except ImportError:  # Windows has no flock, every process reaps on its own
+    fcntl = None
+
+# An expiring file is renamed with this suffix before its entry is dropped, so
+# a concurrent re-save can be told apart from the file being deleted
+REAPING_SUFFIX = '.reaping'
+
+
+class ExpiryIndex:
+    """SQLite table of stored files ordered by expiry time"""
+
+    def __init__(self, db_path: str, ttl: int = 24 * 3600):
+        self.db_path = db_path
+        self.ttl = ttl
+        self._db = LocalConnections(db_path)
+
+        conn = self._db.get()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY,
+                    stored REAL NOT NULL,
+                    expires REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_files_expires ON files (expires)")
+
+    def add(self, path: str, stored: Optional[float] = None) -> None:
+        """Record a saved file, pushing back the expiry of one already indexed"""
+        stored = time.time() if stored is None else stored
+        conn = self._db.get()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO files (path, stored, expires) VALUES (?, ?, ?)",
+                         (path, stored, stored + self.ttl))
+
+    def due(self, now: float, limit: int) -> List[Tuple[str, float]]:
+        """Return up to limit (path, expires) entries that expired by now, oldest first"""
+        return self._db.get().execute(
+            "SELECT path, expires FROM files WHERE expires <= ? ORDER BY expires LIMIT ?", (now, limit)
+        ).fetchall()
+
+    def stored_before(self, cutoff: float, limit: int) -> List[Tuple[str, float]]:
+        """Return up to limit (path, expires) entries stored before cutoff, for manual cleanup"""
+        return self._db.get().execute(
+            "SELECT path, expires FROM files WHERE stored < ? ORDER BY stored LIMIT ?", (cutoff, limit)
+        ).fetchall()
+
+    def forget(self, path: str, expires: float) -> bool:
+        """Drop a path from the index unless it was re-saved (and its expiry moved) since it was listed"""
+        conn = self._db.get()
+        with conn:
+            cursor = conn.execute("DELETE FROM files WHERE path = ? AND expires = ?", (path, expires))
+        return cursor.rowcount == 1
+
+    def count(self) -> int:
+        return self._db.get().execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def count_due(self, now: float) -> int:
+        return self._db.get().execute("SELECT COUNT(*) FROM files WHERE expires <= ?", (now,)).fetchone()[0]
+
+    def backfill(self, folder: str) -> int:
+        """Index every file under folder by its modification time"""
+        count = 0
+        for dirpath, _, filenames in os.walk(folder):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                self.add(path, stored=os.path.getmtime(path))
+                count += 1
+        return count
+
+
+class Reaper:
+    """Deletes expired files from an ExpiryIndex in bounded batches.
+
+    Every gunicorn worker starts a reaper, but only the one holding an
+    exclusive flock on lock_path deletes anything. The lock is released
+    when that process exits, and another worker takes over on its next tick.
+    The leader also runs every callable in tasks after each sweep, for other
+    stores with a retention period.
+    """
+
+    def __init__(self, index: ExpiryIndex, lock_path: str, interval: int = 300, batch_size: int = 500,
+                 tasks: Optional[List[Callable[[], Any]]] = None):
+        self.index = index
+        self.lock_path = lock_path
+        self.interval = interval
+        self.batch_size = batch_size
+        self.tasks = list(tasks or [])
+        self._lock_file = None
+        self._run_lock = threading.Lock()
+        self._thread = None
+        self.runs = 0
+        self.files_removed = 0
+        self.errors = 0
+        self.last_run = None
+        self.last_duration = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._lock_file is not None
+
+    def start(self) -> None:
+        """Start the background reaper thread"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, daemon=True)
+            self._thread.start()
+
+    def run_once(self, max_age: Optional[float] = None) -> int:
+        """Delete one batch of expired files and return how many were removed.
+
+        With max_age (seconds), files stored longer ago than that are
+        removed instead of those past their expiry time.
+        """
+        with self._run_lock:
+            started = time.time()
+            if max_age is None:
+                entries = self.index.due(started, self.batch_size)
+            else:
+                entries = self.index.stored_before(started - max_age, self.batch_size)
+
+            removed = 0
+            for path, expires in entries:
+                try:
+                    if self._reap(path, expires):
+                        removed += 1
+                except Exception as e:
+                    # The entry is kept, so the file is tried again on the next run
+                    self.errors += 1
+                    print(f"Error removing file {path}: {str(e)}")
+
+            self.runs += 1
+            self.files_removed += removed
+            self.last_run = started
+            self.last_duration = time.time() - started
+            return removed
+
+    def _reap(self, path: str, expires: float) -> bool:
+        """Delete one listed file, unless it was saved again in the meantime"""
+        reaping = path + REAPING_SUFFIX
+        try:
+            # Moved aside first: a re-save from here on writes a fresh copy at path
+            os.rename(path, reaping)
+        except FileNotFoundError:
+            pass  # Already gone, or moved aside by a run that stopped halfway
+        if not self.index.forget(path, expires):
+            # Saved again since it was listed; the content is the same, so put it back
+            if os.path.exists(reaping):
+                os.replace(reaping, path)
+            return False
+        try:
+            os.remove(reaping)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def run_until_done(self, max_age: Optional[float] = None) -> int:
+        """Run batches until no expired files are left"""
+        total = 0
+        while True:
+            removed = self.run_once(max_age)
+            total += removed
+            if removed < self.batch_size:
+                return total
+
+    def stats(self) -> Dict[str, Any]:
+        """Return reaper and index counters for monitoring"""
+        return {
+            'leader': self.is_leader,
+            'pid': os.getpid(),
+            'runs': self.runs,
+            'files_removed': self.files_removed,
+            'errors': self.errors,
+            'last_run': self.last_run,
+            'last_duration_ms': round(self.last_duration * 1000, 2) if self.last_duration is not None else None,
+            'indexed_files': self.index.count(),
+            'expired_files': self.index.count_due(time.time()),
+            'batch_size': self.batch_size,
+            'interval': self.interval
+        }
+
+    def _try_lead(self) -> bool:
+        if self._lock_file is not None:
+            return True
+        if fcntl is None:
+            self._lock_file = True
+            return True
+
+        lock_file = open(self.lock_path, 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def _loop(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            try:
+                if self._try_lead():
+                    self.run_until_done()
+                    for task in self.tasks:
+                        task()
+            except Exception as e:
+                self.errors += 1
+                print(f"Error during cleanup: {str(e)}")
+
+
+if __name__ == '__main__':
+    from config import Config
+
+    root = os.path.dirname(os.path.abspath(__file__))
+    index = ExpiryIndex(os.path.join(root, Config.EXPIRY_DB_PATH), ttl=Config.UPLOAD_TTL)
+    for folder in sys.argv[1:] or [os.path.join(root, Config.UPLOAD_FOLDER)]:
+        print(f"Indexed {index.backfill(os.path.abspath(folder))} files in {folder}")
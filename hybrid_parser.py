@@ -0,0 +1,174 @@
+"""Hybrid parsing: the heuristic ResumeParser first, Claude only where it is unsure.
+
+HybridResumeParser runs the regular parser and scores each section it
+produced. Sections that score below the confidence threshold keep the raw
+text they were parsed from, and refine_with_llm sends only that text to
+ResumeProcessor and swaps in the structured result. Resumes the parser
+handles well never reach the LLM.
+"""
+from io import BytesIO
+from typing import Dict, List, Any, Optional, Tuple
+
+from config import Config
+from pdf_parser import ResumeParser, ClassifiedLine, SKILL_SEPARATOR_RE
+from resume_model import Entry, Section
+
+# Placeholder company _parse_experience uses for bullets that precede any entry
+DEFAULT_EXPERIENCE_COMPANY = "Professional Experience"
+
+
+def _section_kind(title: str) -> str:
+    title = title.upper()
+    for kind in ('EDUCATION', 'EXPERIENCE', 'SKILLS'):
+        if kind in title:
+            return kind
+    return 'GENERIC'
+
+
+def _covered(line: ClassifiedLine, parsed_text: str) -> bool:
+    # Match on the text before the first separator: skills lines are split there,
+    # and entry titles lose their ", City, ST" location
+    key = SKILL_SEPARATOR_RE.split(line.content, 1)[0].strip()[:40]
+    return not key or key in parsed_text
+
+
+def score_section(section: Dict[str, Any], lines: List[ClassifiedLine]) -> Tuple[float, List[str]]:
+    """Return a 0-1 confidence for a parsed section and the reasons it was lowered"""
+    entries = section["entries"]
+    kind = _section_kind(section["title"])
+    score = 1.0
+    reasons = []
+
+    if not any(entry["company"] or entry["position"] or entry["points"] for entry in entries):
+        return 0.0, ["no entries found"]
+
+    if kind in ('EXPERIENCE', 'EDUCATION'):
+        undated = sum(1 for entry in entries if not entry["duration"])
+        if undated:
+            score -= 0.4 * undated / len(entries)
+            reasons.append(f"{undated} of {len(entries)} entries have no dates")
+        if any(entry["company"] == DEFAULT_EXPERIENCE_COMPANY for entry in entries):
+            score -= 0.2
+            reasons.append("bullet points before any entry")
+    if kind == 'EXPERIENCE':
+        pointless = sum(1 for entry in entries if not entry["points"])
+        if pointless:
+            score -= 0.2 * pointless / len(entries)
+            reasons.append(f"{pointless} of {len(entries)} entries have no bullet points")
+    elif kind == 'GENERIC':
+        score -= 0.2
+        reasons.append("no dedicated parser for this section")
+
+    parsed_text = '\n'.join(
+        str(value) for entry in entries
+        for value in (entry["company"], entry["position"], entry["location"], entry["duration"], *entry["points"])
+        if value
+    )
+    dropped = sum(1 for line in lines if not _covered(line, parsed_text))
+    if dropped:
+        score -= 0.5 * dropped / len(lines)
+        reasons.append(f"{dropped} of {len(lines)} lines were not captured")
+
+    return max(0.0, round(score, 3)), reasons
+
+
+class HybridResumeParser(ResumeParser):
+    """ResumeParser that scores every section and keeps the text of uncertain ones.
+
+    parse returns {'resume': ..., 'low_confidence': [...]}, where each
+    low-confidence group lists the indices of the sections it covers, the
+    text to send to the LLM and the reasons it scored low. Resumes without
+    recognizable headers form a single group covering every section.
+    """
+
+    def __init__(self, threshold: float = Config.HYBRID_CONFIDENCE_THRESHOLD, **kwargs):
+        super().__init__(**kwargs)
+        self.threshold = threshold
+        self._section_lines: List[Tuple[str, List[ClassifiedLine]]] = []
+        self._implicit_lines: Optional[List[ClassifiedLine]] = None
+
+    def parse(self, pdf_path, raise_errors: bool = False) -> Dict[str, Any]:
+        self._section_lines = []
+        self._implicit_lines = None
+        resume = super().parse(pdf_path, raise_errors=raise_errors)
+        sections = resume["sections"]
+
+        if self._implicit_lines is not None:
+            for section in sections:
+                section["confidence"] = 0.0
+            low_confidence = [{
+                'sections': list(range(len(sections))),
+                'text': '\n'.join(line.text for line in self._implicit_lines),
+                'reasons': ["no section headers found"]
+            }] if sections else []
+            return {'resume': resume, 'low_confidence': low_confidence}
+
+        low_confidence = []
+        # _parse_section_content runs once per section, in output order
+        for index, (section, (title, lines)) in enumerate(zip(sections, self._section_lines)):
+            section["confidence"], reasons = score_section(section, lines)
+            if section["confidence"] < self.threshold:
+                low_confidence.append({
+                    'sections': [index],
+                    'text': '\n'.join([title] + [line.text for line in lines]),
+                    'reasons': reasons
+                })
+        return {'resume': resume, 'low_confidence': low_confidence}
+
+    def _parse_section_content(self, section_title: str, content: List[ClassifiedLine]) -> List[Entry]:
+        self._section_lines.append((section_title, content))
+        return super()._parse_section_content(section_title, content)
+
+    def _detect_implicit_sections(self, lines: List[ClassifiedLine]) -> List[Section]:
+        self._implicit_lines = lines
+        return super()._detect_implicit_sections(lines)
+
+
+def score_pdf(filepath, raise_errors: bool = False) -> Dict[str, Any]:
+    """Parse a PDF path or bytes with HybridResumeParser"""
+    if isinstance(filepath, (bytes, bytearray)):
+        filepath = BytesIO(filepath)
+    return HybridResumeParser().parse(filepath, raise_errors=raise_errors)
+
+
+async def refine_with_llm(scored: Dict[str, Any], processor) -> Tuple[Dict[str, Any], bool]:
+    """Replace low-confidence sections with Claude's structuring of their text.
+
+    Groups are sent through ResumeProcessor.process_batch, so they share its
+    cache, concurrency limit and retries. A group whose call fails, or that
+    comes back without sections, keeps the parser's result. Returns the
+    resume and whether every call succeeded, so a result that fell back on
+    the parser because Claude was unavailable isn't cached as refined.
+    """
+    resume = scored['resume']
+    groups = scored['low_confidence']
+    if not groups:
+        return resume, True
+
+    results = await processor.process_batch([group['text'] for group in groups])
+
+    replacements: Dict[int, List[Dict[str, Any]]] = {}
+    replaced = set()
+    complete = all(result['status'] == 'success' for result in results)
+    for group, result in zip(groups, results):
+        llm_sections = (result.get('data') or {}).get('sections') if result['status'] == 'success' else None
+        if not llm_sections:
+            continue
+        original = [resume["sections"][index] for index in group['sections']]
+        if len(original) == 1 and len(llm_sections) == 1:
+            # Keep the header as it appeared in the resume
+            llm_sections[0]["title"] = original[0]["title"]
+        for section in llm_sections:
+            section["source"] = "llm"
+        replacements[group['sections'][0]] = llm_sections
+        replaced.update(group['sections'])
+
+    sections = []
+    for index, section in enumerate(resume["sections"]):
+        if index in replacements:
+            sections.extend(replacements[index])
+        elif index not in replaced:
+            section.setdefault("source", "parser")
+            sections.append(section)
+    resume["sections"] = sections
+    return resume, complete
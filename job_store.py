@@ -0,0 +1,147 @@
+import json
+import threading
+import time
+import uuid
+from typing import Dict, Any, Optional
+
+from sqlite_db import LocalConnections
+
+PENDING = 'pending'
+COMPLETED = 'completed'
+FAILED = 'failed'
+
+
+class JobStore:
+    """Base class for storing the status and results of background parse jobs"""
+
+    def __init__(self, ttl: int = 3600):
+        self.ttl = ttl
+
+    def create(self, meta: Optional[Dict[str, Any]] = None) -> str:
+        """Register a new pending job and return its id"""
+        raise NotImplementedError
+
+    def update(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None) -> None:
+        """Record a job's new status along with its result or error"""
+        raise NotImplementedError
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the job record, or None if it doesn't exist or has expired"""
+        raise NotImplementedError
+
+    def _new_job_id(self) -> str:
+        return uuid.uuid4().hex
+
+
+class MemoryJobStore(JobStore):
+    """Keeps jobs in a dict; only suitable for a single worker process"""
+
+    def __init__(self, ttl: int = 3600):
+        super().__init__(ttl)
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def create(self, meta: Optional[Dict[str, Any]] = None) -> str:
+        job_id = self._new_job_id()
+        now = time.time()
+        with self._lock:
+            self._prune(now)
+            self._jobs[job_id] = {
+                'job_id': job_id,
+                'status': PENDING,
+                'result': None,
+                'error': None,
+                'meta': meta or {},
+                'created': now,
+                'updated': now
+            }
+        return job_id
+
+    def update(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(status=status, result=result, error=error, updated=time.time())
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or time.time() - job['created'] > self.ttl:
+                return None
+            return dict(job)
+
+    def _prune(self, now):
+        # Caller must hold the lock
+        expired = [job_id for job_id, job in self._jobs.items() if now - job['created'] > self.ttl]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+class SQLiteJobStore(JobStore):
+    """Keeps jobs in a SQLite database shared by all gunicorn workers"""
+
+    def __init__(self, db_path: str, ttl: int = 3600):
+        super().__init__(ttl)
+        self.db_path = db_path
+        self._db = LocalConnections(db_path)
+
+        conn = self._db.get()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    meta TEXT,
+                    created REAL NOT NULL,
+                    updated REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs (created)")
+
+    def create(self, meta: Optional[Dict[str, Any]] = None) -> str:
+        job_id = self._new_job_id()
+        now = time.time()
+        conn = self._db.get()
+        with conn:
+            conn.execute("DELETE FROM jobs WHERE created < ?", (now - self.ttl,))
+            conn.execute(
+                "INSERT INTO jobs (job_id, status, meta, created, updated) VALUES (?, ?, ?, ?, ?)",
+                (job_id, PENDING, json.dumps(meta or {}), now, now)
+            )
+        return job_id
+
+    def update(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None) -> None:
+        conn = self._db.get()
+        with conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated = ? WHERE job_id = ?",
+                (status, json.dumps(result) if result is not None else None, error, time.time(), job_id)
+            )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._db.get().execute(
+            "SELECT job_id, status, result, error, meta, created, updated FROM jobs WHERE job_id = ?",
+            (job_id,)
+        ).fetchone()
+        if row is None or time.time() - row[5] > self.ttl:
+            return None
+        return {
+            'job_id': row[0],
+            'status': row[1],
+            'result': json.loads(row[2]) if row[2] is not None else None,
+            'error': row[3],
+            'meta': json.loads(row[4]) if row[4] else {},
+            'created': row[5],
+            'updated': row[6]
+        }
+
+
+def create_job_store(backend: str, db_path: str, ttl: int = 3600) -> JobStore:
+    """Build the job store selected by Config.JOB_STORE"""
+    if backend == 'memory':
+        return MemoryJobStore(ttl=ttl)
+    if backend == 'sqlite':
+        return SQLiteJobStore(db_path, ttl=ttl)
+    raise ValueError(f"Unknown job store backend: {backend}")
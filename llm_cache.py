@@ -0,0 +1,153 @@
+import asyncio
+import concurrent.futures
+import copy
+import hashlib
+import json
+import re
+import threading
+import time
+import unicodedata
+from typing import Dict, Any, Awaitable, Callable, Optional
+
+from sqlite_db import LocalConnections
+
+_SPACES_RE = re.compile(r'[ \t\f\v\u00a0]+')
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form of resume text, so whitespace-only differences share a cache entry"""
+    text = unicodedata.normalize('NFC', text)
+    lines = (_SPACES_RE.sub(' ', line).strip() for line in text.splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+def llm_cache_key(text: str, model: str, prompt_version: str) -> str:
+    """Key a response by the normalized input, the model and the prompt it was produced with"""
+    payload = json.dumps([model, prompt_version, normalize_text(text)], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMCache:
+    """Persistent cache of LLM responses with in-flight request coalescing.
+
+    Responses are kept in SQLite so they survive restarts and are shared by
+    all workers, and the least recently used entries are evicted past
+    max_entries. Concurrent requests for a key that is still being computed
+    wait for that call instead of starting another, from any thread or event
+    loop of the process. get_or_compute runs its SQLite calls in the loop's
+    default executor so they never block other coroutines.
+    """
+
+    def __init__(self, db_path: str, ttl: int = 7 * 24 * 3600, max_entries: int = 10000):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._db = LocalConnections(db_path)
+        self._in_flight: Dict[str, concurrent.futures.Future] = {}
+        self._in_flight_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+        conn = self._db.get()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    accessed REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed)")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached response for key, or None if missing/expired"""
+        now = time.time()
+        conn = self._db.get()
+        row = conn.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is not None and now - row[1] > self.ttl:
+            with conn:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            row = None
+
+        if row is None:
+            self._count('misses')
+            return None
+
+        with conn:
+            conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        self._count('hits')
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a response, evicting the least recently used entries past max_entries"""
+        now = time.time()
+        conn = self._db.get()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO responses (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                         (key, json.dumps(value), now, now))
+            cursor = conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+        if cursor.rowcount > 0:
+            self._count('evictions', cursor.rowcount)
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached response for key, calling compute at most once per key at a time"""
+        value = await asyncio.to_thread(self.get, key)
+        if value is not None:
+            return value
+
+        # A concurrent.futures.Future can be awaited from any loop, unlike an asyncio one
+        with self._in_flight_lock:
+            pending = self._in_flight.get(key)
+            if pending is None:
+                future = self._in_flight[key] = concurrent.futures.Future()
+        if pending is not None:
+            self._count('coalesced')
+            shared = asyncio.wrap_future(pending)
+            # Retrieved here so a failure isn't logged as unhandled when this waiter was cancelled
+            shared.add_done_callback(lambda done: done.cancelled() or done.exception())
+            # shield: a cancelled waiter must not cancel the shared call
+            return copy.deepcopy(await asyncio.shield(shared))
+
+        try:
+            value = await compute()
+            await asyncio.to_thread(self.set, key, value)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._in_flight_lock:
+                if self._in_flight.get(key) is future:
+                    del self._in_flight[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for monitoring"""
+        entries = self._db.get().execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        with self._stats_lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'entries': entries,
+                'max_entries': self.max_entries,
+                'ttl': self.ttl
+            }
+
+    def _count(self, counter: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + amount)
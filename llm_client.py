@@ -0,0 +1,125 @@
+"""Process-wide Claude clients and the event loop they run on.
+
+Every ChatAnthropic holds its own HTTP connection pool, so building one per
+ResumeProcessor (or per request) pays a new TCP/TLS handshake for every
+call. get_chat_model hands out one shared, lazily built client per set of
+settings, configured from Config with keep-alive connection limits and
+timeouts. The async HTTP pool can only be used from the event loop that
+opened its connections, so all async LLM work from request threads runs on
+one background loop through run_async and iter_async.
+"""
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, AsyncIterator, Coroutine, Dict, Iterator, Optional, Tuple
+
+import anthropic
+import httpx
+from langchain_anthropic import ChatAnthropic
+from langchain_core.pydantic_v1 import root_validator
+
+from config import Config
+
+_lock = threading.Lock()
+_models: Dict[Tuple, ChatAnthropic] = {}
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _http_settings() -> Dict[str, Any]:
+    return {
+        'timeout': httpx.Timeout(Config.CLAUDE_TIMEOUT, connect=Config.CLAUDE_CONNECT_TIMEOUT),
+        'limits': httpx.Limits(max_connections=Config.CLAUDE_MAX_CONNECTIONS,
+                               max_keepalive_connections=Config.CLAUDE_MAX_CONNECTIONS,
+                               keepalive_expiry=Config.CLAUDE_KEEPALIVE_EXPIRY)
+    }
+
+
+class PooledChatAnthropic(ChatAnthropic):
+    """ChatAnthropic whose SDK clients use the configured endpoint, timeouts and pool.
+
+    ChatAnthropic builds its clients in a root validator with default
+    settings and no base URL, and takes no client or http_client argument.
+    This validator runs after it and builds them from Config instead.
+    """
+
+    @root_validator()
+    def build_pooled_clients(cls, values: Dict) -> Dict:
+        client_settings = {
+            'api_key': values['anthropic_api_key'].get_secret_value(),
+            'base_url': Config.CLAUDE_API_URL,
+            'max_retries': Config.CLAUDE_SDK_MAX_RETRIES
+        }
+        values['_client'] = anthropic.Client(http_client=httpx.Client(**_http_settings()), **client_settings)
+        values['_async_client'] = anthropic.AsyncClient(http_client=httpx.AsyncClient(**_http_settings()),
+                                                        **client_settings)
+        return values
+
+
+def _build_chat_model(model: str, max_tokens: int, temperature: float) -> ChatAnthropic:
+    return PooledChatAnthropic(
+        model=model,
+        anthropic_api_key=Config.CLAUDE_API_KEY,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        default_request_timeout=Config.CLAUDE_TIMEOUT
+    )
+
+
+def get_chat_model(model: Optional[str] = None, max_tokens: Optional[int] = None,
+                   temperature: Optional[float] = None) -> ChatAnthropic:
+    """Return the shared ChatAnthropic for these settings, building it on first use"""
+    key = (model or Config.CLAUDE_MODEL,
+           max_tokens or Config.CLAUDE_MAX_TOKENS,
+           Config.CLAUDE_TEMPERATURE if temperature is None else temperature)
+    with _lock:
+        llm = _models.get(key)
+        if llm is None:
+            llm = _models[key] = _build_chat_model(*key)
+        return llm
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Return the background event loop shared by all LLM calls, starting it on first use"""
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name='llm-event-loop', daemon=True).start()
+        return _loop
+
+
+def run_async(coro: Coroutine, timeout: Optional[float] = None) -> Any:
+    """Run a coroutine on the shared loop and wait for its result from a sync thread.
+
+    Waits at most timeout seconds (Config.LLM_RUN_TIMEOUT by default), then
+    cancels the coroutine and raises TimeoutError.
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, get_event_loop())
+    try:
+        return future.result(Config.LLM_RUN_TIMEOUT if timeout is None else timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise
+
+
+def iter_async(async_iterator: AsyncIterator) -> Iterator:
+    """Drive an async iterator on the shared loop from a synchronous generator"""
+    try:
+        while True:
+            try:
+                yield run_async(async_iterator.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        run_async(async_iterator.aclose())
+
+
+def close_clients() -> None:
+    """Close every pooled connection, e.g. before a worker exits"""
+    with _lock:
+        models = list(_models.values())
+        _models.clear()
+    for llm in models:
+        llm._client.close()
+        if _loop is not None:
+            run_async(llm._async_client.close())
@@ -0,0 +1,105 @@
+"""Offline stand-in for ChatAnthropic.
+
+StubChatModel answers every prompt with a canned resume JSON after an
+optional delay and counts its calls, so ResumeProcessor, its cache and the
+batch code can be exercised without an API key or network access:
+
+    processor = ResumeProcessor(llm=StubChatModel(latency=0.5))
+"""
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+import anthropic
+import httpx
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+
+def stub_response(text: str) -> Dict[str, Any]:
+    """A resume structure in the LLM's format, named after the first line of text"""
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    return {
+        "personal_info": {
+            "name": lines[0] if lines else "",
+            "contact": {"email": "", "phone": "", "location": "", "linkedin": ""},
+            "summary": ""
+        },
+        "sections": [
+            {
+                "title": "Experience",
+                "entries": [
+                    {
+                        "company": "",
+                        "position": "",
+                        "location": "",
+                        "duration": {"start": "", "end": ""},
+                        "points": lines[1:4]
+                    }
+                ]
+            }
+        ]
+    }
+
+
+class StubChatModel(BaseChatModel):
+    """Chat model that returns stub_response for the last message without calling an API"""
+
+    model: str = "stub"
+    latency: float = 0.0  # Seconds each call takes
+    response: Optional[str] = None  # Fixed reply instead of stub_response
+    failures: int = 0  # Number of first calls that fail with a connection error, to exercise retries
+    chunk_size: int = 16  # Characters per chunk when streaming
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    def _content(self, messages: List[BaseMessage]) -> str:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise anthropic.APIConnectionError(request=httpx.Request('POST', 'https://api.anthropic.com/v1/messages'))
+        if self.response is not None:
+            return self.response
+        return json.dumps(stub_response(str(messages[-1].content)))
+
+    def _reply(self, messages: List[BaseMessage]) -> ChatResult:
+        content = self._content(messages)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))])
+
+    def _chunks(self, messages: List[BaseMessage]) -> List[ChatGenerationChunk]:
+        content = self._content(messages)
+        return [ChatGenerationChunk(message=AIMessageChunk(content=content[i:i + self.chunk_size]))
+                for i in range(0, len(content), self.chunk_size)]
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs: Any) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._reply(messages)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager=None, **kwargs: Any) -> ChatResult:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._reply(messages)
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        chunks = self._chunks(messages)
+        for chunk in chunks:
+            # latency is spread over the chunks, like tokens arriving from the API
+            if self.latency:
+                time.sleep(self.latency / len(chunks))
+            yield chunk
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager=None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        chunks = self._chunks(messages)
+        for chunk in chunks:
+            if self.latency:
+                await asyncio.sleep(self.latency / len(chunks))
+            yield chunk
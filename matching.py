@@ -0,0 +1,242 @@
+"""Matching parsed resumes against job descriptions.
+
+ResumeIndex is an inverted index over the text of parsed resumes (skills,
+bullet points, entry titles) scored with BM25. Postings are kept as packed
+int32/float32 arrays per term, so a query only touches the resumes that
+share a term with the job description and scores each term's postings in
+one numpy operation; 100k resumes answer in a few milliseconds.
+match_score rates a single resume against a job description on a 0-100
+scale.
+"""
+import re
+import threading
+from array import array
+from collections import Counter
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+# Keeps skill spellings such as c++, c#, node.js and ci/cd in one token
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#./-]*[a-z0-9+#]|[a-z0-9]')
+STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be been before being below between both but by
+can could did do does doing down during each etc few for from further had has have having he her here hers
+him his how i if in into is it its itself just me more most my no nor not of off on once only or other our
+ours out over own same she should so some such than that the their theirs them then there these they this
+those through to too under until up very was we were what when where which while who whom why will with
+would you your yours
+able ability candidate candidates experience experienced including job looking must plus preferred position
+required requirements responsibilities role strong team work working years year
+""".split())
+
+# Term frequency multipliers: a skill listed in the skills section says more
+# than a word in a bullet point
+FIELD_WEIGHTS = {
+    'skills': 3.0,
+    'title': 2.0,
+    'text': 1.0
+}
+
+# Weighted term frequency at which a resume gets full credit for a job term
+FULL_CREDIT_TF = 3.0
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens of text, without stopwords"""
+    return [token for token in TOKEN_RE.findall(text.lower())
+            if token not in STOPWORDS and not token.isdigit()]
+
+
+def resume_terms(resume: Dict[str, Any]) -> Counter:
+    """Field-weighted term frequencies of a parsed resume (see resume_model.validate_resume)"""
+    terms = Counter()
+
+    def add(text, field):
+        if not isinstance(text, str):
+            return
+        weight = FIELD_WEIGHTS[field]
+        for token in tokenize(text):
+            terms[token] += weight
+
+    for section in resume.get("sections") or []:
+        is_skills = 'SKILL' in str(section.get("title") or "").upper()
+        for entry in section.get("entries") or []:
+            add(entry.get("position"), 'title')
+            if not is_skills:
+                add(entry.get("company"), 'text')
+            for point in entry.get("points") or []:
+                add(point, 'skills' if is_skills else 'text')
+    add((resume.get("personal_info") or {}).get("summary"), 'text')
+    return terms
+
+
+class ResumeIndex:
+    """Inverted index of parsed resumes with BM25 top-k retrieval.
+
+    Resumes are added under a caller-chosen id (the content hash of the PDF
+    in the app); adding an id again replaces the earlier version. Safe to
+    use from multiple threads.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._ids: List[str] = []
+        self._docs: Dict[str, int] = {}
+        self._lengths = array('f')
+        self._deleted = array('b')
+        self._total_length = 0.0
+        self._live = 0
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        # numpy copies of postings, rebuilt for a term after it gains documents
+        self._frozen: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._frozen_lengths: Optional[np.ndarray] = None
+        self._frozen_deleted: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return self._live
+
+    def __contains__(self, resume_id: str) -> bool:
+        return resume_id in self._docs
+
+    def add(self, resume_id: str, resume: Dict[str, Any]) -> None:
+        """Index a parsed resume, replacing any earlier resume with this id"""
+        terms = resume_terms(resume)
+        with self._lock:
+            self._remove(resume_id)
+            doc = len(self._ids)
+            self._ids.append(resume_id)
+            self._docs[resume_id] = doc
+            length = sum(terms.values())
+            self._lengths.append(length)
+            self._deleted.append(0)
+            self._total_length += length
+            self._live += 1
+            for term, tf in terms.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = (array('i'), array('f'))
+                postings[0].append(doc)
+                postings[1].append(tf)
+                self._frozen.pop(term, None)
+            self._frozen_lengths = None
+            self._frozen_deleted = None
+
+    def remove(self, resume_id: str) -> bool:
+        """Drop a resume from results; returns whether it was indexed"""
+        with self._lock:
+            return self._remove(resume_id)
+
+    def _remove(self, resume_id: str) -> bool:
+        # Postings of a removed resume stay in place and are masked at query time
+        doc = self._docs.pop(resume_id, None)
+        if doc is None:
+            return False
+        self._deleted[doc] = 1
+        self._total_length -= self._lengths[doc]
+        self._live -= 1
+        self._frozen_deleted = None
+        return True
+
+    def _term_arrays(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        frozen = self._frozen.get(term)
+        if frozen is None:
+            postings = self._postings.get(term)
+            if postings is None:
+                return None
+            frozen = self._frozen[term] = (np.array(postings[0], dtype=np.int32),
+                                           np.array(postings[1], dtype=np.float32))
+        return frozen
+
+    def document_frequency(self, term: str) -> int:
+        """Number of indexed resumes using term, counting removed ones"""
+        postings = self._postings.get(term)
+        return 0 if postings is None else len(postings[0])
+
+    def idf(self, term: str) -> float:
+        """BM25 inverse document frequency of term; highest for terms no resume uses"""
+        if not self._live:
+            return 0.0
+        df = min(self.document_frequency(term), self._live)
+        return float(np.log(1.0 + (self._live - df + 0.5) / (df + 0.5)))
+
+    def search(self, job_description: str, top_k: int = 10) -> List[Dict[str, Any]]:
+        """Return up to top_k resume ids ranked by BM25 score against a job description"""
+        query = Counter(tokenize(job_description))
+        with self._lock:
+            if not query or not self._live or top_k < 1:
+                return []
+            if self._frozen_lengths is None:
+                self._frozen_lengths = np.array(self._lengths, dtype=np.float32)
+            if self._frozen_deleted is None:
+                self._frozen_deleted = np.array(self._deleted, dtype=bool)
+            lengths = self._frozen_lengths
+            deleted = self._frozen_deleted
+            avg_length = self._total_length / self._live
+            scores = np.zeros(len(self._ids), dtype=np.float32)
+            norm = self.k1 * (1.0 - self.b + self.b * lengths / avg_length)
+
+            for term, query_tf in query.items():
+                arrays = self._term_arrays(term)
+                if arrays is None:
+                    continue
+                docs, tfs = arrays
+                weight = self.idf(term) * query_tf
+                # Each document appears once per term, so fancy-index assignment is safe
+                scores[docs] += weight * tfs * (self.k1 + 1.0) / (tfs + norm[docs])
+
+            scores[deleted] = 0.0
+            top_k = min(top_k, len(scores))
+            top = np.argpartition(-scores, top_k - 1)[:top_k]
+            top = top[np.argsort(-scores[top], kind='stable')]
+            return [{'resume_id': self._ids[doc], 'score': round(float(scores[doc]), 4)}
+                    for doc in top if scores[doc] > 0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return index size counters for monitoring"""
+        with self._lock:
+            return {
+                'resumes': self._live,
+                'removed': len(self._ids) - self._live,
+                'terms': len(self._postings),
+                'postings': sum(len(docs) for docs, _ in self._postings.values())
+            }
+
+
+def match_score(resume: Dict[str, Any], job_description: str,
+                index: Optional[ResumeIndex] = None) -> Dict[str, Any]:
+    """Score how well one parsed resume covers a job description, from 0 to 100.
+
+    Each distinct job description term counts by its idf in index when one
+    is given (so rare, specific terms outweigh common ones), otherwise
+    equally. With an index, terms no indexed resume uses are left out: they
+    are mostly posting boilerplate and cannot tell candidates apart. A
+    single mention earns two thirds of a term's weight; a skills section
+    listing or repeated mentions earn all of it.
+    """
+    query = Counter(tokenize(job_description))
+    if not query:
+        return {'score': 0.0, 'matched': [], 'missing': []}
+    terms = resume_terms(resume)
+    use_idf = index is not None and len(index) > 0
+
+    total = 0.0
+    earned = 0.0
+    matched = []
+    missing = []
+    for term, query_tf in query.items():
+        if use_idf and not index.document_frequency(term):
+            continue
+        weight = query_tf * (index.idf(term) if use_idf else 1.0)
+        total += weight
+        tf = terms.get(term, 0.0)
+        if tf:
+            earned += weight * (0.5 + 0.5 * min(1.0, tf / FULL_CREDIT_TF))
+            matched.append(term)
+        else:
+            missing.append(term)
+
+    score = 100.0 * earned / total if total else 0.0
+    missing.sort(key=lambda term: -query[term])
+    return {'score': round(score, 1), 'matched': sorted(matched), 'missing': missing}
@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+
+def content_hash(data: bytes) -> str:
+    """Return the SHA-256 hex digest used to key cached parse results"""
+    return hashlib.sha256(data).hexdigest()
+
+
+# Disk entries are sharded into subdirectories named by the first two hex digits of their key
+SHARD_RE = re.compile(r'^[0-9a-f]{2}$')
+
+
+class ParseCache:
+    """Two-tier cache of parsed resumes keyed by the PDF content hash.
+
+    Entries live in an in-memory LRU and in JSON files on disk, so parsed
+    results survive restarts and are shared between worker processes. Disk
+    entries are also keyed by version, which names the parser and settings
+    that produced them, so a deploy that changes parse output starts from
+    an empty cache; sweep removes expired and other-version entries.
+    """
+
+    def __init__(self, cache_dir: str, ttl: int = 3600, max_entries: int = 256, version: str = ''):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.version = version
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached parse result for key, or None if missing/expired"""
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created, value = entry
+                if now - created <= self.ttl:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._memory[key]
+
+        entry = self._read_disk(key)
+        with self._lock:
+            if entry is not None and now - entry[0] <= self.ttl:
+                self._remember(key, entry)
+                self.hits += 1
+                self.disk_hits += 1
+                return entry[1]
+            self.misses += 1
+
+        if entry is not None:
+            self._remove_disk(key)
+        return None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a parse result in both tiers"""
+        entry = (time.time(), value)
+        with self._lock:
+            self._remember(key, entry)
+        self._write_disk(key, entry)
+
+    def sweep(self) -> int:
+        """Delete disk entries past the TTL or written for another version, returning how many"""
+        cutoff = time.time() - self.ttl
+        suffix = self._disk_suffix()
+        removed = 0
+        with os.scandir(self.cache_dir) as shards:
+            # The cache folder is shared with other stores, only shard directories are ours
+            shards = [shard.path for shard in shards if shard.is_dir() and SHARD_RE.match(shard.name)]
+        for shard in shards:
+            with os.scandir(shard) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(('.json', '.tmp')):
+                        continue
+                    try:
+                        # Entries are written once, so the file time is their creation time;
+                        # temp files are kept as long, a worker may still be writing one
+                        current = entry.name.endswith((suffix, '.tmp'))
+                        if current and entry.stat().st_mtime >= cutoff:
+                            continue
+                        os.remove(entry.path)
+                        removed += 1
+                    except OSError:
+                        pass  # Removed by another worker's sweep or get
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'memory_entries': len(self._memory),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'version': self.version
+            }
+
+    def _remember(self, key, entry):
+        # Caller must hold the lock
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_path(self, key: str) -> str:
+        # Shard by hash prefix so the cache directory never gets too large
+        return os.path.join(self.cache_dir, key[:2], f"{key}{self._disk_suffix()}")
+
+    def _disk_suffix(self) -> str:
+        return f"-v{self.version}.json" if self.version else ".json"
+
+    def _read_disk(self, key):
+        try:
+            with open(self._disk_path(key), 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+            return payload['created'], payload['data']
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Error reading parse cache entry {key}: {str(e)}")
+            return None
+
+    def _write_disk(self, key, entry):
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temp file first so readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'created': entry[0], 'data': entry[1]}, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Error writing parse cache entry {key}: {str(e)}")
+
+    def _remove_disk(self, key):
+        try:
+            os.remove(self._disk_path(key))
+        except OSError:
+            pass
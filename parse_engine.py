@@ -0,0 +1,269 @@
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Dict, Any, Optional
+
+from pdf_parser import parse_pdf, extract_text
+from hybrid_parser import score_pdf
+
+# What a parse job returns: ResumeParser's structure, HybridResumeParser's
+# scored result, or just the resume's text lines for the LLM
+PARSE = 'parse'
+HYBRID = 'hybrid'
+TEXT = 'text'
+
+
+class EngineBusy(Exception):
+    """Raised when too many parse jobs are already queued"""
+
+
+class ParseTimeout(Exception):
+    """Raised when a parse job does not finish within its time limit"""
+
+
+def _parse_job(source, raise_errors, mode=PARSE):
+    # Runs inside a pool worker process
+    if mode == HYBRID:
+        return score_pdf(source, raise_errors=raise_errors)
+    if mode == TEXT:
+        return extract_text(source)
+    return parse_pdf(source, raise_errors=raise_errors)
+
+
+def _worker_main(conn, max_tasks: int) -> None:
+    # Runs in a worker process: parse jobs one at a time until max_tasks, then exit
+    for _ in range(max_tasks):
+        try:
+            args = conn.recv()
+        except EOFError:
+            return
+        try:
+            reply = ('ok', _parse_job(*args))
+        except Exception as e:
+            reply = ('error', e)
+        try:
+            conn.send(reply)
+        except Exception as e:
+            # The exception or result could not be pickled
+            conn.send(('error', RuntimeError(f"{type(e).__name__}: {e}")))
+
+
+class ParseJob:
+    """Handle for a parse job submitted to a ParseEngine"""
+
+    def __init__(self, engine: 'ParseEngine', args):
+        self._engine = engine
+        self.args = args
+        self.future = Future()
+        self.worker: Optional['_Worker'] = None  # The worker that took it off the queue
+        self._released = False
+        self._release_lock = threading.Lock()
+
+    def result(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Wait for the parsed resume, raising ParseTimeout if it takes too long"""
+        if timeout is None:
+            timeout = self._engine.timeout
+        try:
+            result = self.future.result(timeout)
+            self._engine._count('completed')
+            return result
+        except FutureTimeout:
+            # A stuck pdfplumber call can't be cancelled, so kill the process
+            # running it; other jobs keep their workers
+            self._engine._abandon(self)
+            self._engine._count('timeouts')
+            raise ParseTimeout(f"PDF parsing took longer than {timeout} seconds")
+        finally:
+            self._release()
+
+    def cancel(self) -> None:
+        """Give up on the job without waiting for it.
+
+        A queued job is dropped; one already running finishes in its worker
+        and frees its pending slot then.
+        """
+        if self.future.cancel():
+            self._release()
+        else:
+            self.future.add_done_callback(lambda _: self._release())
+
+    def _release(self) -> None:
+        # Frees the job's pending slot in the engine exactly once
+        with self._release_lock:
+            if self._released:
+                return
+            self._released = True
+        self._engine._release()
+
+
+class _Worker:
+    """One worker process and the thread that feeds it jobs from the engine's queue"""
+
+    def __init__(self, engine: 'ParseEngine', index: int):
+        self.engine = engine
+        self.index = index
+        self.process = None
+        self.conn = None
+        self.tasks = 0
+        self.current: Optional[ParseJob] = None
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self._run, name=f'parse-worker-{index}', daemon=True)
+        self.thread.start()
+
+    def _start_process(self) -> None:
+        context = multiprocessing.get_context(self.engine.start_method)
+        parent_conn, child_conn = context.Pipe()
+        process = context.Process(target=_worker_main, args=(child_conn, self.engine.max_tasks_per_child),
+                                  name=f'parse-worker-{self.index}', daemon=True)
+        process.start()
+        child_conn.close()
+        self.process, self.conn, self.tasks = process, parent_conn, 0
+
+    def _stop_process(self) -> None:
+        if self.process is None:
+            return
+        self.conn.close()
+        self.process.kill()
+        self.process.join()
+        self.process = self.conn = None
+
+    def kill(self, job: ParseJob) -> None:
+        """Kill the process if it is still parsing job; the thread starts a new one"""
+        with self.lock:
+            if self.current is job and self.process is not None:
+                self.process.kill()
+
+    def _run(self) -> None:
+        jobs = self.engine._queue
+        while True:
+            job = jobs.get()
+            if job is None:
+                with self.lock:
+                    self._stop_process()
+                return
+            with self.lock:
+                # Assigned before the job is marked running, so a caller that
+                # times out from here on always finds the worker to kill; kill
+                # waits for the lock until the job is sent
+                job.worker = self
+                if not job.future.set_running_or_notify_cancel():
+                    continue  # Its caller timed out while it was queued
+                if self.process is None:
+                    self._start_process()
+                self.current = job
+                conn = self.conn
+            try:
+                conn.send(job.args)
+                status, payload = conn.recv()
+            except (EOFError, OSError):
+                # Killed for a timeout, or crashed; either way it needs replacing
+                with self.lock:
+                    self._stop_process()
+                self.engine._count('killed_workers')
+                job.future.set_exception(ParseTimeout("PDF parsing worker was stopped"))
+                continue
+            finally:
+                with self.lock:
+                    self.current = None
+
+            self.tasks += 1
+            if self.tasks >= self.engine.max_tasks_per_child:
+                # The process exits by itself after its last task
+                with self.lock:
+                    self._stop_process()
+                self.engine._count('recycled_workers')
+            if status == 'ok':
+                job.future.set_result(payload)
+            else:
+                job.future.set_exception(payload)
+
+
+class ParseEngine:
+    """Parses PDFs in a bounded set of worker processes.
+
+    Keeps CPU-bound pdfplumber work off the request threads, rejects new
+    jobs once max_pending are in flight, and restarts each worker after
+    max_tasks_per_child jobs to cap pdfplumber memory growth. A job that
+    times out is cancelled if still queued, or its worker process alone is
+    killed and replaced.
+    """
+
+    def __init__(self, processes: int = 2, max_pending: int = 8,
+                 timeout: float = 30, max_tasks_per_child: int = 50,
+                 start_method: str = 'spawn'):
+        self.processes = processes
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.max_tasks_per_child = max_tasks_per_child
+        self.start_method = start_method
+        self._queue = queue.SimpleQueue()
+        self._workers = None
+        self._workers_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._pending = 0
+        self._counters = {'completed': 0, 'rejected': 0, 'timeouts': 0,
+                          'killed_workers': 0, 'recycled_workers': 0}
+
+    def submit(self, source, raise_errors: bool = False, mode: str = PARSE) -> ParseJob:
+        """Queue a PDF path or bytes for parsing, raising EngineBusy if the queue is full"""
+        with self._stats_lock:
+            if self._pending >= self.max_pending:
+                self._counters['rejected'] += 1
+                raise EngineBusy(f"{self._pending} parse jobs already pending")
+            self._pending += 1
+
+        try:
+            self._start_workers()
+            job = ParseJob(self, (source, raise_errors, mode))
+            self._queue.put(job)
+        except Exception:
+            self._release()
+            raise
+        return job
+
+    def parse(self, source, timeout: Optional[float] = None, mode: str = PARSE):
+        """Parse a PDF in a worker process and wait for the result"""
+        return self.submit(source, mode=mode).result(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth and job counters for monitoring"""
+        with self._stats_lock:
+            return {
+                'pending': self._pending,
+                'max_pending': self.max_pending,
+                'processes': self.processes,
+                **self._counters
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes once they finish their current job"""
+        with self._workers_lock:
+            workers, self._workers = self._workers, None
+        if workers is None:
+            return
+        for _ in workers:
+            self._queue.put(None)
+        for worker in workers:
+            worker.thread.join()
+
+    def _start_workers(self) -> None:
+        # Started lazily so each gunicorn worker gets its own processes after forking
+        with self._workers_lock:
+            if self._workers is None:
+                self._workers = [_Worker(self, index) for index in range(self.processes)]
+
+    def _abandon(self, job: ParseJob) -> None:
+        if job.future.cancel():
+            return
+        worker = job.worker
+        if worker is not None:
+            worker.kill(job)
+
+    def _release(self) -> None:
+        with self._stats_lock:
+            self._pending -= 1
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self._counters[name] += 1
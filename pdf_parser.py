@@ -1,186 +1,253 @@
 import pdfplumber
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Iterator, NamedTuple, Optional, Tuple, Union
+from itertools import chain, islice
+from functools import lru_cache
+from io import BytesIO
 import re
+from config import Config
+from resume_model import Contact, Entry, Resume, Section
+
+# Expanded bullet point patterns
+BULLET_PATTERNS = [
+    r'^\s*•\s+',  # Standard bullet
+    r'^\s*-\s+',  # Dash bullet
+    r'^\s*\*\s+', # Asterisk bullet
+    r'^\s*\u2022\s+',  # Unicode bullet
+    r'^\s*\u2023\s+',  # Triangle bullet
+    r'^\s*\u25E6\s+',  # White bullet
+    r'^\s*\u25AA\s+',  # Black small square
+    r'^\s*\d+\.\s+',   # Numbered list (1. 2. etc)
+    r'^\s*\[\s*\d+\s*\]\s+',  # [1] style
+    r'^\s*o\s+'    # 'o' as bullet
+]
+
+SECTION_HEADERS = [
+    'EDUCATION',
+    'EXPERIENCE',
+    'SKILLS',
+    'PROJECTS',
+    'PROFESSIONAL EXPERIENCE'
+]
+
+# Separates pages in extract_text output, so running headers and footers can be told apart from content
+PAGE_BREAK = '\f'
+
+# Compiled once per process and shared by every parser instance
+BULLET_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in BULLET_PATTERNS))
+BULLET_PATTERN_RES = [re.compile(pattern) for pattern in BULLET_PATTERNS]
+DATE_RE = re.compile(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4}')
+LOCATION_RE = re.compile(r'([A-Za-z\s]+),\s*([A-Z]{2})')
+SCHOOL_RE = re.compile(r'University|College|School')
+JOB_KEYWORD_RE = re.compile(r'(job|work|employment|position)')
+SKILL_SEPARATOR_RE = re.compile(r'[,;:|]')
+EMAIL_RE = re.compile(r'[\w\.-]+@[\w\.-]+')
+PHONE_RE = re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+LINKEDIN_RE = re.compile(r'linkedin\.com/in/[\w-]+')
+GITHUB_RE = re.compile(r'github\.com/[\w-]+')
+
+# Line kinds assigned by ResumeParser._classify_line
+BULLET = 'bullet'
+HEADER = 'header'
+DATE = 'date'
+LOCATION = 'location'
+PLAIN = 'plain'
+
+
+@lru_cache(maxsize=None)
+def _compile_headers(headers: Tuple[str, ...]):
+    return re.compile('|'.join(re.escape(header) for header in headers))
+
+
+class ClassifiedLine(NamedTuple):
+    """A resume line classified once and reused by every section parser"""
+    text: str
+    kind: str
+    content: str  # Text with any bullet marker removed
+    location: str  # "City, ST" found in a non-bullet line, if any
+    has_date: bool  # Only checked for non-bullet lines
+    is_header: bool = False  # Starts a section; a bullet can be one too, and keeps its BULLET kind
+
+
+def _clean_bullet_point(line: str) -> str:
+    """Remove bullet markers, applying every pattern once in order (so "• - foo" becomes 'foo')"""
+    for pattern in BULLET_PATTERN_RES:
+        line = pattern.sub('', line)
+    return line.strip()
+
 
 class ResumeParser:
-    def __init__(self):
-        self.section_headers = [
-            'EDUCATION',
-            'EXPERIENCE',
-            'SKILLS',
-            'PROJECTS',
-            'PROFESSIONAL EXPERIENCE'
-        ]
-        # Expanded bullet point patterns
-        self.bullet_patterns = [
-            r'^\s*•\s+',  # Standard bullet
-            r'^\s*-\s+',  # Dash bullet
-            r'^\s*\*\s+', # Asterisk bullet
-            r'^\s*\u2022\s+',  # Unicode bullet
-            r'^\s*\u2023\s+',  # Triangle bullet
-            r'^\s*\u25E6\s+',  # White bullet
-            r'^\s*\u25AA\s+',  # Black small square
-            r'^\s*\d+\.\s+',   # Numbered list (1. 2. etc)
-            r'^\s*\[\s*\d+\s*\]\s+',  # [1] style
-            r'^\s*o\s+'    # 'o' as bullet
-        ]
-
-    def parse(self, pdf_path: str) -> Dict[str, Any]:
-        """Main parsing function"""
+    def __init__(self, max_pages: Optional[int] = Config.MAX_PDF_PAGES):
+        # Pages beyond this are ignored; None reads the whole document
+        self.max_pages = max_pages
+        self.section_headers = SECTION_HEADERS
+        self._header_re = _compile_headers(tuple(self.section_headers))
+
+    def parse(self, pdf_path, raise_errors: bool = False) -> Dict[str, Any]:
+        """Main parsing function, accepting a path or a file-like object"""
+        return self.parse_model(pdf_path, raise_errors=raise_errors).to_dict()
+
+    def parse_model(self, pdf_path, raise_errors: bool = False) -> Resume:
+        """Parse a PDF into a Resume model instead of the API's dict form"""
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                first_page = pdf.pages[0]
-                text = first_page.extract_text()
-                lines = [line.strip() for line in text.split('\n') if line.strip()]
+            # Only load the pages we are going to read
+            pages = range(1, self.max_pages + 1) if self.max_pages else None
+            with pdfplumber.open(pdf_path, pages=pages) as pdf:
+                lines = self._iter_lines(pdf)
+                top_lines = list(islice(lines, 5))
                 
                 # Find the name (usually the first line)
-                name = lines[0] if lines else ""
+                name = top_lines[0] if top_lines else ""
                 
                 # Extract contact info (usually in the first few lines)
-                contact_info = self._extract_contact_info(lines[:5])
+                contact_info = self._extract_contact_info(top_lines)
                 
-                # Find section boundaries
-                sections = self._extract_sections(lines)
+                # Find section boundaries, consuming the remaining pages as we go
+                sections = self._extract_sections(chain(top_lines, lines))
                 
-                resume_data = {
-                    "personal_info": {
-                        "name": name,
-                        "contact": contact_info
-                    },
-                    "sections": sections
-                }
-                
-                return resume_data
+                return Resume(name, contact_info, sections)
                 
         except Exception as e:
+            if raise_errors:
+                raise
             print(f"Error parsing PDF: {str(e)}")
-            return self._get_empty_structure()
+            return Resume()
 
-    def _is_bullet_point(self, line: str) -> bool:
-        """Check if a line is a bullet point using various patterns"""
-        for pattern in self.bullet_patterns:
-            if re.match(pattern, line):
-                return True
-        
-        # Special case for indented lines that might be continuation of bullets
+    def extract_text(self, pdf_path) -> str:
+        """Return the non-empty lines of the pages we read, pages separated by PAGE_BREAK, for the LLM"""
+        pages = range(1, self.max_pages + 1) if self.max_pages else None
+        with pdfplumber.open(pdf_path, pages=pages) as pdf:
+            return PAGE_BREAK.join('\n'.join(lines) for lines in self._iter_pages(pdf))
+
+    def _iter_lines(self, pdf) -> Iterator[str]:
+        """Yield non-empty lines one page at a time"""
+        return chain.from_iterable(self._iter_pages(pdf))
+
+    def _iter_pages(self, pdf) -> Iterator[List[str]]:
+        """Yield the non-empty lines of each page"""
+        for page in pdf.pages:
+            text = page.extract_text() or ""
+            # Drop pdfplumber's cached chars/layout so memory stays flat across pages
+            page.flush_cache()
+            yield [line.strip() for line in text.split('\n') if line.strip()]
+
+    def _classify_line(self, line: str) -> ClassifiedLine:
+        """Classify a line in a single pass over the precompiled patterns"""
+        is_header = self._header_re.search(line.upper()) is not None
+        # Bullets are recognized before headers, as the implicit-section fallback expects
+        if BULLET_RE.match(line):
+            return ClassifiedLine(line, BULLET, _clean_bullet_point(line), "", False, is_header)
+        # Indented lines are treated as continuations of bullets
         if line.startswith('    ') and len(line) > 5:
-            return True
-            
-        return False
-    
-    def _clean_bullet_point(self, line: str) -> str:
-        """Remove bullet point marker and clean the text"""
-        for pattern in self.bullet_patterns:
-            line = re.sub(pattern, '', line)
-        return line.strip()
+            return ClassifiedLine(line, BULLET, _clean_bullet_point(line), "", False, is_header)
+        if is_header:
+            return ClassifiedLine(line, HEADER, line.strip(), "", False, True)
+        
+        # Dates and locations only matter for entry title lines, so bullets skip these searches
+        has_date = DATE_RE.search(line) is not None
+        location_match = LOCATION_RE.search(line) if ',' in line else None
+        location = location_match.group(0) if location_match else ""
+        if has_date:
+            kind = DATE
+        elif location:
+            kind = LOCATION
+        else:
+            kind = PLAIN
+        return ClassifiedLine(line, kind, line.strip(), location, has_date)
 
     def _get_empty_structure(self) -> Dict[str, Any]:
-        return {
-            "personal_info": {
-                "name": "",
-                "contact": {"email": "", "phone": "", "location": "", "linkedin": "", "github": ""}
-            },
-            "sections": []
-        }
-
-    def _extract_contact_info(self, lines: List[str]) -> Dict[str, str]:
+        return Resume().to_dict()
+
+    def _extract_contact_info(self, lines: List[str]) -> Contact:
         """Extract contact information from top of resume"""
-        contact_info = {
-            "email": "",
-            "phone": "",
-            "location": "",
-            "linkedin": "",
-            "github": ""
-        }
+        contact_info = Contact()
 
         # Join lines to handle contact info that might be spread across multiple lines
         contact_text = " ".join(lines)
         
         # Extract email
-        email_match = re.search(r'[\w\.-]+@[\w\.-]+', contact_text)
+        email_match = EMAIL_RE.search(contact_text)
         if email_match:
-            contact_info["email"] = email_match.group(0)
+            contact_info.email = email_match.group(0)
         
         # Extract phone
-        phone_match = re.search(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', contact_text)
+        phone_match = PHONE_RE.search(contact_text)
         if phone_match:
-            contact_info["phone"] = phone_match.group(0)
+            contact_info.phone = phone_match.group(0)
         
         # Extract location (common city/state formats)
-        location_match = re.search(r'([A-Za-z\s]+),\s*([A-Z]{2})', contact_text)
+        location_match = LOCATION_RE.search(contact_text)
         if location_match:
-            contact_info["location"] = location_match.group(0)
+            contact_info.location = location_match.group(0)
         
         # Extract LinkedIn
-        linkedin_match = re.search(r'linkedin\.com/in/[\w-]+', contact_text)
+        linkedin_match = LINKEDIN_RE.search(contact_text)
         if linkedin_match:
-            contact_info["linkedin"] = linkedin_match.group(0)
+            contact_info.linkedin = linkedin_match.group(0)
         
         # Extract GitHub
-        github_match = re.search(r'github\.com/[\w-]+', contact_text)
+        github_match = GITHUB_RE.search(contact_text)
         if github_match:
-            contact_info["github"] = github_match.group(0)
+            contact_info.github = github_match.group(0)
 
         return contact_info
 
-    def _extract_sections(self, lines: List[str]) -> List[Dict[str, Any]]:
-        """Extract sections from resume"""
+    def _extract_sections(self, lines: Iterable[str]) -> List[Section]:
+        """Extract sections from resume lines, consumed incrementally"""
         sections = []
         current_section = None
         section_content = []
+        # Lines are only kept for the implicit-section fallback until a real section is found
+        fallback_lines = []
         
         # Find section boundaries
-        for i, line in enumerate(lines):
+        for line in lines:
+            # Each line is classified exactly once; section parsers reuse the result
+            record = self._classify_line(line)
+            if fallback_lines is not None:
+                fallback_lines.append(record)
+            
             # Check if line is a section header
-            if any(header in line.upper() for header in self.section_headers):
+            if record.is_header:
                 # Save previous section if exists
                 if current_section and section_content:
-                    sections.append({
-                        "title": current_section,
-                        "entries": self._parse_section_content(current_section, section_content)
-                    })
+                    sections.append(Section(current_section,
+                                            self._parse_section_content(current_section, section_content)))
+                    fallback_lines = None
                 
                 # Start new section
                 current_section = line
                 section_content = []
             elif current_section:
-                section_content.append(line)
+                section_content.append(record)
         
         # Add final section
         if current_section and section_content:
-            sections.append({
-                "title": current_section,
-                "entries": self._parse_section_content(current_section, section_content)
-            })
+            sections.append(Section(current_section,
+                                    self._parse_section_content(current_section, section_content)))
         
         # If no sections were found, create default sections from the content
-        if not sections and lines:
+        if not sections and fallback_lines:
             # Attempt to detect sections based on line formatting
-            sections = self._detect_implicit_sections(lines)
+            sections = self._detect_implicit_sections(fallback_lines)
         
         return sections
 
-    def _detect_implicit_sections(self, lines: List[str]) -> List[Dict[str, Any]]:
+    def _detect_implicit_sections(self, lines: List[ClassifiedLine]) -> List[Section]:
         """Detect sections that aren't explicitly labeled"""
         # This is a fallback when no explicit sections are found
         
         # Try to find experience section
         exp_entries = []
         for i, line in enumerate(lines):
-            if re.search(r'(job|work|employment|position)', line.lower()):
+            if JOB_KEYWORD_RE.search(line.text.lower()):
                 # Found potential experience entry
-                entry = {
-                    "company": line,
-                    "position": lines[i+1] if i+1 < len(lines) else "",
-                    "location": "",
-                    "duration": "",
-                    "points": []
-                }
+                entry = Entry(company=line.text,
+                              position=lines[i+1].text if i+1 < len(lines) else "")
                 
                 # Look for bullet points following this entry
                 j = i + 2
-                while j < len(lines) and (self._is_bullet_point(lines[j]) or lines[j].startswith('    ')):
-                    entry["points"].append(self._clean_bullet_point(lines[j]))
+                while j < len(lines) and lines[j].kind == BULLET:
+                    entry.points.append(lines[j].content)
                     j += 1
                 
                 exp_entries.append(entry)
@@ -188,27 +255,16 @@ class ResumeParser:
         # Create default sections
         sections = []
         if exp_entries:
-            sections.append({
-                "title": "EXPERIENCE",
-                "entries": exp_entries
-            })
+            sections.append(Section("EXPERIENCE", exp_entries))
         
         # Add remaining lines as a generic section
         if lines:
-            sections.append({
-                "title": "ADDITIONAL INFORMATION",
-                "entries": [{
-                    "company": "",
-                    "position": "",
-                    "location": "",
-                    "duration": "",
-                    "points": [line for line in lines if self._is_bullet_point(line)]
-                }]
-            })
+            sections.append(Section("ADDITIONAL INFORMATION",
+                                    [Entry(points=[line.text for line in lines if line.kind == BULLET])]))
         
         return sections
 
-    def _parse_section_content(self, section_title: str, content: List[str]) -> List[Dict[str, Any]]:
+    def _parse_section_content(self, section_title: str, content: List[ClassifiedLine]) -> List[Entry]:
         """Parse content of a section based on its type"""
         if "EDUCATION" in section_title.upper():
             return self._parse_education(content)
@@ -219,43 +275,33 @@ class ResumeParser:
         else:
             return self._parse_generic_section(content)
 
-    def _parse_education(self, content: List[str]) -> List[Dict[str, Any]]:
+    def _parse_education(self, content: List[ClassifiedLine]) -> List[Entry]:
         """Parse education section"""
         entries = []
         current_entry = None
         
         for line in content:
             # Check if line is a university/school name
-            if re.search(r'University|College|School', line) and not self._is_bullet_point(line):
+            if line.kind != BULLET and SCHOOL_RE.search(line.text):
                 if current_entry:
                     entries.append(current_entry)
                 
-                # Extract location if present
-                location_match = re.search(r'([A-Za-z\s]+),\s*([A-Z]{2})', line)
-                location = location_match.group(0) if location_match else ""
-                
                 # Remove location from school name if present
-                school = line
-                if location:
-                    school = line.replace(location, "").strip()
+                school = line.text
+                if line.location:
+                    school = line.text.replace(line.location, "").strip()
                 
-                current_entry = {
-                    "company": school,
-                    "location": location,
-                    "position": "",
-                    "duration": "",
-                    "points": []
-                }
+                current_entry = Entry(company=school, location=line.location)
             elif current_entry:
                 # Check if line is a bullet point
-                if self._is_bullet_point(line):
-                    current_entry["points"].append(self._clean_bullet_point(line))
+                if line.kind == BULLET:
+                    current_entry.points.append(line.content)
                 # Check if line contains a degree
-                elif "Bachelor" in line or "Master" in line or "Associate" in line or "Degree" in line:
-                    current_entry["position"] = line
+                elif "Bachelor" in line.text or "Master" in line.text or "Associate" in line.text or "Degree" in line.text:
+                    current_entry.position = line.text
                 # Check if line contains dates
-                elif re.search(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4}', line):
-                    current_entry["duration"] = line
+                elif line.has_date:
+                    current_entry.duration = line.text
         
         # Add final entry
         if current_entry:
@@ -263,7 +309,7 @@ class ResumeParser:
         
         return entries
 
-    def _parse_experience(self, content: List[str]) -> List[Dict[str, Any]]:
+    def _parse_experience(self, content: List[ClassifiedLine]) -> List[Entry]:
         """Parse experience section"""
         entries = []
         current_entry = None
@@ -274,54 +320,38 @@ class ResumeParser:
             line = content[i]
             
             # Check if line is a bullet point
-            if self._is_bullet_point(line):
+            if line.kind == BULLET:
                 if current_entry:
-                    bullet_points.append(self._clean_bullet_point(line))
+                    bullet_points.append(line.content)
                 else:
                     # Create a default entry if bullet points come before any entry
-                    current_entry = {
-                        "company": "Professional Experience",
-                        "location": "",
-                        "position": "",
-                        "duration": "",
-                        "points": [self._clean_bullet_point(line)]
-                    }
+                    current_entry = Entry(company="Professional Experience", points=[line.content])
             # Check if line might be a company name (not a bullet point)
-            elif not self._is_bullet_point(line) and len(line) < 60:  # Companies are usually short lines
+            elif len(line.text) < 60:  # Companies are usually short lines
                 # Save previous entry
                 if current_entry:
                     if bullet_points:
-                        current_entry["points"] = bullet_points
+                        current_entry.points = bullet_points
                     entries.append(current_entry)
                     bullet_points = []
                 
-                # Extract location if present
-                location_match = re.search(r'([A-Za-z\s]+),\s*([A-Z]{2})', line)
-                location = location_match.group(0) if location_match else ""
-                
                 # Extract company name
-                company = line
-                if location:
-                    company = line.replace(location, "").strip()
+                company = line.text
+                if line.location:
+                    company = line.text.replace(line.location, "").strip()
                 
-                current_entry = {
-                    "company": company,
-                    "location": location,
-                    "position": "",
-                    "duration": "",
-                    "points": []
-                }
+                current_entry = Entry(company=company, location=line.location)
                 
                 # Check if next line might be a position or date
-                if i+1 < len(content) and not self._is_bullet_point(content[i+1]):
+                if i+1 < len(content) and content[i+1].kind != BULLET:
                     next_line = content[i+1]
                     # Check if it's a date
-                    if re.search(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4}', next_line):
-                        current_entry["duration"] = next_line
+                    if next_line.has_date:
+                        current_entry.duration = next_line.text
                         i += 1  # Skip this line on next iteration
                     else:
                         # Assume it's a position
-                        current_entry["position"] = next_line
+                        current_entry.position = next_line.text
                         i += 1  # Skip this line on next iteration
             
             i += 1
@@ -329,57 +359,54 @@ class ResumeParser:
         # Add final entry
         if current_entry:
             if bullet_points:
-                current_entry["points"] = bullet_points
+                current_entry.points = bullet_points
             entries.append(current_entry)
         
         return entries
 
-    def _parse_skills(self, content: List[str]) -> List[Dict[str, Any]]:
+    def _parse_skills(self, content: List[ClassifiedLine]) -> List[Entry]:
         """Parse skills section"""
         # For skills, we'll create a single entry with bullet points
-        skills_entry = {
-            "company": "Technical Skills",
-            "position": "",
-            "location": "",
-            "duration": "",
-            "points": []
-        }
+        skills_entry = Entry(company="Technical Skills")
         
         for line in content:
-            if self._is_bullet_point(line):
-                skills_entry["points"].append(self._clean_bullet_point(line))
+            if line.kind == BULLET:
+                skills_entry.points.append(line.content)
             else:
                 # For skills, even non-bulleted lines can be skills
-                parts = re.split(r'[,;:|]', line)
+                parts = SKILL_SEPARATOR_RE.split(line.text)
                 for part in parts:
                     if part.strip():
-                        skills_entry["points"].append(part.strip())
+                        skills_entry.points.append(part.strip())
         
         return [skills_entry]
 
-    def _parse_generic_section(self, content: List[str]) -> List[Dict[str, Any]]:
+    def _parse_generic_section(self, content: List[ClassifiedLine]) -> List[Entry]:
         """Parse any other section type"""
         # For generic sections, create a single entry
-        entry = {
-            "company": "",
-            "position": "",
-            "location": "",
-            "duration": "",
-            "points": []
-        }
+        entry = Entry()
         
         for line in content:
-            if self._is_bullet_point(line):
-                entry["points"].append(self._clean_bullet_point(line))
+            if line.kind == BULLET:
+                entry.points.append(line.content)
             else:
                 # For non-bullet points in generic sections, add as separate points
                 # but only if they're not too long (likely title lines)
-                if len(line) < 60:
-                    entry["points"].append(line.strip())
+                if len(line.text) < 60:
+                    entry.points.append(line.text.strip())
         
         return [entry]
 
-def parse_pdf(filepath: str) -> Dict[str, Any]:
-    """Main function to parse PDF"""
+def parse_pdf(filepath: Union[str, bytes], raise_errors: bool = False) -> Dict[str, Any]:
+    """Main function to parse PDF from a file path or the raw PDF bytes"""
+    if isinstance(filepath, (bytes, bytearray)):
+        filepath = BytesIO(filepath)
     parser = ResumeParser()
-    return parser.parse(filepath) 
\ No newline at end of file
+    return parser.parse(filepath, raise_errors=raise_errors)
+ 
+
+def extract_text(filepath: Union[str, bytes]) -> str:
+    """Return the text of a PDF file path or raw PDF bytes"""
+    if isinstance(filepath, (bytes, bytearray)):
+        filepath = BytesIO(filepath)
+    return ResumeParser().extract_text(filepath)
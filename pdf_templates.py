@@ -0,0 +1,188 @@
+import os
+import threading
+from typing import Dict, List, Any, Optional
+
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+_fonts_lock = threading.Lock()
+_registered_fonts = set()
+
+
+def register_fonts(font_dir: Optional[str]) -> List[str]:
+    """Register every .ttf in font_dir with ReportLab, once per process.
+
+    Fonts are registered under their file name without the extension,
+    e.g. fonts/Inter.ttf becomes 'Inter'.
+    """
+    if not font_dir or not os.path.isdir(font_dir):
+        return []
+
+    with _fonts_lock:
+        for filename in sorted(os.listdir(font_dir)):
+            font_name, ext = os.path.splitext(filename)
+            if ext.lower() != '.ttf' or font_name in _registered_fonts:
+                continue
+            try:
+                pdfmetrics.registerFont(TTFont(font_name, os.path.join(font_dir, filename)))
+                _registered_fonts.add(font_name)
+            except Exception as e:
+                print(f"Error registering font {filename}: {str(e)}")
+        return sorted(_registered_fonts)
+
+
+class ResumeTemplate:
+    """Precomputed styles and page geometry for one resume look.
+
+    Styles are built once and only read while rendering. A ReportLab
+    document is bound to the file it writes, so every render builds its own
+    from the stored geometry, and a single template can be shared by all
+    request threads.
+    """
+
+    def __init__(self, name: str, pagesize=letter, margin: float = 72,
+                 name_size: int = 16, contact_size: int = 10, section_size: int = 12,
+                 bullet_size: int = 10, bullet_indent: int = 20,
+                 title_gap: float = 0.1 * inch, section_gap: float = 0.2 * inch,
+                 font_name: Optional[str] = None, bold_font_name: Optional[str] = None):
+        self.name = name
+        self.pagesize = pagesize
+        self.margin = margin
+        self.title_gap = title_gap
+        self.section_gap = section_gap
+
+        styles = getSampleStyleSheet()
+        regular = {'fontName': font_name} if font_name else {}
+        bold = {'fontName': bold_font_name} if bold_font_name else {}
+
+        self.name_style = ParagraphStyle(
+            name='Name',
+            parent=styles['Heading1'],
+            fontSize=name_size,
+            alignment=1,  # Center alignment
+            spaceAfter=10,
+            **bold
+        )
+        self.contact_style = ParagraphStyle(
+            name='ContactInfo',
+            parent=styles['Normal'],
+            fontSize=contact_size,
+            alignment=1,  # Center alignment
+            spaceAfter=20,
+            **regular
+        )
+        self.section_style = ParagraphStyle(
+            name='SectionTitle',
+            parent=styles['Heading2'],
+            fontSize=section_size,
+            textTransform='uppercase',
+            spaceBefore=15,
+            spaceAfter=6,
+            **bold
+        )
+        self.bullet_style = ParagraphStyle(
+            name='BulletPoint',
+            parent=styles['Normal'],
+            fontSize=bullet_size,
+            leftIndent=bullet_indent,
+            spaceAfter=2,
+            **regular
+        )
+        self.entry_heading_style = ParagraphStyle(
+            name='EntryHeading',
+            parent=styles['Normal'],
+            fontName=bold_font_name or 'Helvetica-Bold',
+            fontSize=bullet_size + 1,
+            spaceBefore=4,
+            spaceAfter=1
+        )
+        self.entry_details_style = ParagraphStyle(
+            name='EntryDetails',
+            parent=styles['Normal'],
+            fontName=font_name or 'Helvetica-Oblique',
+            fontSize=bullet_size - 1,
+            spaceAfter=2
+        )
+
+    def build_elements(self, name: str, contact_info: str, sections: List[Dict[str, Any]]) -> list:
+        """Lay out the name, contact line and sections as flowables.
+
+        Each section has a 'title', 'bullet_points' and optionally 'entries',
+        each entry with a 'heading', 'details' line and 'bullet_points'.
+        """
+        elements = [
+            Paragraph(name, self.name_style),
+            Paragraph(contact_info, self.contact_style)
+        ]
+
+        for section in sections:
+            elements.append(Paragraph(section['title'], self.section_style))
+            elements.append(Spacer(1, self.title_gap))
+
+            for entry in section.get('entries', []):
+                if entry['heading']:
+                    elements.append(Paragraph(entry['heading'], self.entry_heading_style))
+                if entry['details']:
+                    elements.append(Paragraph(entry['details'], self.entry_details_style))
+                for point in entry['bullet_points']:
+                    elements.append(Paragraph(f"• {point}", self.bullet_style))
+
+            for point in section['bullet_points']:
+                # Use standard bullet character
+                elements.append(Paragraph(f"• {point}", self.bullet_style))
+
+            elements.append(Spacer(1, self.section_gap))
+
+        return elements
+
+    def render(self, output, name: str, contact_info: str, sections: List[Dict[str, Any]]) -> None:
+        """Render a resume PDF to a file path or writable binary file object"""
+        doc = SimpleDocTemplate(output, pagesize=self.pagesize,
+                                rightMargin=self.margin, leftMargin=self.margin,
+                                topMargin=self.margin, bottomMargin=self.margin)
+        doc.build(self.build_elements(name, contact_info, sections))
+
+
+# Layout of the named variants selectable with the 'template' field of /generate-pdf
+TEMPLATE_OPTIONS = {
+    'classic': {},
+    'compact': {'margin': 48, 'name_size': 14, 'contact_size': 9, 'section_size': 11,
+                'bullet_size': 9, 'bullet_indent': 14, 'title_gap': 0.05 * inch, 'section_gap': 0.1 * inch},
+    'large': {'margin': 72, 'name_size': 20, 'contact_size': 11, 'section_size': 14,
+              'bullet_size': 11, 'bullet_indent': 22, 'section_gap': 0.25 * inch}
+}
+
+
+def build_templates(font_name: Optional[str] = None,
+                    bold_font_name: Optional[str] = None) -> Dict[str, ResumeTemplate]:
+    """Build every named variant, in the given fonts or ReportLab's Helvetica"""
+    return {name: ResumeTemplate(name, font_name=font_name, bold_font_name=bold_font_name, **options)
+            for name, options in TEMPLATE_OPTIONS.items()}
+
+
+TEMPLATES = build_templates()
+
+
+def use_fonts(font_name: Optional[str], bold_font_name: Optional[str] = None) -> None:
+    """Rebuild the templates in registered fonts, e.g. those from register_fonts.
+
+    Call at startup, before request threads render. A name ReportLab doesn't
+    know is reported and left at the default.
+    """
+    registered = set(pdfmetrics.getRegisteredFontNames())
+    fonts = []
+    for font in (font_name, bold_font_name):
+        if font and font not in registered:
+            print(f"Error using font {font}: not registered")
+            font = None
+        fonts.append(font)
+    TEMPLATES.update(build_templates(*fonts))
+
+
+def get_template(name: str = 'classic') -> ResumeTemplate:
+    """Return a named template, raising KeyError for unknown names"""
+    return TEMPLATES[name]
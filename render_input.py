@@ -0,0 +1,149 @@
+"""Turns /generate-pdf input into the fields ResumeTemplate renders.
+
+Input is either the editor's preview HTML or a parsed resume in the
+structure ResumeParser.parse returns. Both produce a name, a contact line
+and a list of sections. All text comes out escaped for ReportLab's
+Paragraph markup.
+"""
+from html import escape
+from html.parser import HTMLParser
+from typing import Dict, List, Any, Optional, Tuple
+
+from resume_model import validate_resume
+
+
+class ResumeHTMLParser(HTMLParser):
+    """Collects the name, contact line and sections of editor HTML in one pass.
+
+    The name is the text of the first <h1>, the contact line the text of the
+    first <div class="contact-info">, and each <h2> starts a section that
+    collects the text of the <li> items that follow it.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.name: Optional[str] = None
+        self.contact_info: Optional[str] = None
+        self.sections: List[Dict[str, Any]] = []
+        self._buffer: Optional[List[str]] = None
+        self._capturing: Optional[str] = None  # Tag whose text is being collected
+        self._div_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if self._capturing == 'div' and tag == 'div':
+            self._div_depth += 1
+            return
+        if self._capturing == 'li' and tag in ('li', 'h2'):
+            # </li> is optional in HTML, a new item or section closes the open one
+            self._finish()
+        if self._capturing is not None:
+            return
+
+        if tag == 'h1' and self.name is None:
+            self._start('h1')
+        elif tag == 'h2':
+            self._start('h2')
+        elif tag == 'li' and self.sections:
+            self._start('li')
+        elif tag == 'div' and self.contact_info is None:
+            classes = (dict(attrs).get('class') or '').split()
+            if 'contact-info' in classes:
+                self._div_depth = 1
+                self._start('div')
+
+    def handle_endtag(self, tag):
+        if self._capturing == 'li' and tag in ('ul', 'ol'):
+            self._finish()
+            return
+        if tag != self._capturing:
+            return
+        if tag == 'div':
+            self._div_depth -= 1
+            if self._div_depth > 0:
+                return
+        self._finish()
+
+    def handle_data(self, data):
+        if self._buffer is not None:
+            self._buffer.append(data)
+
+    def close(self):
+        super().close()
+        if self._capturing == 'li':
+            self._finish()
+
+    def _start(self, tag):
+        self._capturing = tag
+        self._buffer = []
+
+    def _finish(self):
+        tag = self._capturing
+        text = escape(''.join(self._buffer).strip(), quote=False)
+        self._buffer = None
+        self._capturing = None
+
+        if tag == 'h1':
+            self.name = text
+        elif tag == 'div':
+            self.contact_info = text
+        elif tag == 'h2':
+            self.sections.append({'title': text, 'bullet_points': []})
+        elif tag == 'li' and text:
+            self.sections[-1]['bullet_points'].append(text)
+
+
+def extract_from_html(html_content: str) -> Tuple[str, str, List[Dict[str, Any]]]:
+    """Return (name, contact_info, sections) from the editor's preview HTML"""
+    parser = ResumeHTMLParser()
+    parser.feed(html_content)
+    parser.close()
+    name = parser.name if parser.name is not None else "Resume"
+    return name, parser.contact_info or "", parser.sections
+
+
+def _text(value: Any) -> str:
+    # Client-supplied fields may be numbers or other JSON values, not just strings
+    return escape(str(value), quote=False)
+
+
+def _join(*parts) -> str:
+    return ' | '.join(_text(part) for part in parts if part)
+
+
+def extract_from_resume(resume: Dict[str, Any]) -> Tuple[str, str, List[Dict[str, Any]]]:
+    """Return (name, contact_info, sections) from a ResumeParser.parse structure.
+
+    Raises ValueError when the structure isn't made of the expected objects and lists.
+    """
+    validate_resume(resume)
+    personal = resume.get("personal_info") or {}
+    contact = personal.get("contact") or {}
+    name = _text(personal.get("name") or "Resume")
+    contact_info = _join(contact.get("email"), contact.get("phone"), contact.get("location"),
+                         contact.get("linkedin"), contact.get("github"))
+
+    sections = []
+    for section in resume.get("sections") or []:
+        entries = []
+        for entry in section.get("entries") or []:
+            duration = entry.get("duration")
+            # The LLM returns start/end, ResumeParser a single string
+            if isinstance(duration, dict):
+                duration = ' - '.join(str(part) for part in (duration.get("start"), duration.get("end")) if part)
+
+            rendered = {
+                'heading': _join(entry.get("company"), entry.get("position")),
+                'details': _join(entry.get("location"), duration),
+                'bullet_points': [_text(point) for point in entry.get("points") or []
+                                  if point is not None and str(point).strip()]
+            }
+            if rendered['heading'] or rendered['details'] or rendered['bullet_points']:
+                entries.append(rendered)
+
+        sections.append({
+            'title': _text(section.get("title") or ""),
+            'entries': entries,
+            'bullet_points': []
+        })
+
+    return name, contact_info, sections
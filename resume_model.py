@@ -0,0 +1,163 @@
+"""Compact in-memory form of a parsed resume.
+
+ResumeParser output is a tree of dicts repeating the same keys in every
+entry. Holding many resumes (for matching, or in the resume store) as
+slotted dataclasses instead keeps one small fixed-size object per entry.
+Section titles are interned, and so are short strings loaded by from_dict,
+so thousands of "EXPERIENCE" headers or "Python" skills share one string. to_dict/to_json produce exactly the dict form the API returns;
+from_dict/from_json accept it back, including Claude's output, whose extra
+fields (a summary, start/end durations, hybrid confidence and source) are
+kept.
+"""
+import json
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Union
+
+CONTACT_FIELDS = ("email", "phone", "location", "linkedin", "github")
+# Strings up to this long recur across resumes (companies, locations, dates,
+# single skills) and are interned when loaded; bullet points are not
+INTERN_MAX_LENGTH = 40
+
+
+def _intern(value: Any) -> Any:
+    if isinstance(value, str) and len(value) <= INTERN_MAX_LENGTH:
+        return sys.intern(value)
+    return value
+
+
+def _check_object(value: Any, field: str) -> Dict[str, Any]:
+    if value is None:
+        return {}
+    if not isinstance(value, dict):
+        raise ValueError(f"{field} must be an object")
+    return value
+
+
+def _check_list(value: Any, field: str) -> List[Any]:
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        raise ValueError(f"{field} must be a list")
+    return value
+
+
+def validate_resume(data: Any) -> None:
+    """Raise ValueError unless data has objects and lists where to_dict puts them.
+
+    Client-supplied resumes are checked with this before anything walks
+    them; missing parts and the types of text fields are left to the reader.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("resume must be an object")
+    personal = _check_object(data.get("personal_info"), "personal_info")
+    _check_object(personal.get("contact"), "personal_info.contact")
+    for section in _check_list(data.get("sections"), "sections"):
+        for entry in _check_list(_check_object(section, "section").get("entries"), "entries"):
+            _check_list(_check_object(entry, "entry").get("points"), "points")
+
+
+@dataclass(slots=True)
+class Contact:
+    email: str = ""
+    phone: str = ""
+    location: str = ""
+    linkedin: str = ""
+    github: str = ""
+
+    def to_dict(self) -> Dict[str, str]:
+        return {
+            "email": self.email,
+            "phone": self.phone,
+            "location": self.location,
+            "linkedin": self.linkedin,
+            "github": self.github
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Contact':
+        return cls(*(data.get(name) or "" for name in CONTACT_FIELDS))
+
+
+@dataclass(slots=True)
+class Entry:
+    company: str = ""
+    position: str = ""
+    location: str = ""
+    duration: Union[str, Dict[str, str]] = ""  # Claude returns {"start": ..., "end": ...}
+    points: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "company": self.company,
+            "position": self.position,
+            "location": self.location,
+            "duration": self.duration,
+            "points": list(self.points)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Entry':
+        return cls(_intern(data.get("company") or ""),
+                   _intern(data.get("position") or ""),
+                   _intern(data.get("location") or ""),
+                   _intern(data.get("duration") or ""),
+                   [_intern(point) for point in data.get("points") or []])
+
+
+@dataclass(slots=True)
+class Section:
+    title: str
+    entries: List[Entry] = field(default_factory=list)
+    confidence: Optional[float] = None  # Set by HybridResumeParser
+    source: Optional[str] = None  # 'parser' or 'llm' after hybrid refinement
+
+    def __post_init__(self):
+        self.title = sys.intern(self.title)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"title": self.title, "entries": [entry.to_dict() for entry in self.entries]}
+        if self.confidence is not None:
+            data["confidence"] = self.confidence
+        if self.source is not None:
+            data["source"] = self.source
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Section':
+        return cls(data.get("title") or "",
+                   [Entry.from_dict(entry) for entry in data.get("entries") or []],
+                   data.get("confidence"),
+                   data.get("source"))
+
+
+@dataclass(slots=True)
+class Resume:
+    name: str = ""
+    contact: Contact = field(default_factory=Contact)
+    sections: List[Section] = field(default_factory=list)
+    summary: Optional[str] = None  # Only Claude's output has one
+
+    def to_dict(self) -> Dict[str, Any]:
+        personal_info = {"name": self.name, "contact": self.contact.to_dict()}
+        if self.summary is not None:
+            personal_info["summary"] = self.summary
+        return {
+            "personal_info": personal_info,
+            "sections": [section.to_dict() for section in self.sections]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Resume':
+        personal = data.get("personal_info") or {}
+        return cls(personal.get("name") or "",
+                   Contact.from_dict(personal.get("contact") or {}),
+                   [Section.from_dict(section) for section in data.get("sections") or []],
+                   personal.get("summary"))
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, text: Union[str, bytes]) -> 'Resume':
+        return cls.from_dict(json.loads(text))
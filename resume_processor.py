@@ -1,30 +1,27 @@
-from typing import Dict, Any
+from typing import Dict, List, Any, AsyncIterator, Optional, Tuple, Union
+import asyncio
 import json
 import os
+import threading
+import anthropic
 from dotenv import load_dotenv
-from langchain_anthropic import ChatAnthropic
 from langchain.prompts import ChatPromptTemplate
+from langchain_core.exceptions import OutputParserException
 from langchain_core.output_parsers import JsonOutputParser
 from langchain.schema import StrOutputParser
+from langchain_core.runnables import RunnableLambda
+from config import Config
+from llm_cache import LLMCache, llm_cache_key
+from llm_client import get_chat_model
+from rate_limit import TokenBucket, backoff_delay
+from text_budget import (TokenUsage, UsageCallback, clean_resume_text, fit_to_budget, chunk_by_section,
+                         estimate_tokens, output_token_budget, merge_chunk_results)
 
 load_dotenv()
 
-class ResumeProcessor:
-    def __init__(self):
-        # Initialize Claude through LangChain
-        self.llm = ChatAnthropic(
-            model="claude-3-opus-20240229",
-            anthropic_api_key=os.getenv('CLAUDE_API_KEY'),
-            max_tokens=4000,
-            temperature=0.1
-        )
-        
-        # Create output parser for JSON
-        self.parser = JsonOutputParser()
-        
-        # Define the prompt template
-        self.prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are a resume parsing expert. Analyze the resume and return a JSON with this structure:
+# Prompt template, built once and shared by every ResumeProcessor
+RESUME_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are a resume parsing expert. Analyze the resume and return a JSON with this structure:
             {{
                 "personal_info": {{
                     "name": "",
@@ -55,24 +52,236 @@ class ResumeProcessor:
                 ]
             }}
             Return only valid JSON, no additional text."""),
-            ("user", "{text}")
-        ])
+    ("user", "{text}")
+])
+
+# Tokens the system prompt adds to every call
+PROMPT_TOKENS = estimate_tokens(RESUME_PROMPT.format(text=''))
+
+# One bucket per process, so every ResumeProcessor and batch stays under the provider's rate limit together
+RATE_LIMITER = TokenBucket(Config.LLM_REQUESTS_PER_MINUTE / 60)
+
+# The configured response cache, built on first use and shared by every ResumeProcessor
+_cache: Optional[LLMCache] = None
+_cache_lock = threading.Lock()
+
+def get_llm_cache() -> LLMCache:
+    """Return the process-wide LLM response cache, so coalescing and counters span all processors"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache(os.path.join(os.path.dirname(os.path.abspath(__file__)), Config.LLM_CACHE_DB_PATH),
+                              ttl=Config.LLM_CACHE_TTL,
+                              max_entries=Config.LLM_CACHE_SIZE)
+        return _cache
+
+# Bump whenever the prompt above changes so cached responses from the old prompt are not reused
+PROMPT_VERSION = '1'
+
+def is_retryable(error: Exception) -> bool:
+    """Whether a failed Claude call is worth retrying (rate limits, overload, network)"""
+    if isinstance(error, (anthropic.APIConnectionError, asyncio.TimeoutError)):
+        return True
+    if isinstance(error, anthropic.APIStatusError):
+        return error.status_code in (408, 409, 429) or error.status_code >= 500
+    return False
+
+class ResumeProcessor:
+    def __init__(self, llm=None, cache: Union[LLMCache, bool, None] = None,
+                 rate_limiter: Optional[TokenBucket] = None):
+        # Use the process-wide Claude client and its connection pool, unless another
+        # chat model (e.g. llm_stub.StubChatModel for offline runs) is passed in
+        self.llm = llm or get_chat_model()
+        self.model_name = getattr(self.llm, 'model', None) or self.llm._llm_type
+        
+        # Responses are cached by normalized text, model and prompt version;
+        # cache=None uses the configured cache and cache=False disables it
+        if cache is None and Config.LLM_CACHE_ENABLED:
+            cache = get_llm_cache()
+        self.cache = cache or None
+        
+        # The process-wide limiter unless another one is passed in
+        self.rate_limiter = rate_limiter or RATE_LIMITER
+        
+        # Create output parser for JSON
+        self.parser = JsonOutputParser()
         
         # Create the chain
+        self.prompt = RESUME_PROMPT
         self.chain = self.prompt | self.llm | self.parser
+        # Chains limited to a smaller max_tokens, by limit
+        self._chains = {}
+        
+        # Input/output tokens of every call
+        self.usage = TokenUsage()
 
-    async def process_resume(self, text: str) -> Dict[str, Any]:
+    async def process_resume(self, text: str, rate_limiter: Optional[TokenBucket] = None) -> Dict[str, Any]:
         """Process resume text using LangChain"""
         try:
-            # Process the resume
-            result = await self.chain.ainvoke({"text": text})
-            return result
+            # Strip page artifacts and repeated lines, then fit the input token budget
+            text = clean_resume_text(text)
+            if Config.LLM_BUDGET_STRATEGY == 'chunk':
+                chunks = chunk_by_section(text, Config.LLM_INPUT_TOKEN_BUDGET)
+                results = await asyncio.gather(*(self._structure(chunk, rate_limiter=rate_limiter)
+                                                 for chunk in chunks))
+                return results[0] if len(results) == 1 else merge_chunk_results(results)
+            
+            text, trimmed = fit_to_budget(text, Config.LLM_INPUT_TOKEN_BUDGET)
+            return await self._structure(text, trimmed, rate_limiter)
             
         except Exception as e:
             print(f"Error processing resume: {str(e)}")
             raise
 
-    def format_for_display(self, structured_data: Dict[str, Any]) -> str:
+    async def _structure(self, text: str, trimmed: int = 0,
+                         rate_limiter: Optional[TokenBucket] = None) -> Dict[str, Any]:
+        """Structure prepared text with one Claude call"""
+        if self.cache is None:
+            return await self._invoke(text, trimmed, rate_limiter)
+        
+        # Identical resumes are answered from the cache, and concurrent
+        # requests for the same resume share a single Claude call
+        key = llm_cache_key(text, self.model_name, PROMPT_VERSION)
+        return await self.cache.get_or_compute(key, lambda: self._invoke(text, trimmed, rate_limiter))
+
+    async def _invoke(self, text: str, trimmed: int = 0,
+                      rate_limiter: Optional[TokenBucket] = None) -> Dict[str, Any]:
+        rate_limiter = rate_limiter or self.rate_limiter
+        max_tokens = self._output_budget(text)
+        while True:
+            # Every call goes through the limiter, so chunks and retries count against the rate too
+            await rate_limiter.acquire()
+            callback = UsageCallback()
+            try:
+                result = await self._chain_for(max_tokens).ainvoke({"text": text}, config={'callbacks': [callback]})
+            except OutputParserException:
+                if callback.stop_reason != 'max_tokens':
+                    raise
+                result = None
+            self._record_usage(callback, text, result, max_tokens, trimmed)
+            if callback.stop_reason != 'max_tokens':
+                return result
+            # The JSON was cut off (JsonOutputParser would quietly close it), so ask again with more room
+            if max_tokens >= Config.CLAUDE_MAX_TOKENS:
+                raise ValueError(f"Claude's response was cut off at {max_tokens} tokens")
+            max_tokens = min(Config.CLAUDE_MAX_TOKENS, max_tokens * 2)
+
+    def _output_budget(self, text: str) -> int:
+        budget = output_token_budget(estimate_tokens(text), Config.LLM_OUTPUT_RATIO,
+                                     Config.LLM_OUTPUT_OVERHEAD, Config.CLAUDE_MAX_TOKENS)
+        # Rounded up so only a handful of differently limited chains are ever built
+        return min(Config.CLAUDE_MAX_TOKENS, -(-budget // 256) * 256)
+
+    def _chain_for(self, max_tokens: int):
+        """The chain with the LLM limited to max_tokens output tokens"""
+        if getattr(self.llm, 'max_tokens', None) in (None, max_tokens):
+            return self.chain
+        chain = self._chains.get(max_tokens)
+        if chain is None:
+            # copy() shares the client, and with it the connection pool, but leaves out
+            # fields marked exclude (callbacks, tags, ...), so they are passed on explicitly
+            excluded = {name: getattr(self.llm, name) for name in self.llm.__exclude_fields__ or {}}
+            llm = self.llm.copy(update={**excluded, 'max_tokens': max_tokens})
+            chain = self._chains[max_tokens] = self.prompt | llm | self.parser
+        return chain
+
+    def _record_usage(self, callback: UsageCallback, text: str, result: Any, max_tokens: int, trimmed: int) -> None:
+        if callback.usage is not None:
+            self.usage.record(*callback.usage, max_tokens=max_tokens, trimmed_tokens=trimmed)
+        else:
+            # Streaming and stub models don't report usage, so estimate it
+            self.usage.record(PROMPT_TOKENS + estimate_tokens(text), estimate_tokens(json.dumps(result)),
+                              max_tokens=max_tokens, estimated=True, trimmed_tokens=trimmed)
+
+    async def stream_resume(self, text: str) -> AsyncIterator[Tuple[str, Any]]:
+        """Yield parts of the structured resume as soon as Claude has finished each one.
+
+        Yields ('personal_info', {...}) and one ('section', {...}) per section
+        while the completion streams in, then ('done', full result).
+        """
+        # A stream is a single call, so over-budget resumes are always trimmed
+        text, trimmed = fit_to_budget(clean_resume_text(text), Config.LLM_INPUT_TOKEN_BUDGET)
+        key = llm_cache_key(text, self.model_name, PROMPT_VERSION) if self.cache is not None else None
+        # SQLite calls run in the executor, not on the event loop
+        result = await asyncio.to_thread(self.cache.get, key) if key is not None else None
+        if result is not None:
+            yield 'personal_info', result.get("personal_info") or {}
+            for section in result.get("sections") or []:
+                yield 'section', section
+            yield 'done', result
+            return
+        
+        sent_personal_info = False
+        sent_sections = 0
+        # The stream doesn't report why it stopped, so a cut-off response couldn't be retried; allow the full limit
+        max_tokens = Config.CLAUDE_MAX_TOKENS
+        await self.rate_limiter.acquire()
+        callback = UsageCallback()
+        # JsonOutputParser yields the whole object parsed so far on every chunk
+        async for partial in self._chain_for(max_tokens).astream({"text": text}, config={'callbacks': [callback]}):
+            if not isinstance(partial, dict):
+                continue
+            result = partial
+            sections = partial.get("sections")
+            # personal_info is complete once the model has moved on to "sections"
+            if not sent_personal_info and sections is not None and "personal_info" in partial:
+                yield 'personal_info', partial["personal_info"]
+                sent_personal_info = True
+            # and a section is complete once the next one has started
+            while sections and sent_sections < len(sections) - 1:
+                yield 'section', sections[sent_sections]
+                sent_sections += 1
+        
+        if result is None:
+            raise ValueError("Claude returned no JSON")
+        if not sent_personal_info:
+            yield 'personal_info', result.get("personal_info") or {}
+        for section in (result.get("sections") or [])[sent_sections:]:
+            yield 'section', section
+        self._record_usage(callback, text, result, max_tokens, trimmed)
+        if key is not None:
+            await asyncio.to_thread(self.cache.set, key, result)
+        yield 'done', result
+
+    async def process_batch(self, texts: List[str], max_concurrency: Optional[int] = None,
+                            rate_limiter: Optional[TokenBucket] = None,
+                            max_retries: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Process many resume texts concurrently without failing the whole batch.
+
+        Returns one record per text in input order, with 'index', 'status'
+        ('success' or 'error'), 'attempts' and either 'data' or 'error'.
+        """
+        max_concurrency = max_concurrency or Config.LLM_BATCH_CONCURRENCY
+        max_retries = Config.LLM_MAX_RETRIES if max_retries is None else max_retries
+        rate_limiter = rate_limiter or self.rate_limiter
+        
+        async def process_one(item):
+            index, text = item
+            attempt = 0
+            while True:
+                try:
+                    data = await self.process_resume(text, rate_limiter)
+                    return {'index': index, 'status': 'success', 'data': data, 'attempts': attempt + 1}
+                except Exception as e:
+                    if attempt >= max_retries or not is_retryable(e):
+                        return {'index': index, 'status': 'error', 'error': str(e), 'attempts': attempt + 1}
+                await asyncio.sleep(backoff_delay(attempt, Config.LLM_RETRY_BASE_DELAY, Config.LLM_RETRY_MAX_DELAY))
+                attempt += 1
+        
+        # abatch caps how many items run at once with max_concurrency
+        results = await RunnableLambda(process_one).abatch(
+            list(enumerate(texts)),
+            config={'max_concurrency': max_concurrency},
+            return_exceptions=True
+        )
+        return [
+            result if not isinstance(result, BaseException)
+            else {'index': index, 'status': 'error', 'error': str(result), 'attempts': 1}
+            for index, result in enumerate(results)
+        ]
+
+    @staticmethod
+    def format_for_display(structured_data: Dict[str, Any]) -> str:
         """Convert structured data to HTML for display"""
         html = []
         
@@ -119,7 +328,11 @@ class ResumeProcessor:
                 # Duration
                 if "duration" in entry:
                     duration = entry["duration"]
-                    duration_text = f'{duration["start"]} - {duration["end"]}'
+                    # The LLM returns start/end, ResumeParser a single string
+                    if isinstance(duration, dict):
+                        duration_text = f'{duration["start"]} - {duration["end"]}'
+                    else:
+                        duration_text = duration
                     html.append(f'<p class="duration">{duration_text}</p>')
                 
                 # Points
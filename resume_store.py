@@ -0,0 +1,253 @@
+"""Persistent store of parsed resumes.
+
+Every parse result (ResumeParser, hybrid or Claude-structured) is saved in
+SQLite keyed by the PDF's content hash and the source that produced it,
+alongside the name and contact fields pulled out into indexed columns.
+Re-scoring, re-rendering and rebuilding the matching indexes read resumes
+back from here instead of parsing the PDF again. The database runs in WAL
+mode so request threads and gunicorn workers read while one of them writes.
+"""
+import json
+import re
+import time
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Set, Tuple
+
+from sqlite_db import LocalConnections
+
+from resume_model import Resume
+
+# Sources a stored resume can come from
+PARSER = 'parser'
+HYBRID = 'hybrid'
+LLM = 'llm'
+
+# Rows per executemany in save_many, bounding the memory of one statement
+BULK_CHUNK_SIZE = 500
+
+NON_DIGIT_RE = re.compile(r'\D')
+
+METADATA_COLUMNS = "content_hash, source, filename, name, email, phone, location, uploaded, updated"
+
+
+def phone_digits(phone: str) -> str:
+    """Digits of a phone number, so "(555) 123-4567" and "555.123.4567" compare equal"""
+    return NON_DIGIT_RE.sub('', phone or '')
+
+
+def _contact_fields(data: Dict[str, Any]) -> Tuple[str, str, str, str]:
+    personal = data.get("personal_info") or {}
+    contact = personal.get("contact") or {}
+    return (personal.get("name") or "",
+            (contact.get("email") or "").lower(),
+            phone_digits(contact.get("phone")),
+            contact.get("location") or "")
+
+
+class ResumeStore:
+    """SQLite table of parsed resumes with indexed contact fields"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._db = LocalConnections(db_path)
+
+        conn = self._db.get()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS resumes (
+                    content_hash TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    filename TEXT,
+                    name TEXT COLLATE NOCASE,
+                    email TEXT,
+                    phone TEXT,
+                    location TEXT,
+                    uploaded REAL NOT NULL,
+                    updated REAL NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (content_hash, source)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_resumes_uploaded ON resumes (uploaded)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_resumes_email ON resumes (email)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_resumes_phone ON resumes (phone)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_resumes_name ON resumes (name)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_resumes_updated ON resumes (updated)")
+
+    def _row(self, content_hash: str, data: Dict[str, Any], source: str, filename: Optional[str],
+             uploaded: float) -> Tuple:
+        return (content_hash, source, filename, *_contact_fields(data), uploaded, uploaded,
+                json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+
+    _UPSERT = """
+        INSERT INTO resumes (content_hash, source, filename, name, email, phone, location, uploaded, updated, data)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (content_hash, source) DO UPDATE SET
+            filename = COALESCE(excluded.filename, filename),
+            name = excluded.name, email = excluded.email, phone = excluded.phone,
+            location = excluded.location, updated = excluded.updated, data = excluded.data
+    """
+
+    def save(self, content_hash: str, data: Dict[str, Any], source: str = PARSER,
+             filename: Optional[str] = None, uploaded: Optional[float] = None) -> None:
+        """Store a parse result, replacing an earlier one from the same source but keeping its upload time"""
+        row = self._row(content_hash, data, source, filename, time.time() if uploaded is None else uploaded)
+        conn = self._db.get()
+        with conn:
+            conn.execute(self._UPSERT, row)
+
+    def save_many(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Store many parse results in one transaction and return how many were written.
+
+        Each record has 'content_hash' and 'data', and optionally 'source',
+        'filename' and 'uploaded', as for save.
+        """
+        now = time.time()
+        rows = (self._row(record['content_hash'], record['data'], record.get('source', PARSER),
+                          record.get('filename'), record.get('uploaded') or now)
+                for record in records)
+        count = 0
+        conn = self._db.get()
+        with conn:
+            while True:
+                chunk = [row for _, row in zip(range(BULK_CHUNK_SIZE), rows)]
+                if not chunk:
+                    break
+                conn.executemany(self._UPSERT, chunk)
+                count += len(chunk)
+        return count
+
+    def get(self, content_hash: str, source: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Return the stored record for a content hash, the most recently saved source by default"""
+        query = f"SELECT {METADATA_COLUMNS}, data FROM resumes WHERE content_hash = ?"
+        params: List[Any] = [content_hash]
+        if source is not None:
+            query += " AND source = ?"
+            params.append(source)
+        row = self._db.get().execute(query + " ORDER BY updated DESC LIMIT 1", params).fetchone()
+        if row is None:
+            return None
+        record = self._record(row)
+        record['data'] = json.loads(row[-1])
+        return record
+
+    def load(self, content_hash: str, source: Optional[str] = None) -> Optional[Resume]:
+        """Return a stored resume as a Resume model"""
+        row = self._db.get().execute(
+            "SELECT data FROM resumes WHERE content_hash = ?" + (" AND source = ?" if source else "")
+            + " ORDER BY updated DESC LIMIT 1",
+            (content_hash, source) if source else (content_hash,)
+        ).fetchone()
+        return Resume.from_json(row[0]) if row else None
+
+    def find(self, name: Optional[str] = None, email: Optional[str] = None, phone: Optional[str] = None,
+             source: Optional[str] = None, uploaded_after: Optional[float] = None,
+             uploaded_before: Optional[float] = None, limit: int = 100, offset: int = 0) -> List[Dict[str, Any]]:
+        """Return metadata of stored resumes matching every given filter, newest upload first.
+
+        name matches case-insensitively as a prefix; email and phone match
+        exactly, ignoring case and phone formatting.
+        """
+        clauses = []
+        params: List[Any] = []
+        if name:
+            # Escape LIKE wildcards so a name is matched literally
+            clauses.append("name LIKE ? ESCAPE '\\'")
+            params.append(re.sub(r'([%_\\])', r'\\\1', name) + '%')
+        if email:
+            clauses.append("email = ?")
+            params.append(email.lower())
+        if phone:
+            clauses.append("phone = ?")
+            params.append(phone_digits(phone))
+        if source:
+            clauses.append("source = ?")
+            params.append(source)
+        if uploaded_after is not None:
+            clauses.append("uploaded >= ?")
+            params.append(uploaded_after)
+        if uploaded_before is not None:
+            clauses.append("uploaded < ?")
+            params.append(uploaded_before)
+
+        query = f"SELECT {METADATA_COLUMNS} FROM resumes"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY uploaded DESC LIMIT ? OFFSET ?"
+        rows = self._db.get().execute(query, params + [limit, offset]).fetchall()
+        return [self._record(row) for row in rows]
+
+    def iter_resumes(self, source: Optional[str] = None,
+                     batch_size: int = 1000) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (content_hash, data) for every stored resume, for rebuilding indexes"""
+        last = ('', '')
+        conn = self._db.get()
+        while True:
+            # Keyset pagination on the primary key so no read transaction stays open between batches
+            rows = conn.execute(
+                "SELECT content_hash, source, data FROM resumes WHERE (content_hash, source) > (?, ?)"
+                + (" AND source = ?" if source else "") + " ORDER BY content_hash, source LIMIT ?",
+                (*last, source, batch_size) if source else (*last, batch_size)
+            ).fetchall()
+            if not rows:
+                return
+            for content_hash, _, data in rows:
+                yield content_hash, json.loads(data)
+            last = rows[-1][:2]
+
+    def existing(self, content_hashes: List[str]) -> Set[str]:
+        """Return which of the content hashes have a stored result"""
+        if not content_hashes:
+            return set()
+        rows = self._db.get().execute(
+            f"SELECT DISTINCT content_hash FROM resumes WHERE content_hash IN ({','.join('?' * len(content_hashes))})",
+            content_hashes
+        ).fetchall()
+        return {row[0] for row in rows}
+
+    def delete(self, content_hash: str) -> int:
+        """Remove every stored result for a content hash"""
+        conn = self._db.get()
+        with conn:
+            cursor = conn.execute("DELETE FROM resumes WHERE content_hash = ?", (content_hash,))
+        return cursor.rowcount
+
+    def purge(self, updated_before: float, limit: int = 500) -> List[str]:
+        """Remove up to limit results last saved before updated_before.
+
+        Returns the content hashes with no stored result left, so callers can
+        drop them from their indexes; a hash re-saved from another source
+        since keeps that newer row.
+        """
+        conn = self._db.get()
+        with conn:
+            hashes = [row[0] for row in conn.execute(
+                "SELECT DISTINCT content_hash FROM resumes WHERE updated < ? LIMIT ?", (updated_before, limit)
+            ).fetchall()]
+            conn.executemany("DELETE FROM resumes WHERE content_hash = ? AND updated < ?",
+                             [(content_hash, updated_before) for content_hash in hashes])
+            kept = {row[0] for row in conn.execute(
+                f"SELECT content_hash FROM resumes WHERE content_hash IN ({','.join('?' * len(hashes))})", hashes
+            ).fetchall()} if hashes else set()
+        return [content_hash for content_hash in hashes if content_hash not in kept]
+
+    def count(self) -> int:
+        return self._db.get().execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return row counts per source for monitoring"""
+        rows = self._db.get().execute("SELECT source, COUNT(*) FROM resumes GROUP BY source").fetchall()
+        return {'resumes': sum(count for _, count in rows), 'by_source': dict(rows)}
+
+    @staticmethod
+    def _record(row) -> Dict[str, Any]:
+        return {
+            'content_hash': row[0],
+            'source': row[1],
+            'filename': row[2],
+            'name': row[3],
+            'email': row[4],
+            'phone': row[5],
+            'location': row[6],
+            'uploaded': row[7],
+            'updated': row[8]
+        }
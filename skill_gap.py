@@ -0,0 +1,187 @@
+"""Skill mentions in resumes and job descriptions, and the gap between them.
+
+SkillMatcher compiles a skill dictionary (data/skills.txt) into an
+Aho-Corasick automaton once, then finds every skill mentioned in a text in
+a single left-to-right pass, whatever the size of the dictionary. Matches
+must fall on word boundaries and overlapping matches keep the longest, so
+"C++" is not also reported as "C". analyze_gap compares the skills of a
+parsed resume with those of a job description and reports missing and
+underrepresented ones with character positions for highlighting.
+"""
+from collections import deque
+from typing import Dict, List, Any, Iterator, Tuple
+
+# Aliases this short are matched case-sensitively: "Go" and "R" are skills, "go" and "r" are not
+CASE_SENSITIVE_MAX_LENGTH = 2
+
+
+def load_skill_dictionary(path: str) -> Dict[str, str]:
+    """Read a skill file into {alias: skill name}, the first name on each line being the skill"""
+    aliases = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.lstrip().startswith('#'):
+                continue
+            names = [name.strip() for name in line.split('|') if name.strip()]
+            for name in names:
+                aliases[name] = names[0]
+    return aliases
+
+
+def _lower(text: str) -> str:
+    # Lowercase without changing character offsets (a few characters such as
+    # 'İ' lowercase to two), so positions found in the result index text
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return ''.join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+
+def _is_word_char(c: str) -> bool:
+    return c.isalnum() or c == '_'
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton over skill names and their aliases"""
+
+    def __init__(self, aliases: Dict[str, str]):
+        # One trie node per prefix: goto transitions, failure link, and the
+        # aliases (as indices into self._patterns) that end at the node
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        self._patterns: List[Tuple[str, str, bool]] = []  # (alias, skill, case sensitive)
+
+        for alias, skill in aliases.items():
+            node = 0
+            for c in _lower(alias):
+                next_node = self._goto[node].get(c)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][c] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                node = next_node
+            self._output[node].append(len(self._patterns))
+            self._patterns.append((alias, skill, len(alias) <= CASE_SENSITIVE_MAX_LENGTH))
+
+        # Breadth-first, so a node's failure link is set before its children need it
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for c, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and c not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(c, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+        self.skills = sorted(set(aliases.values()))
+
+    @classmethod
+    def from_file(cls, path: str) -> 'SkillMatcher':
+        return cls(load_skill_dictionary(path))
+
+    def _scan(self, text: str) -> Iterator[Tuple[int, int, str]]:
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        node = 0
+        for end, c in enumerate(_lower(text), 1):
+            while node and c not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(c, 0)
+            for pattern in output[node]:
+                alias, skill, case_sensitive = self._patterns[pattern]
+                start = end - len(alias)
+                if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(alias[0]):
+                    continue
+                if end < len(text) and _is_word_char(text[end]) and _is_word_char(alias[-1]):
+                    continue
+                if case_sensitive and text[start:end] != alias:
+                    continue
+                yield start, end, skill
+
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        """Return (start, end, skill) for every skill mentioned in text, in order.
+
+        Where matches overlap, the longest one wins.
+        """
+        matches = sorted(self._scan(text), key=lambda match: (match[0], match[0] - match[1]))
+        result = []
+        last_end = 0
+        for start, end, skill in matches:
+            if start >= last_end:
+                result.append((start, end, skill))
+                last_end = end
+        return result
+
+
+def resume_fields(resume: Dict[str, Any]) -> Iterator[Tuple[Dict[str, Any], str]]:
+    """Yield (location, text) for every text field of a parsed resume the editor shows.
+
+    The resume must pass resume_model.validate_resume.
+    """
+    summary = (resume.get("personal_info") or {}).get("summary")
+    if isinstance(summary, str) and summary:
+        yield {'field': 'summary'}, summary
+    for section_index, section in enumerate(resume.get("sections") or []):
+        for entry_index, entry in enumerate(section.get("entries") or []):
+            for field in ('company', 'position'):
+                value = entry.get(field)
+                if isinstance(value, str) and value:
+                    yield {'section': section_index, 'entry': entry_index, 'field': field}, value
+            for point_index, point in enumerate(entry.get("points") or []):
+                if isinstance(point, str) and point:
+                    yield {'section': section_index, 'entry': entry_index,
+                           'field': 'points', 'point': point_index}, point
+
+
+def _group(matches) -> Dict[str, List[Dict[str, Any]]]:
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
+    for mention in matches:
+        grouped.setdefault(mention.pop('skill'), []).append(mention)
+    return grouped
+
+
+def analyze_gap(resume: Dict[str, Any], job_description: str, matcher: SkillMatcher) -> Dict[str, Any]:
+    """Compare the skills a job description asks for with those a parsed resume mentions.
+
+    Job description mentions carry start/end offsets into job_description;
+    resume mentions also carry the section, entry, field (and point index)
+    they were found in. A skill is underrepresented when the posting
+    mentions it more often than the resume does.
+    """
+    job_mentions = _group({'start': start, 'end': end, 'skill': skill}
+                          for start, end, skill in matcher.find(job_description))
+    resume_mentions = _group({**location, 'start': start, 'end': end, 'skill': skill}
+                             for location, text in resume_fields(resume)
+                             for start, end, skill in matcher.find(text))
+
+    missing = []
+    underrepresented = []
+    matched = []
+    # Skills the posting mentions most come first
+    for skill, positions in sorted(job_mentions.items(), key=lambda item: (-len(item[1]), item[1][0]['start'])):
+        found = resume_mentions.get(skill, [])
+        if not found:
+            missing.append({'skill': skill, 'job_count': len(positions), 'positions': positions})
+            continue
+        matched.append(skill)
+        if len(found) < len(positions):
+            underrepresented.append({'skill': skill, 'job_count': len(positions),
+                                     'resume_count': len(found), 'positions': positions})
+
+    return {
+        'coverage': round(100.0 * len(matched) / len(job_mentions), 1) if job_mentions else 0.0,
+        'matched': matched,
+        'missing': missing,
+        'underrepresented': underrepresented,
+        'job_skills': [{'skill': skill, 'count': len(positions), 'positions': positions}
+                       for skill, positions in job_mentions.items()],
+        'resume_skills': [{'skill': skill, 'count': len(locations), 'locations': locations}
+                          for skill, locations in resume_mentions.items()]
+    }
+
@@ -0,0 +1,36 @@
+"""Per-thread connections to a SQLite database shared by workers.
+
+The job store, expiry index, LLM cache and resume store each keep a table
+in a SQLite file that every request thread and gunicorn worker uses.
+sqlite3 connections can't be shared between threads, so each thread opens
+its own on first use. Databases run in WAL mode, where readers don't block
+the writer and synchronous=NORMAL still leaves the file consistent after a
+crash, without an fsync per commit. Writers wait up to busy_timeout for
+another process's transaction instead of failing with "database is locked".
+"""
+import os
+import sqlite3
+import threading
+
+
+class LocalConnections:
+    """Opens and keeps one connection per thread to db_path"""
+
+    def __init__(self, db_path: str, busy_timeout: float = 10.0):
+        self.db_path = db_path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
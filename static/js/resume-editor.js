@@ -90,18 +90,22 @@ document.addEventListener('DOMContentLoaded', function() {
                 headers: {
                     'Content-Type': 'application/json',
                 },
-                body: JSON.stringify({ html: htmlContent })
+                body: JSON.stringify({ html: htmlContent, stream: true })
             });
             
             if (!response.ok) {
                 throw new Error('PDF generation failed');
             }
             
-            const data = await response.json();
+            // The PDF comes back in the response body, so show it from a blob URL
+            const pdfBlob = await response.blob();
             
             // Update PDF viewer with the new PDF
-            if (data.pdf_filename) {
-                generatedPdfUrl = `/pdf/${data.pdf_filename}`;
+            if (pdfBlob.size > 0) {
+                if (generatedPdfUrl) {
+                    URL.revokeObjectURL(generatedPdfUrl);
+                }
+                generatedPdfUrl = URL.createObjectURL(pdfBlob);
                 pdfIframe.src = generatedPdfUrl;
                 
                 // Switch to PDF view
@@ -128,6 +132,11 @@ document.addEventListener('DOMContentLoaded', function() {
         const fileInput = document.querySelector('input[type="file"]');
         formData.append('resume', fileInput.files[0]);
         
+        if (document.getElementById('useAi').checked) {
+            streamResume(formData);
+            return;
+        }
+        
         try {
             const response = await fetch('/upload-resume', {
                 method: 'POST',
@@ -158,6 +167,63 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     });
     
+    // Structure the resume with Claude, filling in the editor as each part arrives
+    async function streamResume(formData) {
+        try {
+            const response = await fetch('/upload-resume/stream', {
+                method: 'POST',
+                body: formData
+            });
+            
+            if (!response.ok) {
+                throw new Error('Upload failed');
+            }
+            
+            sectionsContainer.innerHTML = '';
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+                
+                // Server-Sent Events are separated by a blank line
+                let boundary;
+                while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+                    handleStreamEvent(buffer.slice(0, boundary));
+                    buffer = buffer.slice(boundary + 2);
+                }
+            }
+        } catch (error) {
+            console.error('Error:', error);
+            alert('Error uploading resume: ' + error.message);
+        }
+    }
+    
+    function handleStreamEvent(message) {
+        let event = 'message';
+        let data = '';
+        message.split('\n').forEach(line => {
+            if (line.startsWith('event: ')) event = line.slice(7);
+            else if (line.startsWith('data: ')) data += line.slice(6);
+        });
+        const payload = data ? JSON.parse(data) : {};
+        
+        if (event === 'upload') {
+            currentPdfUrl = `/pdf/${payload.pdf_filename}`;
+        } else if (event === 'personal_info') {
+            setPersonalInfo(payload);
+            updatePreview();
+        } else if (event === 'section') {
+            addParsedSection(payload);
+            updatePreview();
+        } else if (event === 'error') {
+            alert(payload.error);
+        }
+    }
+    
     // Function to add a new section
     function addSection() {
         const sectionId = 'section-' + sectionCounter++;
@@ -257,8 +323,15 @@ document.addEventListener('DOMContentLoaded', function() {
         // Clear existing sections
         sectionsContainer.innerHTML = '';
         
-        // Set personal info
-        const personalInfo = data.personal_info;
+        setPersonalInfo(data.personal_info);
+        data.sections.forEach(addParsedSection);
+        
+        // Update preview
+        updatePreview();
+    }
+    
+    function setPersonalInfo(personalInfo) {
+        personalInfo.contact = personalInfo.contact || {};
         nameField.value = personalInfo.name || '';
         emailField.value = personalInfo.contact.email || '';
         phoneField.value = personalInfo.contact.phone || '';
@@ -271,41 +344,44 @@ document.addEventListener('DOMContentLoaded', function() {
         if (document.getElementById('github')) {
             document.getElementById('github').value = personalInfo.contact.github || '';
         }
+    }
+    
+    function addParsedSection(section) {
+        const sectionElement = addSection();
+        sectionElement.querySelector('.section-title').value = section.title;
+        
+        // Clear default entry
+        sectionElement.querySelector('.entries-container').innerHTML = '';
         
-        // Add sections
-        data.sections.forEach(section => {
-            const sectionElement = addSection();
-            sectionElement.querySelector('.section-title').value = section.title;
+        // Add entries
+        (section.entries || []).forEach(entry => {
+            const entryContainer = sectionElement.querySelector('.entries-container');
+            const entryElement = addEntry(entryContainer);
             
-            // Clear default entry
-            sectionElement.querySelector('.entries-container').innerHTML = '';
+            entryElement.querySelector('.company').value = entry.company || '';
+            entryElement.querySelector('.location').value = entry.location || '';
+            entryElement.querySelector('.duration').value = formatDuration(entry.duration);
+            entryElement.querySelector('.position').value = entry.position || '';
             
-            // Add entries
-            section.entries.forEach(entry => {
-                const entryContainer = sectionElement.querySelector('.entries-container');
-                const entryElement = addEntry(entryContainer);
-                
-                entryElement.querySelector('.company').value = entry.company || '';
-                entryElement.querySelector('.location').value = entry.location || '';
-                entryElement.querySelector('.duration').value = entry.duration || '';
-                entryElement.querySelector('.position').value = entry.position || '';
-                
-                // Clear default point
-                entryElement.querySelector('.points-container').innerHTML = '';
-                
-                // Add points
-                if (entry.points && entry.points.length > 0) {
-                    entry.points.forEach(point => {
-                        const pointContainer = entryElement.querySelector('.points-container');
-                        const pointElement = addPoint(pointContainer);
-                        pointElement.querySelector('textarea').value = point;
-                    });
-                }
-            });
+            // Clear default point
+            entryElement.querySelector('.points-container').innerHTML = '';
+            
+            // Add points
+            if (entry.points && entry.points.length > 0) {
+                entry.points.forEach(point => {
+                    const pointContainer = entryElement.querySelector('.points-container');
+                    const pointElement = addPoint(pointContainer);
+                    pointElement.querySelector('textarea').value = point;
+                });
+            }
         });
-        
-        // Update preview
-        updatePreview();
+    }
+    
+    // The parser returns a duration string, Claude a {start, end} object
+    function formatDuration(duration) {
+        if (!duration) return '';
+        if (typeof duration === 'string') return duration;
+        return [duration.start, duration.end].filter(Boolean).join(' - ');
     }
     
     // Function to update preview
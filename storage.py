@@ -0,0 +1,70 @@
+import os
+import re
+import shutil
+import tempfile
+from typing import Optional, Tuple
+
+# Stored names are the SHA-256 of the file contents plus the extension
+STORED_NAME_RE = re.compile(r'^([0-9a-f]{64})(\.[a-z0-9]+)$')
+
+
+class UploadStore:
+    """Content-addressed file storage with a sharded directory layout.
+
+    A file whose SHA-256 is abcd1234... is stored as ab/cd/abcd1234....pdf
+    under the root, so no directory grows past a few thousand entries and
+    finding a file never needs a directory scan. Identical uploads map to
+    the same path and are stored once, and concurrent uploads that share a
+    client-side file name can no longer overwrite each other.
+    """
+
+    def __init__(self, root: str, extension: str = '.pdf'):
+        self.root = root
+        self.extension = extension
+        os.makedirs(root, exist_ok=True)
+
+    def name_for(self, digest: str) -> str:
+        return f"{digest}{self.extension}"
+
+    def path_for(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:4], self.name_for(digest))
+
+    def save(self, digest: str, source) -> Tuple[str, bool]:
+        """Store bytes or a readable file object under its digest.
+
+        Returns (stored name, created). When the content is already stored
+        nothing is written and its modification time is refreshed instead,
+        so age-based cleanup treats it as a fresh upload.
+        """
+        path = self.path_for(digest)
+        if os.path.exists(path):
+            try:
+                os.utime(path)
+                return self.name_for(digest), False
+            except FileNotFoundError:
+                pass  # Removed by cleanup in the meantime, write it again
+
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        # Write to a temporary file first so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                if isinstance(source, (bytes, bytearray)):
+                    f.write(source)
+                else:
+                    shutil.copyfileobj(source, f)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return self.name_for(digest), True
+
+    def lookup(self, name: str) -> Optional[str]:
+        """Return the path of a stored file name, or None if it isn't stored"""
+        match = STORED_NAME_RE.match(name)
+        if not match or match.group(2) != self.extension:
+            return None
+        path = self.path_for(match.group(1))
+        return path if os.path.isfile(path) else None
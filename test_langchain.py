@@ -1,16 +1,12 @@
-from langchain_anthropic import ChatAnthropic
+from llm_client import get_chat_model
 from dotenv import load_dotenv
-import os
 
 load_dotenv()
 
 def test_langchain_connection():
     try:
-        # Initialize LangChain with Claude
-        llm = ChatAnthropic(
-            model="claude-3-opus-20240229",
-            anthropic_api_key=os.getenv('CLAUDE_API_KEY')
-        )
+        # Use the same shared, Config-driven Claude client as the app
+        llm = get_chat_model()
         
         # Test simple completion
         response = llm.invoke("Hello, what is your name?")
@@ -0,0 +1,58 @@
+import io
+import os
+import random
+import sys
+
+import pytest
+
+# Tests import the top-level modules of the app the same way app.py does
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Module globals of app.py that init_services sets up
+APP_SERVICES = ('upload_store', 'expiry_index', 'reaper', 'parse_cache', 'parse_engine', 'job_store',
+                'resume_store', 'resume_index', 'vector_index', 'skill_matcher')
+
+
+@pytest.fixture
+def app_module(tmp_path, monkeypatch):
+    """app.py with its stores, indexes and uploads under tmp_path"""
+    import app
+    from config import Config
+
+    monkeypatch.setattr(Config, 'PARSE_WORKERS', 1)
+    # Forked workers start fast and don't import the test runner again
+    monkeypatch.setattr(Config, 'PARSE_START_METHOD', 'fork')
+    for name in APP_SERVICES:
+        monkeypatch.setattr(app, name, None)
+    monkeypatch.setitem(app.app.config, 'UPLOAD_FOLDER', app.app.config['UPLOAD_FOLDER'])
+    app.init_services(str(tmp_path))
+    yield app
+    app.parse_engine.shutdown()
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def make_resume():
+    """make_resume(skills) returns a parsed resume whose skills section lists skills"""
+    def make(skills, name="Jane Doe"):
+        return {"personal_info": {"name": name, "contact": {}},
+                "sections": [{"title": "Skills", "entries": [{"points": [skills]}]}]}
+    return make
+
+
+@pytest.fixture
+def make_pdf():
+    """Render a synthetic resume with ReportLab: make_pdf(seed, **sizes) returns (pdf bytes, resume)"""
+    from benchmarks.corpus import generate_resume, render_pdf
+
+    def make(seed=0, **sizes):
+        resume = generate_resume(random.Random(seed), **sizes)
+        buffer = io.BytesIO()
+        render_pdf(resume, buffer)
+        return buffer.getvalue(), resume
+    return make
@@ -0,0 +1,84 @@
+import io
+import json
+import zipfile
+
+import batch_ingest
+import parse_engine
+from config import Config
+from resume_store import ResumeStore
+
+
+def _fake_parse_job(source, raise_errors, mode=parse_engine.PARSE):
+    # Stands in for pdfplumber in the forked workers: a PDF containing "hang" never finishes
+    if b'hang' in source:
+        import time
+        time.sleep(3600)
+    return parse_engine.parse_pdf(source, raise_errors=raise_errors)
+
+
+def _zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def test_cli_parses_folders_and_zips_into_the_store(tmp_path, make_pdf, monkeypatch, capsys):
+    monkeypatch.setattr(Config, 'PARSE_START_METHOD', 'fork')
+    monkeypatch.setattr(parse_engine, '_parse_job', _fake_parse_job)
+    (tmp_path / 'export').mkdir()
+    first, first_resume = make_pdf(1)
+    second, second_resume = make_pdf(2)
+    (tmp_path / 'export' / 'a.pdf').write_bytes(first)
+    (tmp_path / 'export' / 'hung.pdf').write_bytes(b'%PDF-1.4 hang %%EOF')
+    (tmp_path / 'more.zip').write_bytes(_zip({'b.pdf': second, 'notes.txt': b'skip'}))
+    db = tmp_path / 'resumes.db'
+
+    status = batch_ingest.main([str(tmp_path / 'export'), str(tmp_path / 'more.zip'), '--workers', '2',
+                                '--timeout', '1', '--db', str(db)])
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert status == 1
+    assert [(record['file'].rsplit('/', 1)[-1], record['status']) for record in records] == [
+        ('a.pdf', 'success'), ('hung.pdf', 'error'), ('more.zip!b.pdf', 'success')]
+    assert 'ParseTimeout' in records[1]['error']
+    assert records[0]['parsed_data']['personal_info']['name'] == first_resume['personal_info']['name']
+
+    store = ResumeStore(str(db))
+    assert store.count() == 2
+    assert {record['filename'] for record in store.find()} == {'a.pdf', 'more.zip!b.pdf'}
+    assert store.find(name=second_resume['personal_info']['name'])
+
+
+def test_batch_endpoint_streams_results_and_stores_them(app_module, client, make_pdf):
+    first, _ = make_pdf(1)
+    second, second_resume = make_pdf(2)
+    response = client.post('/upload-resumes/batch', data={'resumes': [
+        (io.BytesIO(first), 'a.pdf'),
+        (io.BytesIO(_zip({'b.pdf': second, 'c.pdf': b'not a pdf'})), 'export.zip'),
+        (io.BytesIO(b'hello'), 'notes.txt'),
+    ]})
+    records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    # Rejected files are reported straight away, parses as they finish
+    assert sorted((record['file'], record['status']) for record in records) == [
+        ('a.pdf', 'success'), ('export.zip!b.pdf', 'success'), ('export.zip!c.pdf', 'error'),
+        ('notes.txt', 'error')]
+    records = {record['file']: record for record in records}
+    assert records['export.zip!b.pdf']['parsed_data']['personal_info']['name'] == second_resume['personal_info']['name']
+    assert app_module.resume_store.count() == 2
+    assert len(app_module.resume_index) == 2
+    assert app_module.parse_engine.stats()['pending'] == 0
+
+
+def test_batch_endpoint_accepts_exports_past_the_upload_limit(app_module, client, make_pdf, monkeypatch):
+    pdf, _ = make_pdf(1)
+    monkeypatch.setitem(app_module.app.config, 'MAX_CONTENT_LENGTH', len(pdf) + 1024)
+    export = _zip({f'{i}.pdf': pdf + b'\n%' + str(i).encode() for i in range(3)})
+    assert len(export) > len(pdf) + 1024
+
+    single = client.post('/upload-resume', data={'resume': (io.BytesIO(export), 'resume.pdf')})
+    assert single.status_code == 413
+    batch = client.post('/upload-resumes/batch', data={'resumes': [(io.BytesIO(export), 'export.zip')]})
+    assert [json.loads(line)['status'] for line in batch.get_data(as_text=True).splitlines()] == ['success'] * 3
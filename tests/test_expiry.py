@@ -0,0 +1,50 @@
+import os
+
+from expiry import ExpiryIndex, Reaper
+
+
+def make_reaper(tmp_path, ttl=10):
+    index = ExpiryIndex(str(tmp_path / 'expiry.db'), ttl=ttl)
+    return index, Reaper(index, str(tmp_path / 'cleanup.lock'))
+
+
+def stored_file(tmp_path, index, stored):
+    path = str(tmp_path / 'resume.pdf')
+    with open(path, 'wb') as f:
+        f.write(b'%PDF-1.4')
+    index.add(path, stored=stored)
+    return path
+
+
+def test_expired_file_and_entry_are_removed(tmp_path):
+    index, reaper = make_reaper(tmp_path)
+    path = stored_file(tmp_path, index, stored=0)
+
+    assert reaper.run_once() == 1
+    assert not os.path.exists(path)
+    assert index.count() == 0
+
+
+def test_file_saved_again_after_listing_is_kept(tmp_path):
+    index, reaper = make_reaper(tmp_path)
+    path = stored_file(tmp_path, index, stored=0)
+    [(listed, expires)] = index.due(100, 10)
+    index.add(path)  # Uploaded again before the reaper gets to it
+
+    assert not reaper._reap(listed, expires)
+    assert os.path.exists(path)
+    assert index.count() == 1
+
+
+def test_failed_removal_keeps_the_entry(tmp_path, monkeypatch):
+    index, reaper = make_reaper(tmp_path)
+    path = stored_file(tmp_path, index, stored=0)
+
+    def fail(*args):
+        raise PermissionError("read-only file system")
+    monkeypatch.setattr(os, 'rename', fail)
+
+    assert reaper.run_once() == 0
+    assert reaper.errors == 1
+    assert os.path.exists(path)
+    assert index.count() == 1
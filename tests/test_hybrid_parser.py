@@ -0,0 +1,35 @@
+import asyncio
+
+from hybrid_parser import refine_with_llm
+
+
+class FakeProcessor:
+    def __init__(self, results):
+        self.results = results
+
+    async def process_batch(self, texts):
+        return self.results[:len(texts)]
+
+
+def scored():
+    return {
+        'resume': {'personal_info': {}, 'sections': [{'title': 'Projects', 'entries': []}]},
+        'low_confidence': [{'sections': [0], 'text': 'PROJECTS\nA thing I built'}]
+    }
+
+
+def test_refined_result_is_complete():
+    sections = [{'title': 'Projects', 'entries': [{'company': 'Side project'}]}]
+    resume, complete = asyncio.run(refine_with_llm(
+        scored(), FakeProcessor([{'status': 'success', 'data': {'sections': sections}}])))
+
+    assert complete
+    assert resume['sections'][0]['source'] == 'llm'
+
+
+def test_failed_call_keeps_parser_sections_and_is_incomplete():
+    resume, complete = asyncio.run(refine_with_llm(
+        scored(), FakeProcessor([{'status': 'error', 'error': 'overloaded'}])))
+
+    assert not complete
+    assert resume['sections'] == [{'title': 'Projects', 'entries': [], 'source': 'parser'}]
@@ -0,0 +1,71 @@
+import io
+import time
+
+import pytest
+
+from job_store import MemoryJobStore, SQLiteJobStore, create_job_store, PENDING, COMPLETED, FAILED
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request, tmp_path):
+    return create_job_store(request.param, str(tmp_path / 'jobs.db'), ttl=60)
+
+
+def test_jobs_move_from_pending_to_their_outcome(store):
+    done = store.create(meta={'pdf_filename': 'a.pdf'})
+    broken = store.create()
+
+    job = store.get(done)
+    assert (job['status'], job['result'], job['meta']) == (PENDING, None, {'pdf_filename': 'a.pdf'})
+
+    store.update(done, COMPLETED, result={'skills': ['Python']})
+    store.update(broken, FAILED, error='bad pdf')
+    assert store.get(done)['result'] == {'skills': ['Python']}
+    assert (store.get(broken)['status'], store.get(broken)['error']) == (FAILED, 'bad pdf')
+    assert store.get('missing') is None
+
+
+def test_expired_jobs_are_hidden_and_pruned(store, monkeypatch):
+    job_id = store.create()
+    later = time.time() + 61
+    monkeypatch.setattr(time, 'time', lambda: later)
+
+    assert store.get(job_id) is None
+    store.create()
+    if isinstance(store, MemoryJobStore):
+        assert job_id not in store._jobs
+    else:
+        assert store._db.get().execute("SELECT COUNT(*) FROM jobs WHERE job_id = ?", (job_id,)).fetchone()[0] == 0
+
+
+def test_sqlite_jobs_are_shared_between_store_instances(tmp_path):
+    path = str(tmp_path / 'jobs.db')
+    job_id = SQLiteJobStore(path).create()
+    SQLiteJobStore(path).update(job_id, COMPLETED, result={'ok': True})
+    assert SQLiteJobStore(path).get(job_id)['result'] == {'ok': True}
+
+
+def test_unknown_backend_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        create_job_store('redis', str(tmp_path / 'jobs.db'))
+
+
+def test_async_upload_is_polled_until_completed(client, make_pdf):
+    pdf, resume = make_pdf(5)
+    response = client.post('/upload-resume?async=1', data={'resume': (io.BytesIO(pdf), 'resume.pdf')})
+    assert response.status_code == 202
+    status_url = response.get_json()['status_url']
+
+    deadline = time.time() + 30
+    job = client.get(status_url).get_json()
+    while job['status'] == PENDING and time.time() < deadline:
+        time.sleep(0.05)
+        job = client.get(status_url).get_json()
+
+    assert job['status'] == COMPLETED
+    assert job['parsed_data']['personal_info']['name'] == resume['personal_info']['name']
+    assert job['pdf_filename'].endswith('.pdf')
+
+
+def test_unknown_job_is_404(client):
+    assert client.get('/jobs/nope').status_code == 404
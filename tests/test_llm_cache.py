@@ -0,0 +1,43 @@
+import asyncio
+import threading
+import time
+
+import resume_processor
+from config import Config
+from llm_cache import LLMCache
+from llm_stub import StubChatModel
+from resume_processor import ResumeProcessor
+
+
+def test_concurrent_misses_from_different_loops_share_one_call(tmp_path):
+    cache = LLMCache(str(tmp_path / 'llm.db'))
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.2)
+        return {'sections': []}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(asyncio.run(cache.get_or_compute('key', compute))))
+               for _ in range(3)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.02)
+    for thread in threads:
+        thread.join()
+
+    assert results == [{'sections': []}] * 3
+    assert len(calls) == 1
+    assert cache.coalesced == 2
+
+
+def test_processors_share_the_configured_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'LLM_CACHE_ENABLED', True)
+    monkeypatch.setattr(Config, 'LLM_CACHE_DB_PATH', str(tmp_path / 'llm.db'))
+    monkeypatch.setattr(resume_processor, '_cache', None)
+
+    first = ResumeProcessor(llm=StubChatModel())
+    second = ResumeProcessor(llm=StubChatModel())
+
+    assert first.cache is not None and first.cache is second.cache
@@ -0,0 +1,36 @@
+import asyncio
+import time
+
+import pytest
+
+from config import Config
+from llm_client import PooledChatAnthropic, run_async
+
+
+def test_run_async_cancels_work_past_the_timeout():
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    with pytest.raises(TimeoutError):
+        run_async(slow(), timeout=0.05)
+    deadline = time.monotonic() + 1
+    while not cancelled and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert cancelled
+
+
+def test_chat_model_clients_use_configured_endpoint(monkeypatch):
+    monkeypatch.setattr(Config, 'CLAUDE_API_URL', 'http://claude.internal:8080')
+    llm = PooledChatAnthropic(model='claude-test', anthropic_api_key='key')
+
+    assert str(llm._client.base_url).startswith('http://claude.internal:8080')
+    assert str(llm._async_client.base_url).startswith('http://claude.internal:8080')
+    assert llm._async_client.max_retries == Config.CLAUDE_SDK_MAX_RETRIES
+    # Copies with another max_tokens share the pool
+    assert llm.copy(update={'max_tokens': 5})._async_client is llm._async_client
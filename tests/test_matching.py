@@ -0,0 +1,93 @@
+import pytest
+
+from matching import ResumeIndex, match_score
+from vector_index import VectorIndex
+
+
+@pytest.mark.parametrize('method', ['bm25', 'vector'])
+def test_search_ignores_top_k_below_one(tmp_path, make_resume, method):
+    if method == 'bm25':
+        index = ResumeIndex()
+        add, search = index.add, index.search
+    else:
+        index = VectorIndex(str(tmp_path), dim=64)
+        add, search = index.add_resume, index.search_text
+    add('a', make_resume('Python Django'))
+    add('b', make_resume('Python Flask'))
+
+    assert search('Python', 0) == []
+    assert search('Python', -1) == []
+    assert len(search('Python', 5)) == 2
+
+
+def test_bm25_ranks_resumes_sharing_rarer_terms_first(make_resume):
+    index = ResumeIndex()
+    index.add('django', make_resume('Python Django PostgreSQL'))
+    index.add('flask', make_resume('Python Flask'))
+    index.add('java', make_resume('Java Spring'))
+
+    results = index.search('Python developer with Django and PostgreSQL', 10)
+    assert [result['resume_id'] for result in results] == ['django', 'flask']
+
+    # Adding an id again replaces the earlier resume, removing it drops it from results
+    index.add('java', make_resume('Python Django PostgreSQL Kubernetes'))
+    index.remove('django')
+    assert [result['resume_id'] for result in index.search('Django', 10)] == ['java']
+    assert len(index) == 2
+
+
+def test_match_score_weights_terms_by_idf(make_resume):
+    index = ResumeIndex()
+    for i in range(5):
+        index.add(str(i), make_resume('Python SQL'))
+    index.add('rare', make_resume('Kubernetes'))
+
+    with_rare = match_score(make_resume('Kubernetes'), 'Python Kubernetes', index)
+    with_common = match_score(make_resume('Python'), 'Python Kubernetes', index)
+    assert with_rare['score'] > with_common['score']
+    assert with_common['missing'] == ['kubernetes']
+    assert match_score(make_resume('Go'), '') == {'score': 0.0, 'matched': [], 'missing': []}
+
+
+def test_match_skips_purged_resumes_and_keeps_top_k(app_module, client, make_resume):
+    app_module.record_resume('a' * 64, make_resume('Python Django Flask'))
+    app_module.record_resume('b' * 64, make_resume('Python Django'))
+    app_module.record_resume('c' * 64, make_resume('Python'))
+    # Purged by another worker's reaper, which can't reach this worker's index
+    app_module.resume_store.delete('a' * 64)
+
+    for method in ('bm25', 'vector'):
+        response = client.post('/match', json={'job_description': 'Python Django Flask', 'top_k': 2,
+                                               'method': method})
+        results = response.get_json()['results']
+        assert [result['resume_id'] for result in results] == ['b' * 64, 'c' * 64]
+        # Nothing stored the PDFs of these resumes
+        assert [result['pdf_filename'] for result in results] == [None, None]
+    assert 'a' * 64 not in app_module.resume_index
+    assert 'a' * 64 not in app_module.vector_index
+
+
+@pytest.mark.parametrize('body', [
+    {'job_description': 'Python', 'resume': {'personal_info': 'Jane'}},
+    {'job_description': 'Python', 'resume': {'sections': 'Python'}},
+    {'job_description': 'Python', 'resume': {'sections': [{'entries': ['x']}]}},
+    {'job_description': 'Python', 'resume': 'Jane'},
+    {'job_description': ['Python'], 'resume': {'sections': []}},
+    {'resume': {'sections': []}},
+    ['Python'],
+])
+def test_match_score_rejects_malformed_input(client, body):
+    response = client.post('/match/score', json=body)
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_match_rejects_non_string_job_description(client):
+    assert client.post('/match', json={'job_description': 42}).status_code == 400
+
+
+def test_match_score(client, make_resume):
+    response = client.post('/match/score', json={'job_description': 'Python Django',
+                                                 'resume': make_resume('Python Flask')})
+    assert response.status_code == 200
+    assert response.get_json()['matched'] == ['python']
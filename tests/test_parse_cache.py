@@ -0,0 +1,57 @@
+import os
+import time
+
+from parse_cache import ParseCache, content_hash
+
+RESUME = {"personal_info": {"name": "Jane Doe", "contact": {}}, "sections": []}
+
+
+def test_hit_from_memory_and_from_disk(tmp_path):
+    key = content_hash(b'%PDF-1.4 jane')
+    cache = ParseCache(str(tmp_path), ttl=60, version='1')
+    assert cache.get(key) is None
+    cache.set(key, RESUME)
+    assert cache.get(key) == RESUME
+
+    # Another worker process only shares the disk tier
+    other = ParseCache(str(tmp_path), ttl=60, version='1')
+    assert other.get(key) == RESUME
+    assert other.stats()['disk_hits'] == 1
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+
+def test_expired_entries_are_not_served(tmp_path, monkeypatch):
+    key = content_hash(b'%PDF-1.4 jane')
+    cache = ParseCache(str(tmp_path), ttl=60)
+    cache.set(key, RESUME)
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 61)
+    assert cache.get(key) is None
+    assert ParseCache(str(tmp_path), ttl=60).get(key) is None
+
+
+def test_other_versions_are_not_served(tmp_path):
+    key = content_hash(b'%PDF-1.4 jane')
+    ParseCache(str(tmp_path), version='2-20').set(key, RESUME)
+    assert ParseCache(str(tmp_path), version='3-20').get(key) is None
+    assert ParseCache(str(tmp_path), version='2-5').get(key) is None
+    assert ParseCache(str(tmp_path), version='2-20').get(key) == RESUME
+
+
+def test_sweep_removes_expired_and_other_version_entries(tmp_path):
+    fresh, stale = content_hash(b'fresh'), content_hash(b'stale')
+    ParseCache(str(tmp_path), version='1').set(content_hash(b'old parser'), RESUME)
+    cache = ParseCache(str(tmp_path), ttl=60, version='2')
+    cache.set(fresh, RESUME)
+    cache.set(stale, RESUME)
+    past = time.time() - 120
+    os.utime(cache._disk_path(stale), (past, past))
+    # Other stores share the cache folder
+    (tmp_path / 'resumes.db').write_text('')
+    (tmp_path / 'vectors').mkdir()
+
+    assert cache.sweep() == 2
+    remaining = [name for shard in os.listdir(tmp_path) if len(shard) == 2
+                 for name in os.listdir(tmp_path / shard)]
+    assert remaining == [f"{fresh}-v2.json"]
+    assert (tmp_path / 'resumes.db').exists()
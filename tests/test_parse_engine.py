@@ -0,0 +1,102 @@
+import threading
+import time
+
+import pytest
+
+import parse_engine
+from parse_engine import ParseEngine, ParseTimeout
+
+
+def _fake_parse_job(source, raise_errors, mode=parse_engine.PARSE):
+    # Stands in for pdfplumber in the forked workers: b'hang' never finishes
+    if source == b'hang':
+        time.sleep(3600)
+    if source == b'slow':
+        time.sleep(1)
+    return {'source': source.decode()}
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    # Forked workers inherit the patched job function
+    monkeypatch.setattr(parse_engine, '_parse_job', _fake_parse_job)
+    engine = ParseEngine(processes=2, max_pending=8, timeout=2, max_tasks_per_child=50, start_method='fork')
+    yield engine
+    engine.shutdown()
+
+
+def test_hung_parse_does_not_fail_concurrent_parse(engine):
+    hung = engine.submit(b'hang')
+    results = {}
+
+    def parse_other():
+        time.sleep(0.5)
+        results['other'] = engine.parse(b'ok', timeout=10)
+
+    thread = threading.Thread(target=parse_other)
+    thread.start()
+    with pytest.raises(ParseTimeout):
+        hung.result(timeout=1)
+    thread.join()
+
+    assert results['other'] == {'source': 'ok'}
+    stats = engine.stats()
+    assert stats['timeouts'] == 1
+    assert stats['pending'] == 0
+
+
+def test_worker_is_replaced_after_timeout(engine):
+    with pytest.raises(ParseTimeout):
+        engine.parse(b'hang', timeout=0.5)
+    # Both worker slots keep serving jobs after one process was killed
+    assert [engine.parse(f'{i}'.encode(), timeout=10) for i in range(4)] == [{'source': f'{i}'} for i in range(4)]
+    deadline = time.time() + 5
+    while engine.stats()['killed_workers'] < 1 and time.time() < deadline:
+        time.sleep(0.05)
+    assert engine.stats()['killed_workers'] == 1
+
+
+def test_worker_recycled_after_max_tasks(monkeypatch):
+    monkeypatch.setattr(parse_engine, '_parse_job', _fake_parse_job)
+    engine = ParseEngine(processes=1, max_pending=8, timeout=5, max_tasks_per_child=2, start_method='fork')
+    try:
+        assert [engine.parse(f'{i}'.encode())['source'] for i in range(5)] == ['0', '1', '2', '3', '4']
+        assert engine.stats()['recycled_workers'] == 2
+    finally:
+        engine.shutdown()
+
+
+def test_timeout_while_worker_starts_kills_it(engine, monkeypatch):
+    start_process = parse_engine._Worker._start_process
+
+    def slow_start(worker):
+        # The job is already running but not yet sent when its caller gives up
+        time.sleep(1)
+        start_process(worker)
+
+    monkeypatch.setattr(parse_engine._Worker, '_start_process', slow_start)
+    with pytest.raises(ParseTimeout):
+        engine.parse(b'hang', timeout=0.3)
+    deadline = time.time() + 5
+    while engine.stats()['killed_workers'] < 1 and time.time() < deadline:
+        time.sleep(0.05)
+    assert engine.stats()['killed_workers'] == 1
+
+
+def test_cancel_frees_pending_slots(monkeypatch):
+    monkeypatch.setattr(parse_engine, '_parse_job', _fake_parse_job)
+    engine = ParseEngine(processes=1, max_pending=3, timeout=5, max_tasks_per_child=50, start_method='fork')
+    try:
+        running = engine.submit(b'slow')
+        time.sleep(0.5)
+        queued = [engine.submit(f'{i}'.encode()) for i in range(2)]
+        for job in [running, *queued]:
+            job.cancel()
+            job.cancel()
+        deadline = time.time() + 5
+        while engine.stats()['pending'] and time.time() < deadline:
+            time.sleep(0.05)
+        assert engine.stats()['pending'] == 0
+        assert engine.parse(b'after') == {'source': 'after'}
+    finally:
+        engine.shutdown()
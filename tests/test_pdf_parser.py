@@ -0,0 +1,63 @@
+import io
+
+import pdfplumber
+
+from pdf_parser import ResumeParser, BULLET, HEADER, PAGE_BREAK, extract_text
+
+
+def test_stacked_bullet_markers_are_all_removed():
+    parser = ResumeParser()
+
+    assert parser._classify_line("• - Built the billing service").content == "Built the billing service"
+    assert parser._classify_line("- • 1. Cut build time").content == "Cut build time"
+
+
+def test_bullet_mentioning_a_header_stays_a_bullet():
+    parser = ResumeParser()
+    line = parser._classify_line("• Improved team communication skills")
+
+    assert line.kind == BULLET
+    assert line.is_header
+    assert parser._classify_line("SKILLS").kind == HEADER
+
+    # With no real section, the fallback keeps it among the bullet points, as it always has
+    sections = parser._extract_sections(["Jane Doe", "• Led a small team", "• Improved team communication skills"])
+    assert sections[-1].entries[0].points == ["• Led a small team", "• Improved team communication skills"]
+
+
+def test_sections_parse_stacked_bullets():
+    sections = ResumeParser()._extract_sections(["SKILLS", "• - Python", "• - Go"])
+
+    assert [point for entry in sections[0].entries for point in entry.points] == ["Python", "Go"]
+
+
+def _page_count(pdf):
+    with pdfplumber.open(io.BytesIO(pdf)) as doc:
+        return len(doc.pages)
+
+
+def test_every_page_of_a_long_resume_is_parsed(make_pdf):
+    pdf, resume = make_pdf(1, jobs=8, bullets_per_job=8)
+    parsed = ResumeParser().parse(io.BytesIO(pdf))
+
+    assert _page_count(pdf) > 2
+    assert [section['title'] for section in parsed['sections']] == [section['title'] for section in resume['sections']]
+    # Skills are on the last page
+    assert parsed['sections'][-1] == resume['sections'][-1]
+
+
+def test_pages_past_max_pages_are_ignored(make_pdf):
+    pdf, _ = make_pdf(1, jobs=8, bullets_per_job=8)
+    parsed = ResumeParser(max_pages=1).parse(io.BytesIO(pdf))
+
+    assert [section['title'] for section in parsed['sections']] == ['EXPERIENCE']
+
+
+def test_extracted_text_marks_page_breaks(make_pdf):
+    pdf, resume = make_pdf(1, jobs=8, bullets_per_job=8)
+    pages = extract_text(pdf).split(PAGE_BREAK)
+
+    assert len(pages) == _page_count(pdf)
+    assert pages[0].startswith(resume['personal_info']['name'])
+    assert 'SKILLS' in pages[-1]
+    assert ResumeParser(max_pages=1).extract_text(io.BytesIO(pdf)) == pages[0]
@@ -0,0 +1,29 @@
+import io
+import os
+
+import reportlab
+
+from pdf_templates import get_template, register_fonts, use_fonts
+
+FONT_DIR = os.path.join(os.path.dirname(reportlab.__file__), 'fonts')
+
+
+def test_templates_render_in_registered_fonts():
+    assert {'Vera', 'VeraBd'} <= set(register_fonts(FONT_DIR))
+    try:
+        use_fonts('Vera', 'VeraBd')
+        template = get_template('compact')
+        assert template.bullet_style.fontName == 'Vera'
+        assert template.section_style.fontName == 'VeraBd'
+
+        output = io.BytesIO()
+        template.render(output, 'Jane Doe', 'jane@example.com',
+                        [{'title': 'Skills', 'bullet_points': ['Python'], 'entries': []}])
+        assert b'Vera' in output.getvalue()
+    finally:
+        use_fonts(None)
+
+
+def test_unregistered_font_falls_back_to_default():
+    use_fonts('NoSuchFont')
+    assert get_template('classic').bullet_style.fontName == 'Helvetica'
@@ -0,0 +1,27 @@
+import pytest
+
+from render_input import extract_from_resume
+
+
+def test_non_string_points_are_coerced_and_none_skipped():
+    resume = {
+        "personal_info": {"name": "Jane <Doe>", "contact": {"phone": 5551234567}},
+        "sections": [{"title": "Awards", "entries": [{"company": "Acme", "points": [2019, None, "Top 1% & more"]}]}]
+    }
+    name, contact_info, sections = extract_from_resume(resume)
+
+    assert name == "Jane &lt;Doe&gt;"
+    assert contact_info == "5551234567"
+    assert sections[0]['entries'][0]['bullet_points'] == ["2019", "Top 1% &amp; more"]
+
+
+@pytest.mark.parametrize("resume", [
+    "not a resume",
+    {"personal_info": "Jane"},
+    {"sections": {"title": "Skills"}},
+    {"sections": ["Skills"]},
+    {"sections": [{"title": "Skills", "entries": [{"points": "Python"}]}]},
+])
+def test_malformed_resume_raises_value_error(resume):
+    with pytest.raises(ValueError):
+        extract_from_resume(resume)
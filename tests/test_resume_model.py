@@ -0,0 +1,71 @@
+import pytest
+
+from resume_model import Resume, validate_resume
+
+
+PARSED = {
+    "personal_info": {"name": "Jane Doe", "contact": {"email": "jane@example.com", "phone": "555-0100",
+                                                     "location": "Austin, TX", "linkedin": "", "github": ""}},
+    "sections": [
+        {"title": "EXPERIENCE", "entries": [{"company": "Initech", "position": "Engineer", "location": "Remote",
+                                             "duration": "2020 - Present", "points": ["Built the billing service"]}]},
+        {"title": "SKILLS", "entries": [{"company": "Technical Skills", "position": "", "location": "",
+                                         "duration": "", "points": ["Python", "Go"]}]}
+    ]
+}
+
+
+def test_parser_output_round_trips():
+    assert Resume.from_dict(PARSED).to_dict() == PARSED
+    assert Resume.from_json(Resume.from_dict(PARSED).to_json()).to_dict() == PARSED
+
+
+def test_claude_fields_are_kept():
+    data = {
+        "personal_info": {"name": "Jane Doe", "contact": {"email": "jane@example.com"}, "summary": "Backend engineer"},
+        "sections": [{"title": "EXPERIENCE", "confidence": 0.4, "source": "llm",
+                      "entries": [{"company": "Initech", "duration": {"start": "2020", "end": "Present"},
+                                   "points": ["Built the billing service"]}]}]
+    }
+    result = Resume.from_dict(data).to_dict()
+
+    assert result["personal_info"]["summary"] == "Backend engineer"
+    assert result["personal_info"]["contact"]["phone"] == ""
+    assert result["sections"][0]["confidence"] == 0.4
+    assert result["sections"][0]["source"] == "llm"
+    assert result["sections"][0]["entries"][0]["duration"] == {"start": "2020", "end": "Present"}
+    assert Resume.from_json(Resume.from_dict(data).to_json()).to_dict() == result
+
+
+def test_missing_parts_load_empty():
+    assert Resume.from_dict({}).to_dict() == {"personal_info": {"name": "", "contact": Resume().contact.to_dict()},
+                                              "sections": []}
+    assert "summary" not in Resume.from_dict(PARSED).to_dict()["personal_info"]
+
+
+def test_short_strings_are_interned():
+    first = Resume.from_json(Resume.from_dict(PARSED).to_json())
+    second = Resume.from_json(Resume.from_dict(PARSED).to_json())
+
+    assert first.sections[1].entries[0].points[0] is second.sections[1].entries[0].points[0]
+    assert first.sections[0].title is second.sections[0].title
+
+
+@pytest.mark.parametrize('data, message', [
+    ([], "resume must be an object"),
+    ({"personal_info": "Jane"}, "personal_info must be an object"),
+    ({"personal_info": {"contact": []}}, "personal_info.contact must be an object"),
+    ({"sections": {}}, "sections must be a list"),
+    ({"sections": ["Skills"]}, "section must be an object"),
+    ({"sections": [{"entries": ["x"]}]}, "entry must be an object"),
+    ({"sections": [{"entries": [{"points": "Python"}]}]}, "points must be a list"),
+])
+def test_validate_resume_rejects_misplaced_types(data, message):
+    with pytest.raises(ValueError, match=message):
+        validate_resume(data)
+
+
+def test_validate_resume_accepts_parsed_and_partial_resumes():
+    validate_resume(PARSED)
+    validate_resume({})
+    validate_resume({"personal_info": None, "sections": [{"entries": None}]})
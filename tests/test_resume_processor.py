@@ -0,0 +1,95 @@
+import asyncio
+import json
+
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.messages import AIMessage
+
+from llm_stub import StubChatModel, stub_response
+from rate_limit import TokenBucket
+from resume_processor import ResumeProcessor
+
+# max_tokens of every call; copies of the model made per limit share this list
+LIMITS = []
+
+
+class TruncatingChatModel(StubChatModel):
+    """Stub that cuts its reply off, reporting stop_reason 'max_tokens', below a limit"""
+
+    max_tokens: int = 4000
+    needed: int = 1000
+
+    def _reply(self, messages):
+        LIMITS.append(self.max_tokens)
+        content = json.dumps(stub_response(str(messages[-1].content)))
+        if self.max_tokens < self.needed:
+            return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content[:40]))],
+                              llm_output={'stop_reason': 'max_tokens'})
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=content))],
+                          llm_output={'stop_reason': 'end_turn'})
+
+
+def test_cut_off_response_is_retried_with_a_larger_budget():
+    LIMITS.clear()
+    llm = TruncatingChatModel()
+    processor = ResumeProcessor(llm=llm, cache=False, rate_limiter=TokenBucket(1000))
+
+    result = asyncio.run(processor.process_resume("Jane Doe\nEXPERIENCE\nEngineer"))
+
+    assert result == stub_response("Jane Doe\nEXPERIENCE\nEngineer")
+    assert len(LIMITS) > 1
+    assert LIMITS[-1] >= llm.needed
+    assert LIMITS == sorted(LIMITS)
+
+
+def test_response_cut_off_at_the_limit_is_an_error():
+    LIMITS.clear()
+    llm = TruncatingChatModel(needed=10 ** 6)
+    processor = ResumeProcessor(llm=llm, cache=False, rate_limiter=TokenBucket(1000))
+
+    try:
+        asyncio.run(processor.process_resume("Jane Doe"))
+    except ValueError as e:
+        assert 'cut off' in str(e)
+    else:
+        raise AssertionError("expected ValueError")
+
+
+class CountingBucket(TokenBucket):
+    def __init__(self):
+        super().__init__(1000)
+        self.acquired = 0
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        self.acquired += 1
+        await super().acquire(tokens)
+
+
+def test_every_chunk_goes_through_the_rate_limiter(monkeypatch):
+    from config import Config
+    monkeypatch.setattr(Config, 'LLM_BUDGET_STRATEGY', 'chunk')
+    monkeypatch.setattr(Config, 'LLM_INPUT_TOKEN_BUDGET', 20)
+    text = ("Jane Doe\nEXPERIENCE\nBuilt the billing service at Acme\nRan the on-call rotation\n"
+            "EDUCATION\nBSc Computer Science, State University\nTeaching assistant for algorithms")
+    processor = ResumeProcessor(llm=StubChatModel(), cache=False)
+    limiter = CountingBucket()
+
+    records = asyncio.run(processor.process_batch([text], rate_limiter=limiter))
+
+    assert records[0]['status'] == 'success'
+    assert limiter.acquired == processor.llm.calls > 1
+
+
+def test_processors_share_one_rate_limiter():
+    assert ResumeProcessor(llm=StubChatModel(), cache=False).rate_limiter is \
+        ResumeProcessor(llm=StubChatModel(), cache=False).rate_limiter
+
+
+def test_stream_goes_through_the_rate_limiter():
+    limiter = CountingBucket()
+    processor = ResumeProcessor(llm=StubChatModel(), cache=False, rate_limiter=limiter)
+
+    async def collect():
+        return [event async for event, _ in processor.stream_resume("Jane Doe\nEXPERIENCE\nEngineer")]
+
+    assert asyncio.run(collect())[-1] == 'done'
+    assert limiter.acquired == 1
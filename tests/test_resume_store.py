@@ -0,0 +1,25 @@
+from resume_store import ResumeStore, PARSER, LLM
+
+
+def resume(name):
+    return {"personal_info": {"name": name, "contact": {"email": f"{name.lower()}@example.com"}}, "sections": []}
+
+
+def test_purge_removes_results_past_retention(tmp_path):
+    store = ResumeStore(str(tmp_path / 'resumes.db'))
+    store.save('old', resume('Old'), uploaded=100.0)
+    store.save('new', resume('New'), uploaded=300.0)
+
+    assert store.purge(200.0) == ['old']
+    assert store.get('old') is None
+    assert store.get('new') is not None
+
+
+def test_purge_keeps_hash_resaved_from_another_source(tmp_path):
+    store = ResumeStore(str(tmp_path / 'resumes.db'))
+    store.save('hash', resume('Ada'), source=PARSER, uploaded=100.0)
+    store.save('hash', resume('Ada'), source=LLM, uploaded=300.0)
+
+    assert store.purge(200.0) == []
+    assert store.get('hash', source=PARSER) is None
+    assert store.get('hash', source=LLM) is not None
@@ -0,0 +1,48 @@
+import hashlib
+import os
+
+import pytest
+
+from config import Config
+
+
+@pytest.fixture
+def stored_pdf(app_module):
+    data = b'%PDF-1.4 ' + bytes(range(256)) * 8 + b' %%EOF'
+    digest = hashlib.sha256(data).hexdigest()
+    name, _ = app_module.upload_store.save(digest, data)
+    return name, digest, data
+
+
+def test_stored_pdfs_are_privately_cacheable_by_hash(client, stored_pdf):
+    name, digest, data = stored_pdf
+    response = client.get(f'/pdf/{name}')
+
+    assert response.status_code == 200
+    assert response.data == data
+    assert response.mimetype == 'application/pdf'
+    assert response.get_etag() == (digest, False)
+    assert response.cache_control.private
+    assert not response.cache_control.public
+    assert response.cache_control.max_age == min(Config.PDF_CACHE_MAX_AGE, Config.UPLOAD_TTL)
+
+
+def test_revalidation_and_ranges_are_answered(client, stored_pdf):
+    name, digest, data = stored_pdf
+
+    assert client.get(f'/pdf/{name}', headers={'If-None-Match': f'"{digest}"'}).status_code == 304
+
+    response = client.get(f'/pdf/{name}', headers={'Range': 'bytes=100-199'})
+    assert response.status_code == 206
+    assert response.data == data[100:200]
+    assert response.headers['Content-Range'] == f'bytes 100-199/{len(data)}'
+
+
+def test_legacy_uploads_must_be_revalidated(app_module, client):
+    with open(os.path.join(app_module.app.config['UPLOAD_FOLDER'], 'old.pdf'), 'wb') as f:
+        f.write(b'%PDF-1.4 old %%EOF')
+    response = client.get('/pdf/old.pdf')
+
+    assert response.data == b'%PDF-1.4 old %%EOF'
+    assert response.cache_control.no_cache
+    assert client.get('/pdf/missing.pdf').status_code == 404
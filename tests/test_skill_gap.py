@@ -0,0 +1,62 @@
+import pytest
+
+from skill_gap import SkillMatcher, analyze_gap
+
+
+@pytest.fixture
+def matcher():
+    return SkillMatcher({'C': 'C', 'C++': 'C++', 'CPP': 'C++', 'Go': 'Go', 'Golang': 'Go',
+                         'Python': 'Python', 'Machine Learning': 'Machine Learning', 'ML': 'Machine Learning'})
+
+
+def test_longest_overlapping_match_wins(matcher):
+    assert matcher.find("C++ and C") == [(0, 3, 'C++'), (8, 9, 'C')]
+    assert [skill for _, _, skill in matcher.find("machine learning (ML) in golang")] == \
+        ['Machine Learning', 'Machine Learning', 'Go']
+
+
+def test_short_aliases_are_case_sensitive_and_whole_words(matcher):
+    assert [skill for _, _, skill in matcher.find("We go to Go meetups")] == ['Go']
+    assert matcher.find("Cython, Pythonic, ml") == []
+    assert matcher.find("PYTHON") == [(0, 6, 'Python')]
+
+
+def test_gap_reports_missing_and_underrepresented_skills(matcher, make_resume):
+    job = "Python, Python and Go. C++ is a plus. Python again."
+    resume = make_resume("Python and C++ and Golang")
+    resume['personal_info']['summary'] = "Go developer"
+
+    gap = analyze_gap(resume, job, matcher)
+    assert gap['matched'] == ['Python', 'Go', 'C++']
+    assert gap['missing'] == []
+    assert gap['coverage'] == 100.0
+    assert gap['underrepresented'] == [{'skill': 'Python', 'job_count': 3, 'resume_count': 1,
+                                        'positions': [{'start': 0, 'end': 6}, {'start': 8, 'end': 14},
+                                                      {'start': 38, 'end': 44}]}]
+    resume_skills = {item['skill']: item['locations'] for item in gap['resume_skills']}
+    assert resume_skills['Go'] == [{'field': 'summary', 'start': 0, 'end': 2},
+                                   {'section': 0, 'entry': 0, 'field': 'points', 'point': 0, 'start': 19, 'end': 25}]
+
+    gap = analyze_gap(make_resume("Python"), job, matcher)
+    assert [item['skill'] for item in gap['missing']] == ['Go', 'C++']
+    assert gap['coverage'] == 33.3
+    assert analyze_gap(make_resume("Python"), "No skills here", matcher)['coverage'] == 0.0
+
+
+def test_analyze_gap_route(client, make_resume):
+    response = client.post('/analyze-gap', json={'job_description': 'Python and Kubernetes',
+                                                 'resume': make_resume('Python')})
+    assert response.status_code == 200
+    assert [item['skill'] for item in response.get_json()['missing']] == ['Kubernetes']
+
+
+@pytest.mark.parametrize('body', [
+    {'job_description': 'Python', 'resume': {'personal_info': 'Jane'}},
+    {'job_description': 'Python', 'resume': {'sections': [{'entries': ['x']}]}},
+    {'job_description': 'Python', 'resume': {'sections': ['Skills']}},
+    {'job_description': 7, 'resume': {'sections': []}},
+])
+def test_analyze_gap_rejects_malformed_input(client, body):
+    response = client.post('/analyze-gap', json=body)
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
@@ -0,0 +1,50 @@
+import hashlib
+import io
+import os
+import time
+
+from storage import UploadStore
+
+
+def test_files_are_stored_once_under_sharded_content_paths(tmp_path):
+    store = UploadStore(str(tmp_path))
+    data = b'%PDF-1.4 resume %%EOF'
+    digest = hashlib.sha256(data).hexdigest()
+
+    assert store.save(digest, data) == (f"{digest}.pdf", True)
+    path = store.path_for(digest)
+    assert path == os.path.join(str(tmp_path), digest[:2], digest[2:4], f"{digest}.pdf")
+    past = time.time() - 3600
+    os.utime(path, (past, past))
+
+    # A re-upload writes nothing but counts as fresh for cleanup
+    assert store.save(digest, io.BytesIO(data)) == (f"{digest}.pdf", False)
+    assert os.path.getmtime(path) > past
+    with open(path, 'rb') as f:
+        assert f.read() == data
+    assert [name for _, _, names in os.walk(str(tmp_path)) for name in names] == [f"{digest}.pdf"]
+
+
+def test_lookup_only_resolves_stored_names(tmp_path):
+    store = UploadStore(str(tmp_path))
+    digest = hashlib.sha256(b'pdf').hexdigest()
+    store.save(digest, b'pdf')
+
+    assert store.lookup(f"{digest}.pdf") == store.path_for(digest)
+    assert store.lookup(f"{digest[:-1]}0.pdf") is None
+    assert store.lookup(f"{digest}.txt") is None
+    assert store.lookup("../../etc/passwd") is None
+
+
+def test_identical_uploads_share_one_stored_pdf(app_module, client, make_pdf):
+    pdf, resume = make_pdf(3)
+    digest = hashlib.sha256(pdf).hexdigest()
+    responses = [client.post('/upload-resume', data={'resume': (io.BytesIO(pdf), name)})
+                 for name in ('resume.pdf', 'other name.pdf')]
+
+    assert [response.get_json()['pdf_filename'] for response in responses] == [f"{digest}.pdf"] * 2
+    assert responses[0].get_json()['parsed_data']['personal_info']['name'] == resume['personal_info']['name']
+    assert client.get(f"/pdf/{digest}.pdf").data == pdf
+    # The second upload was served from the parse cache
+    assert app_module.parse_cache.stats()['hits'] == 1
+    assert app_module.resume_store.count() == 1
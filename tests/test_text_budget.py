@@ -0,0 +1,42 @@
+from pdf_parser import PAGE_BREAK
+from text_budget import clean_resume_text
+
+
+def test_repeated_job_titles_and_locations_are_kept():
+    text = '\n'.join([
+        'Jane Doe',
+        'EXPERIENCE',
+        'Software Engineer',
+        'Acme Corp',
+        'Remote',
+        'Software Engineer',
+        'Globex',
+        'Remote',
+        'Software Engineer',
+        'Initech',
+        'Austin, TX',
+        'Led a team of 12',
+        '12',
+        'Austin, TX',
+    ])
+    cleaned = clean_resume_text(text).split('\n')
+
+    assert cleaned.count('Software Engineer') == 3
+    assert cleaned.count('Remote') == 2
+    assert cleaned.count('Austin, TX') == 2
+    assert 'Led a team of 12' in cleaned
+
+
+def test_running_headers_and_page_numbers_are_dropped_at_page_edges():
+    pages = [
+        ['Jane Doe - Resume', 'EXPERIENCE', 'Software Engineer', 'Acme Corp', 'Page 1 of 3'],
+        ['Jane Doe - Resume', 'Software Engineer', '42', 'Globex', 'Page 2 of 3'],
+        ['Jane Doe - Resume', 'SKILLS', 'Python', 'Go', 'Page 3 of 3'],
+    ]
+    cleaned = clean_resume_text(PAGE_BREAK.join('\n'.join(lines) for lines in pages)).split('\n')
+
+    assert cleaned.count('Jane Doe - Resume') == 1
+    assert not any(line.startswith('Page ') for line in cleaned)
+    assert cleaned.count('Software Engineer') == 2
+    # A bare number in the middle of a page is content, not a page number
+    assert '42' in cleaned
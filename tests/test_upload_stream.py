@@ -0,0 +1,55 @@
+import hashlib
+import io
+
+import pytest
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from upload_stream import ReceivingBuffer
+
+PDF = b'%PDF-1.4\n' + b'x' * 5000 + b'\n%%EOF\n'
+
+
+def test_buffer_hashes_and_spools_while_receiving():
+    buffer = ReceivingBuffer(max_size=None, spool_size=1024, validate_pdf=True)
+    for start in range(0, len(PDF), 700):
+        buffer.write(PDF[start:start + 700])
+
+    assert buffer.validation_error() is None
+    assert buffer.hexdigest() == hashlib.sha256(PDF).hexdigest()
+    assert buffer.size == len(PDF) and not buffer.in_memory
+    assert buffer.getvalue() == PDF
+
+
+@pytest.mark.parametrize('data, error', [
+    (b'<html>not a pdf</html>', 'File is not a PDF'),
+    (PDF[:-10], 'PDF file is incomplete'),
+])
+def test_buffer_rejects_files_that_are_not_whole_pdfs(data, error):
+    buffer = ReceivingBuffer(max_size=None, spool_size=1024, validate_pdf=True)
+    buffer.write(data)
+    assert buffer.validation_error() == error
+
+
+def test_buffer_stops_at_max_size():
+    buffer = ReceivingBuffer(max_size=100, spool_size=1024)
+    buffer.write(b'x' * 100)
+    with pytest.raises(RequestEntityTooLarge):
+        buffer.write(b'x')
+    assert buffer.validation_error() == 'File too large'
+
+
+@pytest.mark.parametrize('data, filename, status, error', [
+    (b'<html>not a pdf</html>', 'resume.pdf', 400, 'File is not a PDF'),
+    (PDF[:-10], 'resume.pdf', 400, 'PDF file is incomplete'),
+    (PDF, 'resume.docx', 400, 'Invalid file type'),
+])
+def test_upload_rejects_invalid_files(client, data, filename, status, error):
+    response = client.post('/upload-resume', data={'resume': (io.BytesIO(data), filename)})
+    assert response.status_code == status
+    assert response.get_json()['error'] == error
+
+
+def test_upload_rejects_files_over_the_limit(app_module, client, monkeypatch):
+    monkeypatch.setitem(app_module.app.config, 'MAX_CONTENT_LENGTH', 1000)
+    response = client.post('/upload-resume', data={'resume': (io.BytesIO(PDF), 'resume.pdf')})
+    assert response.status_code == 413
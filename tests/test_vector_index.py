@@ -0,0 +1,31 @@
+from vector_index import VectorIndex
+
+
+def test_removed_resume_is_not_matched_and_its_row_is_reused(tmp_path, make_resume):
+    index = VectorIndex(str(tmp_path), dim=64, initial_capacity=2)
+    index.add_resume('a', make_resume('Python Django'))
+    index.add_resume('b', make_resume('Python Flask'))
+
+    assert index.remove('a')
+    assert not index.remove('a')
+    assert 'a' not in index and len(index) == 1
+    assert [result['resume_id'] for result in index.search_text('Python Django', 5)] == ['b']
+
+    index.add_resume('c', make_resume('Python Django'))
+    assert index.stats()['capacity'] == 2
+    assert [result['resume_id'] for result in index.search_text('Django', 5)] == ['c']
+
+
+def test_removals_reach_other_processes(tmp_path, make_resume):
+    writer = VectorIndex(str(tmp_path), dim=64)
+    reader = VectorIndex(str(tmp_path), dim=64)
+    writer.add_resume('a', make_resume('Python Django'))
+    writer.add_resume('b', make_resume('Python Flask'))
+    assert len(reader.search_text('Python', 5)) == 2
+
+    writer.remove('a')
+    writer.add_resume('c', make_resume('Rust'))
+    assert [result['resume_id'] for result in reader.search_text('Python', 5)] == ['b']
+    assert [result['resume_id'] for result in reader.search_text('Rust', 5)] == ['c']
+    # A fresh process replays the same log
+    assert VectorIndex(str(tmp_path), dim=64).stats()['resumes'] == 2
@@ -0,0 +1,236 @@
+"""Prepares resume text for the LLM within a token budget.
+
+Extracted PDF text carries running headers and footers repeated on every
+page, page numbers and whitespace runs, all of which cost input tokens
+without telling Claude anything. clean_resume_text strips them from the
+top and bottom of each page, leaving lines that legitimately repeat in the
+body (job titles, "Remote", a city) alone. Resumes
+still over budget are trimmed section by section (the tail of the longest
+sections goes first) or split into chunks of whole sections.
+"""
+import math
+import re
+import threading
+import time
+from collections import Counter, deque
+from typing import Dict, List, Any, Optional, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from llm_cache import normalize_text
+from pdf_parser import SECTION_HEADERS, BULLET_RE, PAGE_BREAK
+
+# Claude averages a little under 4 characters per token on English text;
+# a lower figure keeps the estimate on the safe side
+CHARS_PER_TOKEN = 3.5
+
+PAGE_ARTIFACT_RE = re.compile(r'^(?:page\s*)?\d{1,3}(?:\s*(?:of|/)\s*\d{1,3})?$|^-\s*\d{1,3}\s*-$', re.IGNORECASE)
+HEADER_RE = re.compile('|'.join(re.escape(header) for header in SECTION_HEADERS))
+# Lines this close to the top or bottom of a page may be a running header/footer or page number
+PAGE_EDGE_LINES = 2
+# Short lines at the edge of this many pages (or of every page, for shorter
+# resumes) are running headers/footers, not content
+REPEATED_LINE_MIN = 3
+REPEATED_LINE_MAX_LENGTH = 80
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of text for budgeting, without a tokenizer"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _page_edges(lines: List[str]) -> List[str]:
+    return lines[:PAGE_EDGE_LINES] + lines[PAGE_EDGE_LINES:][-PAGE_EDGE_LINES:]
+
+
+def clean_resume_text(text: str) -> str:
+    """Normalize whitespace and drop page numbers, running headers/footers and duplicate lines.
+
+    Pages are separated by PAGE_BREAK. Page numbers and repeated lines are
+    only dropped from the edges of a page; text without page breaks is one page.
+    """
+    pages = [normalize_text(page).split('\n') for page in text.split(PAGE_BREAK)]
+    pages = [lines for lines in pages if lines != ['']]
+    # A line counts once per page it borders, however often it appears in the body
+    edge_counts = Counter(line for lines in pages for line in set(_page_edges(lines)))
+    min_repeats = min(REPEATED_LINE_MIN, len(pages))
+
+    cleaned = []
+    seen_repeated = set()
+    for lines in pages:
+        for i, line in enumerate(lines):
+            at_edge = i < PAGE_EDGE_LINES or i >= len(lines) - PAGE_EDGE_LINES
+            if at_edge and PAGE_ARTIFACT_RE.match(line):
+                continue
+            if cleaned and line == cleaned[-1]:
+                continue
+            if (at_edge and len(pages) > 1 and edge_counts[line] >= min_repeats
+                    and len(line) <= REPEATED_LINE_MAX_LENGTH
+                    and not BULLET_RE.match(line) and not HEADER_RE.search(line.upper())):
+                # Keep the first copy, it may be the name at the top of the resume
+                if line in seen_repeated:
+                    continue
+                seen_repeated.add(line)
+            cleaned.append(line)
+    return '\n'.join(cleaned)
+
+def split_sections(text: str) -> List[List[str]]:
+    """Split text into the lines before the first header, then one list per section"""
+    sections = [[]]
+    for line in text.split('\n'):
+        if line and HEADER_RE.search(line.upper()):
+            sections.append([])
+        sections[-1].append(line)
+    return sections
+
+
+def _line_tokens(line: str) -> int:
+    return estimate_tokens(line) + 1  # + the newline
+
+
+def fit_to_budget(text: str, max_tokens: int) -> Tuple[str, int]:
+    """Trim text to max_tokens by dropping the last lines of the longest sections.
+
+    Section headers and the lines before the first header (name and
+    contact details) are kept. Returns the text and the tokens removed.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text, 0
+
+    sections = split_sections(text)
+    totals = [sum(_line_tokens(line) for line in section) for section in sections]
+    total = sum(totals)
+    removed = 0
+    while total > max_tokens:
+        # The preamble and a section's header line are never trimmed
+        candidates = [i for i in range(1, len(sections)) if len(sections[i]) > 1]
+        if not candidates:
+            break
+        longest = max(candidates, key=lambda i: totals[i])
+        tokens = _line_tokens(sections[longest].pop())
+        totals[longest] -= tokens
+        total -= tokens
+        removed += tokens
+
+    return '\n'.join(line for section in sections for line in section), removed
+
+
+def chunk_by_section(text: str, max_tokens: int) -> List[str]:
+    """Split text into chunks of whole sections, each within max_tokens.
+
+    The first chunk starts with the name and contact lines. A section that
+    is over budget on its own is trimmed with fit_to_budget.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+
+    chunks = []
+    current: List[str] = []
+    current_tokens = 0
+    for section in split_sections(text):
+        section_text = '\n'.join(section)
+        tokens = estimate_tokens(section_text)
+        if tokens > max_tokens:
+            section_text, _ = fit_to_budget(section_text, max_tokens)
+            tokens = estimate_tokens(section_text)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append('\n'.join(current))
+            current, current_tokens = [], 0
+        if section_text:
+            current.append(section_text)
+            current_tokens += tokens + 1
+    if current:
+        chunks.append('\n'.join(current))
+    return chunks
+
+
+def output_token_budget(input_tokens: int, ratio: float, overhead: int, limit: int) -> int:
+    """max_tokens for a call: the JSON output grows with the resume, capped at limit"""
+    return min(limit, int(input_tokens * ratio) + overhead)
+
+
+def merge_chunk_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine structured results of resume chunks into a single resume"""
+    merged = {"personal_info": {}, "sections": []}
+    for result in results:
+        personal = result.get("personal_info") or {}
+        # The first chunk carries the contact lines; later chunks only fill gaps
+        for key, value in personal.items():
+            if value and not merged["personal_info"].get(key):
+                merged["personal_info"][key] = value
+        merged["sections"].extend(result.get("sections") or [])
+    return merged
+
+
+def extract_usage(llm_output: Any) -> Optional[Tuple[int, int]]:
+    """(input, output) tokens reported by the Anthropic API, if the result carries them"""
+    usage = llm_output.get('usage') if isinstance(llm_output, dict) else getattr(llm_output, 'usage', None)
+    if usage is None:
+        return None
+    if isinstance(usage, dict):
+        return usage.get('input_tokens', 0), usage.get('output_tokens', 0)
+    return getattr(usage, 'input_tokens', 0), getattr(usage, 'output_tokens', 0)
+
+
+def extract_stop_reason(llm_output: Any) -> Optional[str]:
+    """Why the API stopped generating ('end_turn', 'max_tokens', ...), if the result says"""
+    if isinstance(llm_output, dict):
+        return llm_output.get('stop_reason')
+    return getattr(llm_output, 'stop_reason', None)
+
+
+class UsageCallback(BaseCallbackHandler):
+    """Captures the token counts and stop reason the API reports for one LLM call"""
+
+    run_inline = True
+
+    def __init__(self):
+        self.usage: Optional[Tuple[int, int]] = None
+        self.stop_reason: Optional[str] = None
+
+    def on_llm_end(self, response, **kwargs: Any) -> None:
+        self.usage = extract_usage(response.llm_output)
+        self.stop_reason = extract_stop_reason(response.llm_output)
+
+
+class TokenUsage:
+    """Running totals of LLM token usage, plus the most recent calls"""
+
+    def __init__(self, history: int = 100):
+        self._lock = threading.Lock()
+        self._calls = deque(maxlen=history)
+        self.calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.trimmed_tokens = 0
+        self.estimated_calls = 0
+
+    def record(self, input_tokens: int, output_tokens: int, max_tokens: int,
+               estimated: bool = False, trimmed_tokens: int = 0) -> None:
+        """Record one call; estimated marks counts guessed from text length"""
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+            self.trimmed_tokens += trimmed_tokens
+            self.estimated_calls += int(estimated)
+            self._calls.append({
+                'time': time.time(),
+                'input_tokens': input_tokens,
+                'output_tokens': output_tokens,
+                'max_tokens': max_tokens,
+                'trimmed_tokens': trimmed_tokens,
+                'estimated': estimated
+            })
+
+    def stats(self) -> Dict[str, Any]:
+        """Return totals and recent calls for monitoring"""
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'input_tokens': self.input_tokens,
+                'output_tokens': self.output_tokens,
+                'trimmed_tokens': self.trimmed_tokens,
+                'estimated_calls': self.estimated_calls,
+                'recent': list(self._calls)
+            }
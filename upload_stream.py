@@ -0,0 +1,138 @@
+import hashlib
+import io
+import tempfile
+from typing import Optional
+
+from flask import Request, current_app
+from werkzeug.exceptions import RequestEntityTooLarge
+
+PDF_MAGIC = b'%PDF-'
+PDF_TRAILER = b'%%EOF'
+# PDF writers may append a little data after %%EOF, so look for it near the end
+TRAILER_WINDOW = 1024
+
+
+class ReceivingBuffer(io.RawIOBase):
+    """Buffers one uploaded file while it is received.
+
+    The SHA-256 digest and size are computed and the PDF magic bytes are
+    checked while Werkzeug writes the upload in. Data stays in memory up
+    to spool_size and only then spills to a temporary file. Uploads that
+    exceed max_size or don't start with %PDF- stop being buffered as soon
+    as that is known.
+    """
+
+    def __init__(self, max_size: Optional[int], spool_size: int, validate_pdf: bool = False):
+        super().__init__()
+        self.max_size = max_size
+        self.spool_size = spool_size
+        self.validate_pdf = validate_pdf
+        self.size = 0
+        self.rejected: Optional[str] = None
+        self._sha256 = hashlib.sha256()
+        self._head = b''
+        self._tail = b''
+        self._spool = tempfile.SpooledTemporaryFile(max_size=spool_size)
+
+    def writable(self):
+        return True
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def write(self, data) -> int:
+        length = len(data)
+        if self.rejected:
+            return length
+
+        self.size += length
+        if self.max_size is not None and self.size > self.max_size:
+            self._reject('File too large')
+            raise RequestEntityTooLarge()
+
+        if self.validate_pdf and len(self._head) < len(PDF_MAGIC):
+            self._head += bytes(data[:len(PDF_MAGIC) - len(self._head)])
+            if not PDF_MAGIC.startswith(self._head[:len(PDF_MAGIC)]):
+                self._reject('File is not a PDF')
+                return length
+
+        self._sha256.update(data)
+        self._tail = (self._tail + bytes(data[-TRAILER_WINDOW:]))[-TRAILER_WINDOW:]
+        return self._spool.write(data)
+
+    def read(self, size: int = -1) -> bytes:
+        return self._spool.read(size)
+
+    def readinto(self, buffer) -> int:
+        data = self._spool.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._spool.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._spool.tell()
+
+    def close(self) -> None:
+        self._spool.close()
+        super().close()
+
+    @property
+    def in_memory(self) -> bool:
+        """True until the upload has spilled to a temporary file"""
+        return self.size <= self.spool_size
+
+    def hexdigest(self) -> str:
+        """SHA-256 of the received bytes"""
+        return self._sha256.hexdigest()
+
+    def getvalue(self) -> bytes:
+        """Return the whole upload without moving the read position"""
+        position = self._spool.tell()
+        self._spool.seek(0)
+        data = self._spool.read()
+        self._spool.seek(position)
+        return data
+
+    def validation_error(self) -> Optional[str]:
+        """Why the upload is unusable, or None if it is acceptable"""
+        if self.rejected:
+            return self.rejected
+        if self.validate_pdf:
+            if self._head != PDF_MAGIC:
+                return 'File is not a PDF'
+            if PDF_TRAILER not in self._tail:
+                return 'PDF file is incomplete'
+        return None
+
+    def _reject(self, reason: str) -> None:
+        self.rejected = reason
+        # Drop anything already buffered, the upload won't be used
+        self._spool.seek(0)
+        self._spool.truncate()
+
+
+class UploadRequest(Request):
+    """Request that hashes and validates uploaded files as they stream in.
+
+    A view can raise the request size limit for its route by setting a
+    max_content_length attribute; each PDF in it stays within
+    MAX_CONTENT_LENGTH.
+    """
+
+    @property
+    def max_content_length(self) -> Optional[int]:
+        view = current_app.view_functions.get(self.endpoint) if current_app and self.endpoint else None
+        limit = getattr(view, 'max_content_length', None)
+        return limit if limit is not None else super().max_content_length
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        config = current_app.config
+        is_pdf = (filename or '').lower().endswith('.pdf')
+        return ReceivingBuffer(max_size=config['MAX_CONTENT_LENGTH'] if is_pdf else self.max_content_length,
+                               spool_size=config['UPLOAD_SPOOL_SIZE'],
+                               validate_pdf=is_pdf)
@@ -0,0 +1,238 @@
+"""Resume vectors in a memory-mapped float32 matrix for whole-pool similarity.
+
+Each parsed resume is reduced to a fixed-size hashed-feature vector of its
+weighted terms (see matching.resume_terms), L2-normalized so a dot product
+is the cosine similarity. Vectors live in one contiguous float32 file that
+is memory-mapped on startup, so ranking every stored resume against a job
+description is a single matrix-vector product with no per-resume Python.
+
+The matrix file is preallocated and doubled as it fills; a companion text
+file logs the resume id of each row. A vector is written before its id,
+so a reader never sees an id without its row. Removing a resume logs a
+tombstone ("-" and the id) and masks its row until a later add reuses it
+("id<TAB>row"), so the matrix only grows with the number of live resumes.
+Writes from several worker processes are serialized with flock on the id
+file.
+"""
+import math
+import os
+import threading
+import zlib
+from collections import Counter
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+import numpy as np
+
+from matching import resume_terms, tokenize
+
+try:
+    import fcntl
+except ImportError:  # Windows has no flock, only one process may append
+    fcntl = None
+
+# Prefix of a line in the id file that removes a resume
+TOMBSTONE = '-'
+
+
+def feature_vector(terms: Dict[str, float], dim: int) -> np.ndarray:
+    """Hash weighted terms into a unit-length float32 vector of size dim.
+
+    crc32 is stable across processes, unlike hash(); its top bit picks the
+    sign so colliding terms tend to cancel out rather than add up.
+    """
+    vector = np.zeros(dim, dtype=np.float32)
+    for term, tf in terms.items():
+        if tf <= 0:
+            continue
+        h = zlib.crc32(term.encode('utf-8'))
+        vector[h % dim] += (1.0 + math.log(tf)) if h & 0x80000000 else -(1.0 + math.log(tf))
+    norm = float(np.linalg.norm(vector))
+    if norm:
+        vector /= norm
+    return vector
+
+
+def resume_vector(resume: Dict[str, Any], dim: int) -> np.ndarray:
+    """Feature vector of a parsed resume"""
+    return feature_vector(resume_terms(resume), dim)
+
+
+def text_vector(text: str, dim: int) -> np.ndarray:
+    """Feature vector of free text such as a job description"""
+    return feature_vector(Counter(tokenize(text)), dim)
+
+
+class VectorIndex:
+    """Persistent matrix of resume vectors keyed by resume id"""
+
+    def __init__(self, directory: str, dim: int = 512, initial_capacity: int = 1024):
+        self.directory = directory
+        self.dim = dim
+        # The dimension is part of the file names, changing it starts a new matrix
+        self.matrix_path = os.path.join(directory, f'vectors-{dim}.f32')
+        self.ids_path = os.path.join(directory, f'ids-{dim}.txt')
+        self._row_bytes = dim * np.dtype(np.float32).itemsize
+        self._lock = threading.Lock()
+        self._ids: List[Optional[str]] = []  # None for a removed resume's row
+        self._rows: Dict[str, int] = {}
+        self._free: Set[int] = set()
+        self._frozen_removed: Optional[np.ndarray] = None
+        self._ids_offset = 0
+        self._matrix: Optional[np.memmap] = None
+
+        os.makedirs(directory, exist_ok=True)
+        open(self.ids_path, 'ab').close()
+        if not os.path.exists(self.matrix_path):
+            with open(self.matrix_path, 'wb') as f:
+                f.truncate(initial_capacity * self._row_bytes)
+        with self._lock:
+            self._map()
+            self._refresh()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, resume_id: str) -> bool:
+        return resume_id in self._rows
+
+    def _map(self) -> None:
+        rows = os.path.getsize(self.matrix_path) // self._row_bytes
+        self._matrix = np.memmap(self.matrix_path, dtype=np.float32, mode='r+', shape=(rows, self.dim))
+
+    def _refresh(self) -> None:
+        # Pick up rows other processes appended since we last looked
+        size = os.path.getsize(self.ids_path)
+        if size == self._ids_offset:
+            return
+        with open(self.ids_path, 'rb') as f:
+            f.seek(self._ids_offset)
+            data = f.read(size - self._ids_offset)
+        # Only whole lines, a writer may be part way through one
+        end = data.rfind(b'\n') + 1
+        for line in data[:end].decode('utf-8').splitlines():
+            self._apply(line)
+        self._ids_offset += end
+        if len(self._ids) > self._matrix.shape[0]:
+            self._map()
+
+    def _apply(self, line: str) -> None:
+        # Replay one line of the id file
+        if line.startswith(TOMBSTONE):
+            row = self._rows.pop(line[len(TOMBSTONE):], None)
+            if row is not None:
+                self._ids[row] = None
+                self._free.add(row)
+        else:
+            resume_id, _, reused = line.partition('\t')
+            if reused:
+                row = int(reused)
+                self._free.discard(row)
+                self._ids[row] = resume_id
+            else:
+                row = len(self._ids)
+                self._ids.append(resume_id)
+            self._rows[resume_id] = row
+        self._frozen_removed = None
+
+    def _write(self, ids_file, line: str) -> None:
+        data = f"{line}\n".encode('utf-8')
+        ids_file.write(data)
+        ids_file.flush()
+        self._ids_offset += len(data)
+        self._apply(line)
+
+    def add(self, resume_id: str, vector: np.ndarray) -> None:
+        """Store the vector for a resume id, overwriting its row if it has one"""
+        if '\n' in resume_id or '\t' in resume_id or resume_id.startswith(TOMBSTONE):
+            raise ValueError(f"resume ids cannot contain newlines or tabs, or start with {TOMBSTONE!r}")
+        vector = np.asarray(vector, dtype=np.float32)
+        with self._lock, open(self.ids_path, 'ab') as ids_file:
+            if fcntl is not None:
+                fcntl.flock(ids_file, fcntl.LOCK_EX)  # Released when the file closes
+            self._refresh()
+            row = self._rows.get(resume_id)
+            if row is not None:
+                self._matrix[row] = vector
+                return
+
+            if self._free:
+                # Reuse a removed resume's row rather than growing the matrix
+                row = min(self._free)
+                self._matrix[row] = vector
+                self._write(ids_file, f"{resume_id}\t{row}")
+                return
+
+            row = len(self._ids)
+            if row >= self._matrix.shape[0]:
+                self._matrix.flush()
+                with open(self.matrix_path, 'r+b') as f:
+                    f.truncate(max(2 * self._matrix.shape[0], row + 1) * self._row_bytes)
+                self._map()
+            self._matrix[row] = vector
+            self._write(ids_file, resume_id)
+
+    def remove(self, resume_id: str) -> bool:
+        """Drop a resume from results, freeing its row; returns whether it was indexed"""
+        with self._lock, open(self.ids_path, 'ab') as ids_file:
+            if fcntl is not None:
+                fcntl.flock(ids_file, fcntl.LOCK_EX)
+            self._refresh()
+            row = self._rows.get(resume_id)
+            if row is None:
+                return False
+            self._write(ids_file, f"{TOMBSTONE}{resume_id}")
+            self._matrix[row] = 0.0
+            return True
+
+    def add_resume(self, resume_id: str, resume: Dict[str, Any]) -> None:
+        """Vectorize and store a parsed resume"""
+        self.add(resume_id, resume_vector(resume, self.dim))
+
+    def _snapshot(self) -> Tuple[List[Optional[str]], np.ndarray, np.ndarray]:
+        # Row ids, matrix rows and removed-row mask as of one refresh
+        with self._lock:
+            self._refresh()
+            count = len(self._ids)
+            if self._frozen_removed is None:
+                self._frozen_removed = np.array([resume_id is None for resume_id in self._ids], dtype=bool)
+            return self._ids[:count], self._matrix[:count], self._frozen_removed
+
+    def similarities(self, queries: np.ndarray) -> Tuple[List[Optional[str]], np.ndarray]:
+        """Cosine similarity of every stored resume to one query vector or a batch.
+
+        Returns the resume ids and an array of shape (resumes,) for a single
+        query or (resumes, queries) for a 2-D batch of query rows. Rows of
+        removed resumes have id None and score 0.
+        """
+        ids, matrix, _ = self._snapshot()
+        queries = np.asarray(queries, dtype=np.float32)
+        return ids, matrix @ queries.T
+
+    def search(self, query: np.ndarray, top_k: int = 10) -> List[Dict[str, Any]]:
+        """Return up to top_k resume ids by cosine similarity to a query vector"""
+        ids, matrix, removed = self._snapshot()
+        if not ids or top_k < 1:
+            return []
+        scores = matrix @ np.asarray(query, dtype=np.float32)
+        scores[removed] = -np.inf
+        top_k = min(top_k, len(ids))
+        top = np.argpartition(-scores, top_k - 1)[:top_k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [{'resume_id': ids[row], 'score': round(float(scores[row]), 4)}
+                for row in top if scores[row] > 0]
+
+    def search_text(self, text: str, top_k: int = 10) -> List[Dict[str, Any]]:
+        """Rank stored resumes against a job description"""
+        return self.search(text_vector(text, self.dim), top_k)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return row counts and file size for monitoring"""
+        with self._lock:
+            self._refresh()
+            return {
+                'resumes': len(self._rows),
+                'removed': len(self._free),
+                'capacity': self._matrix.shape[0],
+                'dim': self.dim,
+                'bytes': os.path.getsize(self.matrix_path)
+            }